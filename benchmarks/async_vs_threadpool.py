@@ -0,0 +1,101 @@
+"""
+Compares the threadpool (sync) handlers with the async handlers of DataModelRouter.
+
+Both variants serve the same SQLite file. The requests are sent concurrently through an
+in-process ASGI client, so the numbers only reflect the router and the database driver.
+
+Usage:
+    python benchmarks/async_vs_threadpool.py --rows 1000 --requests 5000 --concurrency 500
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from typing import Optional
+
+import httpx
+from data_model_orm import DataModel, Field
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, create_engine
+
+from data_model_router import DataModelRouter
+
+
+class BenchmarkModel(DataModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    age: int
+
+
+async def run(app: FastAPI, rows: int, requests: int, concurrency: int) -> dict:
+    """
+    Sends `requests` GET by id requests with at most `concurrency` requests in flight.
+
+    Returns:
+        dict: The requests per second and the p50/p99 latencies in milliseconds.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+    ) as client:
+
+        async def request() -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(f"/benchmarkmodel/{random.randint(1, rows)}/")
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(request() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "benchmark.db")
+        BenchmarkModel.__engine__ = create_engine(f"sqlite:///{path}")
+        BenchmarkModel.metadata.create_all(bind=BenchmarkModel.__engine__)
+        with Session(BenchmarkModel.__engine__) as session:
+            session.add_all(
+                BenchmarkModel(name=f"name-{i}", age=i % 100) for i in range(args.rows)
+            )
+            session.commit()
+
+        sync_app = FastAPI()
+        sync_app.include_router(DataModelRouter(BenchmarkModel))
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async_app = FastAPI()
+        async_app.include_router(DataModelRouter(BenchmarkModel, async_engine=async_engine))
+
+        for name, app in (("threadpool", sync_app), ("async", async_app)):
+            result = asyncio.run(run(app, args.rows, args.requests, args.concurrency))
+            print(
+                f"{name:>10}: {result['rps']:8.0f} req/s  "
+                f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms"
+            )
+        asyncio.run(async_engine.dispose())
+        BenchmarkModel.__engine__.dispose()
+
+
+if __name__ == "__main__":
+    main()
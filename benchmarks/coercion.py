@@ -0,0 +1,99 @@
+"""
+Compares converting the query values of a request with the coercion plan and field by field.
+
+The coercion plan validates all values of a request with one validator built once per DataModel. This compares
+it with a TypeAdapter call per field and with passing the raw strings on, then measures the get by id and save
+routes, which bind the converted values.
+
+Usage:
+    python benchmarks/coercion.py --rows 1000 --requests 5000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Optional
+
+from data_model_orm import DataModel, Field
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlmodel import Session, create_engine
+
+from data_model_router import DataModelRouter
+from data_model_router.coercion import get_coercion_plan
+
+
+class BenchmarkModel(DataModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    age: int
+    score: float
+
+
+def measure(function, requests: int, rows: int) -> float:
+    """
+    Returns the mean time of a call in microseconds.
+    """
+    started = time.perf_counter()
+    for i in range(requests):
+        function(i % rows + 1)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    plan = get_coercion_plan(BenchmarkModel)
+    adapters = {
+        field_name: TypeAdapter(field.annotation) for field_name, field in BenchmarkModel.model_fields.items()
+    }
+
+    def query(value: int) -> dict[str, str]:
+        return {"id": str(value), "name": f"name-{value}", "age": str(value % 100), "score": "1.5"}
+
+    def raw(value: int) -> None:
+        dict(query(value))
+
+    def per_field(value: int) -> None:
+        {key: adapters[key].validate_python(item) for key, item in query(value).items()}
+
+    def one_pass(value: int) -> None:
+        plan.coerce(query(value))
+
+    for name, function in (("raw", raw), ("per field", per_field), ("plan", one_pass)):
+        measure(function, min(args.requests, 500), args.rows)
+        print(f"{name:>9}: {measure(function, args.requests, args.rows):8.2f} us per request")
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'benchmark.db')}")
+        BenchmarkModel.__engine__ = engine
+        BenchmarkModel.metadata.create_all(bind=engine)
+        with Session(engine) as session:
+            session.add_all(
+                BenchmarkModel(name=f"name-{i}", age=i % 100, score=i / 10) for i in range(args.rows)
+            )
+            session.commit()
+
+        app = FastAPI()
+        app.include_router(DataModelRouter(BenchmarkModel))
+        client = TestClient(app)
+
+        def get(value: int) -> None:
+            assert client.get(f"/benchmarkmodel/{value}/").status_code == 200
+
+        def save(value: int) -> None:
+            assert client.post("/benchmarkmodel/save", params=query(value)).status_code == 200
+
+        for name, function in (("get", get), ("save", save)):
+            measure(function, min(args.requests, 500), args.rows)
+            print(f"{name:>9}: {measure(function, args.requests, args.rows):8.1f} us per request")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compares pulling a whole table through the search route with the export route.
+
+A DataModelRouter is built over a temporary SQLite file seeded with `--rows` entries. The table is
+downloaded once as JSON from the search route and once per export format, through an in-process
+ASGI client. The time, the rows per second and the memory allocated at peak while serving are printed.
+
+Usage:
+    python benchmarks/export.py --rows 100000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Optional
+
+import httpx
+from data_model_orm import DataModel, Field
+from fastapi import FastAPI
+from sqlmodel import create_engine
+
+from data_model_router import DataModelRouter
+from data_model_router.export import EXPORT_MEDIA_TYPES, available_formats
+
+
+class ExportBenchmarkModel(DataModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    age: int
+    score: float
+
+
+async def download(app: FastAPI, path: str, accept: str) -> int:
+    """
+    Downloads the path and returns the size of the body in bytes.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        response = await client.get(path, headers={"Accept": accept})
+        response.raise_for_status()
+        return len(response.content)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'benchmark.db')}")
+        ExportBenchmarkModel.__engine__ = engine
+        ExportBenchmarkModel.metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.execute(
+                ExportBenchmarkModel.__table__.insert(),
+                [
+                    {"id": i, "name": f"name-{i}", "age": i % 100, "score": i / 7}
+                    for i in range(1, args.rows + 1)
+                ],
+            )
+        app = FastAPI()
+        app.include_router(DataModelRouter(ExportBenchmarkModel))
+
+        variants = [("search json", "/exportbenchmarkmodel/", "application/json")] + [
+            (f"export {name}", "/exportbenchmarkmodel/export", EXPORT_MEDIA_TYPES[name])
+            for name in available_formats()
+        ]
+        for label, path, accept in variants:
+            tracemalloc.start()
+            started = time.perf_counter()
+            size = asyncio.run(download(app, path, accept))
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                f"{label:>14}: {elapsed * 1000:8.0f} ms  {args.rows / elapsed:10.0f} rows/s  "
+                f"{size / 1024 / 1024:7.1f} MB body  {peak / 1024 / 1024:7.1f} MB peak"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Measures the per-request overhead of building the get by id statement on every request.
+
+The statement of the get by id route is built once per DataModel with the primary key as a bound
+parameter. This compares executing that statement with building the same statement for every lookup,
+both directly in a session and through the route of a DataModelRouter.
+
+Usage:
+    python benchmarks/get_by_id.py --rows 1000 --requests 5000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Optional
+
+from data_model_orm import DataModel, Field
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import Session, create_engine, select
+
+from data_model_router import DataModelRouter
+from data_model_router.statements import PRIMARY_KEY_PARAMETER, select_by_primary_key
+
+
+class BenchmarkModel(DataModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    age: int
+
+
+def measure(lookup, requests: int, rows: int) -> float:
+    """
+    Returns the mean time of a lookup in microseconds.
+    """
+    started = time.perf_counter()
+    for i in range(requests):
+        lookup(i % rows + 1)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'benchmark.db')}")
+        BenchmarkModel.__engine__ = engine
+        BenchmarkModel.metadata.create_all(bind=engine)
+        with Session(engine) as session:
+            session.add_all(
+                BenchmarkModel(name=f"name-{i}", age=i % 100) for i in range(args.rows)
+            )
+            session.commit()
+
+        def rebuilt(value: int) -> None:
+            with Session(engine) as session:
+                session.exec(select(BenchmarkModel).where(BenchmarkModel.id == value)).first()
+
+        def prebuilt(value: int) -> None:
+            with Session(engine) as session:
+                session.exec(
+                    select_by_primary_key(BenchmarkModel), params={PRIMARY_KEY_PARAMETER: value}
+                ).first()
+
+        app = FastAPI()
+        app.include_router(DataModelRouter(BenchmarkModel))
+        client = TestClient(app)
+
+        def route(value: int) -> None:
+            assert client.get(f"/benchmarkmodel/{value}/").status_code == 200
+
+        for name, lookup in (("rebuilt", rebuilt), ("prebuilt", prebuilt), ("route", route)):
+            measure(lookup, min(args.requests, 500), args.rows)
+            print(f"{name:>9}: {measure(lookup, args.requests, args.rows):8.1f} us per lookup")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
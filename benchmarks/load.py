@@ -0,0 +1,205 @@
+"""
+Load benchmark of the generated CRUD routes of DataModelRouter.
+
+A DataModelRouter is built over a temporary SQLite file seeded with `--rows` entries. A mix of
+create, get, search, save and delete requests is sent concurrently through an in-process ASGI
+client, so the numbers only reflect the router and the database driver. The latency percentiles
+and requests per second of every route and the peak RSS of the process are printed and written
+to JSON. With `--baseline`, the results are compared against a stored run and the script exits
+with status 1 if a route got slower or lost throughput beyond `--tolerance`.
+
+Usage:
+    python benchmarks/load.py --rows 10000 --requests 2000 --concurrency 50 --output results.json
+    python benchmarks/load.py --baseline results.json --tolerance 0.25
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Optional
+
+import httpx
+from data_model_orm import DataModel, Field
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, create_engine
+
+from data_model_router import DataModelRouter
+
+OPERATIONS = ("create", "get", "search", "save", "delete")
+
+
+class BenchmarkModel(DataModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    age: int
+
+
+def percentile(latencies: list[float], p: float) -> float:
+    """
+    Returns the nearest-rank percentile of the sorted latencies in milliseconds.
+    """
+    return latencies[max(0, math.ceil(p * len(latencies)) - 1)] * 1000
+
+
+def peak_rss_mb() -> float:
+    """
+    Returns the peak resident set size of the process in megabytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def plan(rows: int, requests: int, rng: random.Random) -> list[tuple[str, str, str, dict]]:
+    """
+    Returns the shuffled requests of the mix, `requests` per operation.
+
+    Deletes target the last `requests` seeded entries, all other operations the entries before them,
+    so that every delete finds its entry no matter in which order the requests are served.
+    """
+    readable = max(1, rows - requests)
+    requests_ = []
+    for i in range(requests):
+        entry_id = rng.randint(1, readable)
+        requests_ += [
+            ("create", "POST", "/benchmarkmodel/", {"json": {"name": f"new-{i}", "age": i % 100}}),
+            ("get", "GET", f"/benchmarkmodel/{entry_id}/", {}),
+            ("search", "GET", "/benchmarkmodel/", {"params": {"age": i % 100, "limit": 50}}),
+            ("save", "POST", "/benchmarkmodel/save", {"params": {"id": entry_id, "age": i % 100}}),
+            ("delete", "DELETE", f"/benchmarkmodel/{readable + i + 1}/", {}),
+        ]
+    rng.shuffle(requests_)
+    return requests_
+
+
+async def run(app: FastAPI, requests: list, concurrency: int) -> dict:
+    """
+    Sends the requests with at most `concurrency` requests in flight.
+
+    Returns:
+        dict: The number of requests, errors, requests per second and p50/p95/p99 latencies per operation and in total.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+    ) as client:
+
+        async def request(operation: str, method: str, url: str, options: dict) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.request(method, url, **options)
+                latencies[operation].append(time.perf_counter() - started)
+                if response.status_code >= 400:
+                    errors[operation] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(request(*entry) for entry in requests))
+        elapsed = time.perf_counter() - started
+
+    latencies["total"] = [latency for operation in OPERATIONS for latency in latencies[operation]]
+    errors["total"] = sum(errors.values())
+    results = {}
+    for operation in (*OPERATIONS, "total"):
+        timings = sorted(latencies[operation])
+        results[operation] = {
+            "requests": len(timings),
+            "errors": errors[operation],
+            "rps": len(timings) / elapsed,
+            "p50_ms": percentile(timings, 0.50),
+            "p95_ms": percentile(timings, 0.95),
+            "p99_ms": percentile(timings, 0.99),
+        }
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Returns the regressions of the results against the baseline, i.e. a p95 latency that grew or
+    requests per second that dropped by more than the tolerance.
+    """
+    regressions = []
+    for operation, result in results.items():
+        if operation not in baseline:
+            continue
+        before = baseline[operation]
+        if result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{operation}: p95 {before['p95_ms']:.2f} ms -> {result['p95_ms']:.2f} ms"
+            )
+        if result["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{operation}: {before['rps']:.0f} -> {result['rps']:.0f} req/s")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=1000, help="requests per operation")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--async-engine", action="store_true", help="serve the routes with aiosqlite")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare the results against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+    if args.rows <= args.requests:
+        parser.error("--rows must be greater than --requests, the deletes need their own entries")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "benchmark.db")
+        BenchmarkModel.__engine__ = create_engine(f"sqlite:///{path}")
+        BenchmarkModel.metadata.create_all(bind=BenchmarkModel.__engine__)
+        with Session(BenchmarkModel.__engine__) as session:
+            session.add_all(
+                BenchmarkModel(name=f"name-{i}", age=i % 100) for i in range(args.rows)
+            )
+            session.commit()
+
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}") if args.async_engine else None
+        app = FastAPI()
+        app.include_router(DataModelRouter(BenchmarkModel, async_engine=async_engine))
+        requests = plan(args.rows, args.requests, random.Random(args.seed))
+        results = asyncio.run(run(app, requests, args.concurrency))
+        if async_engine is not None:
+            asyncio.run(async_engine.dispose())
+        BenchmarkModel.__engine__.dispose()
+
+    for operation, result in results.items():
+        print(
+            f"{operation:>7}: {result['rps']:8.0f} req/s  p50 {result['p50_ms']:7.2f} ms  "
+            f"p95 {result['p95_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms  "
+            f"errors {result['errors']}"
+        )
+    report = {
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+        "python": platform.python_version(),
+        "peak_rss_mb": peak_rss_mb(),
+        "results": results,
+    }
+    print(f"peak RSS: {report['peak_rss_mb']:.1f} MB")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file)["results"], args.tolerance)
+        for regression in regressions:
+            print(f"regression: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compares the default response model serialization with the fast serialization of DataModelRouter.
+
+Both variants search the same SQLite file. The time of a search is split into the time of a
+search that returns no entries (routing and query overhead) and the total time of the search.
+
+Usage:
+    python benchmarks/serialization.py --rows 10000 --repeat 20
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Optional
+
+from data_model_orm import DataModel, Field
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import Session, create_engine
+
+from data_model_router import DataModelRouter
+
+
+class BenchmarkModel(DataModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    age: int
+
+
+def measure(client: TestClient, params: dict, repeat: int) -> float:
+    """
+    Returns the best time of `repeat` searches in milliseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get("/benchmarkmodel/", params=params)
+        timings.append(time.perf_counter() - started)
+        assert response.status_code == 200
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        BenchmarkModel.__engine__ = create_engine(
+            f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+        )
+        BenchmarkModel.metadata.create_all(bind=BenchmarkModel.__engine__)
+        with Session(BenchmarkModel.__engine__) as session:
+            session.add_all(
+                BenchmarkModel(name=f"name-{i}", age=i % 100) for i in range(args.rows)
+            )
+            session.commit()
+
+        for name, fast_serialization in (("default", False), ("fast", True)):
+            app = FastAPI()
+            app.include_router(
+                DataModelRouter(BenchmarkModel, fast_serialization=fast_serialization)
+            )
+            client = TestClient(app)
+            empty = measure(client, {"age": -1}, args.repeat)
+            total = measure(client, {}, args.repeat)
+            print(f"{name:>8}: {total:8.2f} ms per search of {args.rows} rows ({empty:.2f} ms overhead)")
+        BenchmarkModel.__engine__.dispose()
+
+
+if __name__ == "__main__":
+    main()
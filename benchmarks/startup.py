@@ -0,0 +1,102 @@
+"""
+Measures the startup time of an app with many DataModelRouters.
+
+Creates `--models` table models with a few columns and compares including one eagerly built
+DataModelRouter per model with `DataModelRouter.for_models`, which builds the routes lazily.
+Every variant runs in a fresh process, so the caches of one variant do not speed up another.
+For each variant the time to build the app, to generate the OpenAPI schema and to serve the
+first request are printed.
+
+Usage:
+    python benchmarks/startup.py --models 300
+"""
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+
+
+def run(variant: str, models: int, directory: str) -> dict:
+    """
+    Builds the app of the variant over a SQLite file in the directory and returns its timings in seconds.
+    """
+    from data_model_orm import DataModel, Field
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from sqlmodel import create_engine
+
+    from data_model_router import DataModelRouter
+
+    engine = create_engine(f"sqlite:///{os.path.join(directory, 'benchmark.db')}")
+    data_models = []
+    for i in range(models):
+        data_model = type(
+            f"BenchmarkModel{i}",
+            (DataModel,),
+            {
+                "__annotations__": {"id": Optional[int], "name": str, "age": int, "active": bool},
+                "id": Field(default=None, primary_key=True),
+            },
+            table=True,
+        )
+        data_model.__engine__ = engine
+        data_models.append(data_model)
+    DataModel.metadata.create_all(engine)
+
+    started = time.perf_counter()
+    app = FastAPI()
+    if variant == "eager":
+        for data_model in data_models:
+            app.include_router(DataModelRouter(data_model))
+    else:
+        app.include_router(DataModelRouter.for_models(data_models))
+    built = time.perf_counter()
+    # A full collection of the objects allocated while building would otherwise land in a random later step
+    gc.collect()
+    collected = time.perf_counter()
+    client = TestClient(app)
+    assert client.get("/benchmarkmodel0/").status_code == 200
+    first_request = time.perf_counter()
+    app.openapi()
+    openapi = time.perf_counter()
+    return {
+        "build": built - started,
+        "first_request": first_request - collected,
+        "openapi": openapi - first_request,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--models", type=int, default=300)
+    parser.add_argument("--variant", choices=["eager", "for_models"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant is not None:
+        with tempfile.TemporaryDirectory() as directory:
+            print(json.dumps(run(args.variant, args.models, directory)))
+        return
+
+    for variant in ("eager", "for_models"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--models", str(args.models), "--variant", variant],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output)
+        print(
+            f"{variant:>10}: build {result['build'] * 1000:8.0f} ms  "
+            f"first request {result['first_request'] * 1000:6.1f} ms  "
+            f"openapi {result['openapi'] * 1000:7.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
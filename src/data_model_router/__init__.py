@@ -1 +1,5 @@
+from .admission import AdmissionControl, MemoryRateLimitStore, RateLimitStore
+from .cache import Cache, LRUCache
+from .changes import ChangeBroker
+from .instrumentation import Instrumentation
 from .main import DataModelRouter
@@ -0,0 +1,373 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from math import ceil
+from threading import Lock
+from time import monotonic
+from typing import AsyncIterator, Callable, Hashable
+
+from data_model_orm import DataModel
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
+from sqlalchemy import Connection, Table, func, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.concurrency import run_in_threadpool
+
+COUNTERS = ("admitted", "rate_limited", "rejected", "queued", "expensive")
+
+
+class RateLimitStore(ABC):
+    """
+    The interface of the backend holding the token buckets of a rate limit.
+
+    The buckets are in the memory of the process with `MemoryRateLimitStore`. A backend on a shared store, e.g.
+    Redis, implements `acquire` atomically on the store, so that the limit holds across processes.
+    """
+
+    @abstractmethod
+    async def acquire(self, key: Hashable, rate: float, burst: float, cost: float = 1.0) -> float:
+        """
+        Takes `cost` tokens from the bucket of the key, which holds at most `burst` tokens and refills `rate`
+        tokens per second.
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise the seconds until the bucket holds enough tokens.
+        """
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """
+    A rate limit store that keeps the token buckets in the memory of the process.
+
+    Args:
+        maxsize (int, optional): The maximum number of buckets. The least recently used bucket is dropped beyond
+                                 it, which refills it. Defaults to 65536.
+    """
+
+    def __init__(self, maxsize: int = 65536) -> None:
+        self.maxsize = maxsize
+        self._buckets: OrderedDict[Hashable, tuple[float, float]] = OrderedDict()
+        self._lock = Lock()
+
+    async def acquire(self, key: Hashable, rate: float, burst: float, cost: float = 1.0) -> float:
+        now = monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            wait = 0.0 if tokens >= cost else (cost - tokens) / rate
+            if not wait:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class ConcurrencyLimit:
+    """
+    Limits the number of requests running at once. Further requests wait in order of arrival.
+
+    Args:
+        limit (int): The number of requests that may run at once.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    async def acquire(self, timeout: float) -> bool:
+        """
+        Waits up to `timeout` seconds until the request may run. The request must be ended with `release`.
+
+        Returns:
+            bool: Whether the request may run.
+        """
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return True
+        if self.limit <= 0 or timeout <= 0:
+            return False
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        """
+        Ends a request, handing its slot to the longest waiting request.
+        """
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    @property
+    def waiting(self) -> int:
+        """
+        The number of requests waiting.
+        """
+        return len(self._waiters)
+
+
+def count_rows(connection: Connection, table: Table) -> int:
+    """
+    Returns the number of rows of the table, from the planner statistics on PostgreSQL and counted otherwise.
+    """
+    if connection.dialect.name == "postgresql":
+        estimate = connection.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"),
+            {"name": table.fullname},
+        ).scalar()
+        if estimate is not None and estimate >= 0:
+            return estimate
+    return connection.execute(select(func.count()).select_from(table)).scalar_one()
+
+
+def client_host(request: Request) -> Hashable:
+    """
+    Returns the address of the client of the request.
+    """
+    return request.client.host if request.client is not None else None
+
+
+class AdmissionControl:
+    """
+    Decides which requests of the routers run, so that expensive routes can not saturate the database and the
+    workers and cheap requests, e.g. get by id, keep a low latency during spikes.
+
+    A request passes three checks, each answered with `Retry-After`:
+
+    - The token bucket of its client, refilled with `rate` requests per second up to `burst`, must hold a token.
+      Otherwise the request is answered with 429.
+    - A search without a `limit` of at most `max_search_rows` on a table estimated to hold more rows is
+      expensive. At most `expensive_concurrency` expensive searches of a model run at once. Filters are not taken
+      into account, as their selectivity is unknown without querying, so clients pass a `limit`.
+    - At most `concurrency[route]` requests of the route of a model run at once, e.g. `{"search": 4}`. The
+      routes are named after their handlers: get, search, export, aggregate, count, create, save, delete, bulk,
+      batch, get_batch, delta and changes.
+
+    Requests over a concurrency limit wait up to `queue_timeout` seconds in order of arrival and are answered
+    with 503 afterwards. Streamed responses hold their slot until the body is sent. The counters of the limits are
+    local to the process, the rate limit is kept in `store`. An instance can be shared by several routers, which
+    then share the rate limit of a client.
+
+    Args:
+        rate (float | None, optional): The requests per second of a client. Defaults to None, which disables the
+                                       rate limit.
+        burst (int | None, optional): The requests a client can send at once. Defaults to `rate`, rounded up.
+        client_key (Callable[[Request], Hashable], optional): Returns the client of a request, e.g. from an API
+                                                              key header. Defaults to the client address.
+        concurrency (dict[str, int] | None, optional): The maximum number of requests running at once per route.
+                                                       Defaults to None.
+        queue_timeout (float, optional): The seconds a request waits for a concurrency limit. Defaults to 1.0.
+        max_search_rows (int | None, optional): The number of rows above which a search without a limit is
+                                                expensive. Defaults to None, which treats no search as expensive.
+        expensive_concurrency (int, optional): The number of expensive searches of a model running at once.
+                                               0 rejects them. Defaults to 1.
+        estimate_ttl (float, optional): The seconds the row estimate of a table is reused. Defaults to 60.
+        store (RateLimitStore | None, optional): The backend of the rate limit. Defaults to a
+                                                 `MemoryRateLimitStore`.
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: int | None = None,
+        client_key: Callable[[Request], Hashable] = client_host,
+        concurrency: dict[str, int] | None = None,
+        queue_timeout: float = 1.0,
+        max_search_rows: int | None = None,
+        expensive_concurrency: int = 1,
+        estimate_ttl: float = 60,
+        store: RateLimitStore | None = None,
+    ) -> None:
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else ceil(rate or 1)
+        self.client_key = client_key
+        self.concurrency = dict(concurrency or {})
+        self.queue_timeout = queue_timeout
+        self.max_search_rows = max_search_rows
+        self.expensive_concurrency = expensive_concurrency
+        self.estimate_ttl = estimate_ttl
+        self.store = store if store is not None else MemoryRateLimitStore()
+        self._limits: dict[tuple[str, str], ConcurrencyLimit] = {}
+        self._estimates: dict[str, tuple[float, int]] = {}
+        self._counters: dict[str, dict[str, int]] = {}
+        self._route_classes: dict[tuple, type[APIRoute]] = {}
+
+    def limit(self, model: str, route: str) -> ConcurrencyLimit | None:
+        """
+        Returns the concurrency limit of the route of the model, or None if the route is not limited.
+        """
+        size = self.expensive_concurrency if route == "expensive" else self.concurrency.get(route)
+        if size is None:
+            return None
+        if (model, route) not in self._limits:
+            self._limits[(model, route)] = ConcurrencyLimit(size)
+        return self._limits[(model, route)]
+
+    async def estimate_rows(self, data_model: type[DataModel], async_engine: AsyncEngine | None) -> int:
+        """
+        Returns the estimated number of rows of the table of the DataModel, reused for `estimate_ttl` seconds.
+        """
+        expires, rows = self._estimates.get(data_model.__name__, (0.0, 0))
+        if expires > monotonic():
+            return rows
+        table = data_model.__table__
+        if async_engine is not None:
+            async with async_engine.connect() as connection:
+                rows = await connection.run_sync(count_rows, table)
+        else:
+
+            def count() -> int:
+                with data_model.__engine__.connect() as connection:
+                    return count_rows(connection, table)
+
+            rows = await run_in_threadpool(count)
+        self._estimates[data_model.__name__] = (monotonic() + self.estimate_ttl, rows)
+        return rows
+
+    async def is_expensive(
+        self, request: Request, data_model: type[DataModel], async_engine: AsyncEngine | None
+    ) -> bool:
+        """
+        Returns whether the request is a search that may return more than `max_search_rows` rows.
+        """
+        limit = request.query_params.get("limit")
+        if limit is not None and limit.isdigit() and int(limit) <= self.max_search_rows:
+            return False
+        return await self.estimate_rows(data_model, async_engine) > self.max_search_rows
+
+    def count(self, model: str, counter: str) -> None:
+        """
+        Increments a counter of the model.
+        """
+        counters = self._counters.setdefault(model, dict.fromkeys(COUNTERS, 0))
+        counters[counter] += 1
+
+    def snapshot(self, model: str) -> dict[str, int]:
+        """
+        Returns the number of admitted, rate limited, rejected, queued and expensive requests of the model and
+        the number of requests running and waiting for a concurrency limit.
+        """
+        limits = [limit for (name, _), limit in self._limits.items() if name == model]
+        return {
+            **self._counters.get(model, dict.fromkeys(COUNTERS, 0)),
+            "running": sum(limit.active for limit in limits),
+            "waiting": sum(limit.waiting for limit in limits),
+        }
+
+    def route_class(
+        self,
+        data_model: type[DataModel],
+        async_engine: AsyncEngine | None = None,
+        base: type[APIRoute] = APIRoute,
+    ) -> type[APIRoute]:
+        """
+        Returns a route class that admits the requests of the routes of the DataModel.
+
+        Args:
+            data_model (type[DataModel]): The DataModel of the routes.
+            async_engine (AsyncEngine | None, optional): The engine to estimate the rows with instead of
+                                                         `data_model.__engine__`. Defaults to None.
+            base (type[APIRoute], optional): The route class to extend. Defaults to APIRoute.
+
+        Returns:
+            type[APIRoute]: The route class.
+        """
+        if (data_model, async_engine, base) not in self._route_classes:
+            admission = self
+            model = data_model.__name__
+
+            def unavailable(detail: str) -> Response:
+                admission.count(model, "rejected")
+                retry_after = max(1, ceil(admission.queue_timeout))
+                return JSONResponse({"detail": detail}, status_code=503, headers={"Retry-After": str(retry_after)})
+
+            async def iterate(limits: list[ConcurrencyLimit], iterator: AsyncIterator) -> AsyncIterator:
+                """
+                Iterates the body of a streamed response, releasing the limits afterwards.
+                """
+                try:
+                    async for chunk in iterator:
+                        yield chunk
+                finally:
+                    for limit in limits:
+                        limit.release()
+
+            class AdmittedRoute(base):
+                def get_route_handler(self) -> Callable:
+                    handler = super().get_route_handler()
+                    route = self.endpoint.__name__
+
+                    async def admitted_handler(request: Request) -> Response:
+                        if admission.rate is not None:
+                            wait = await admission.store.acquire(
+                                admission.client_key(request), admission.rate, admission.burst
+                            )
+                            if wait:
+                                admission.count(model, "rate_limited")
+                                return JSONResponse(
+                                    {"detail": "Too many requests"},
+                                    status_code=429,
+                                    headers={"Retry-After": str(ceil(wait))},
+                                )
+                        limits = []
+                        if (
+                            route == "search"
+                            and admission.max_search_rows is not None
+                            and await admission.is_expensive(request, data_model, async_engine)
+                        ):
+                            admission.count(model, "expensive")
+                            limits.append(
+                                (
+                                    admission.limit(model, "expensive"),
+                                    f"Too many searches without a limit of at most {admission.max_search_rows}"
+                                    " rows, retry later or pass a limit",
+                                )
+                            )
+                        if (limit := admission.limit(model, route)) is not None:
+                            limits.append((limit, "Too many concurrent requests"))
+                        acquired = []
+                        streaming = False
+                        try:
+                            for limit, detail in limits:
+                                if limit.active >= limit.limit or limit.waiting:
+                                    admission.count(model, "queued")
+                                if not await limit.acquire(admission.queue_timeout):
+                                    return unavailable(detail)
+                                acquired.append(limit)
+                            admission.count(model, "admitted")
+                            response = await handler(request)
+                            if acquired and isinstance(response, StreamingResponse):
+                                response.body_iterator = iterate(acquired, response.body_iterator)
+                                streaming = True
+                            return response
+                        finally:
+                            if not streaming:
+                                for limit in acquired:
+                                    limit.release()
+
+                    return admitted_handler
+
+            self._route_classes[(data_model, async_engine, base)] = AdmittedRoute
+        return self._route_classes[(data_model, async_engine, base)]
@@ -0,0 +1,176 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Hashable, Iterable
+
+from data_model_orm import DataModel
+from fastapi import HTTPException
+
+from .filters import parse_filter
+
+
+class Cache(ABC):
+    """
+    The interface of a cache backend used by DataModelRouter.
+
+    Keys are hashable tuples and values are never None, so `get` returns None on a miss.
+    """
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Returns the value stored for the key or None if there is no valid entry.
+        """
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Stores the value for the key.
+        """
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        """
+        Removes the entry of the key if it exists.
+        """
+
+    @abstractmethod
+    def delete_matching(self, predicate: Callable[[Hashable], bool]) -> None:
+        """
+        Removes all entries whose key matches the predicate.
+        """
+
+
+class LRUCache(Cache):
+    """
+    An in-process cache that evicts the least recently used entries and expires entries after a time to live.
+
+    Args:
+        maxsize (int, optional): The maximum number of entries. Defaults to 1024.
+        ttl (float | None, optional): The time to live of an entry in seconds. None disables the expiry. Defaults to 60.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = 60) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires = monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_matching(self, predicate: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DataModelCache:
+    """
+    Caches the entries and search results of a single DataModel in a cache backend.
+
+    Entries are keyed by their primary key and search results by their normalized query parameters.
+    Writes invalidate the entries of the written rows and every search result whose filters match the
+    old or the new values of a written row, so that reads stay consistent.
+
+    Args:
+        cache (Cache): The cache backend.
+        data_model (type[DataModel]): The DataModel whose entries are cached.
+        ignore (Iterable[str], optional): Query parameters that do not filter the results, e.g. pagination parameters.
+    """
+
+    def __init__(
+        self, cache: Cache, data_model: type[DataModel], ignore: Iterable[str] = ()
+    ) -> None:
+        self.cache = cache
+        self.data_model = data_model
+        self.name = data_model.__name__
+        self.primary_key = data_model.get_primary_key()
+        self.ignore = set(ignore)
+        self.generation = 0
+
+    def entry_key(self, primary_key: Any) -> tuple:
+        """
+        Returns the cache key of the entry with the primary key.
+        """
+        return (self.name, "entry", str(primary_key))
+
+    def search_key(self, query_params: Iterable[tuple[str, str]]) -> tuple:
+        """
+        Returns the cache key of a search, independent of the order of the query parameters.
+        """
+        return (self.name, "search", tuple(sorted(query_params)))
+
+    def get(self, key: tuple) -> Any | None:
+        """
+        Returns the cached value of the key or None on a miss.
+        """
+        return self.cache.get(key)
+
+    def set(self, key: tuple, value: Any, generation: int) -> None:
+        """
+        Stores the value unless an invalidation happened since the value was read.
+
+        Args:
+            key (tuple): The cache key.
+            value (Any): The value to store.
+            generation (int): The generation at the time the value was read from the database.
+        """
+        if generation == self.generation:
+            self.cache.set(key, value)
+
+    def invalidate(self, *rows: dict[str, Any], all_searches: bool = False) -> None:
+        """
+        Invalidates the entries of the rows and the search results they may appear in.
+
+        Args:
+            *rows (dict[str, Any]): The old and new values of the written rows.
+            all_searches (bool, optional): Invalidate all search results, e.g. if the old values are unknown.
+        """
+        self.generation += 1
+        for row in rows:
+            self.cache.delete(self.entry_key(row[self.primary_key]))
+        self.cache.delete_matching(
+            lambda key: key[0] == self.name
+            and key[1] == "search"
+            and (all_searches or any(self._matches(row, key[2]) for row in rows))
+        )
+
+    def _matches(self, row: dict[str, Any], query_params: tuple) -> bool:
+        """
+        Returns whether the row may be part of the results of a search, erring on the side of a match.
+        """
+        for name, value in query_params:
+            if name in self.ignore:
+                continue
+            try:
+                search_filter = parse_filter(name, value, self.data_model)
+            except HTTPException:
+                continue
+            if not search_filter.matches(row.get(search_filter.field)):
+                return False
+        return True
@@ -0,0 +1,202 @@
+import asyncio
+from collections import deque
+from threading import Lock
+from typing import Any, Iterable, Literal, NamedTuple
+
+from fastapi import HTTPException
+from pydantic_core import to_json
+
+from .filters import Filter
+
+ChangeOperation = Literal["create", "save", "delete"]
+
+
+class ChangeEvent(NamedTuple):
+    """
+    A committed write of an entry. `entry` holds the new values, or the old values of a deleted entry, and
+    `previous` the old values of a saved entry if they are known.
+    """
+
+    seq: int
+    model: str
+    op: ChangeOperation
+    primary_key: Any
+    entry: dict[str, Any]
+    previous: dict[str, Any] | None = None
+
+    def to_json(self) -> bytes:
+        """
+        Serializes the event for clients, without the previous values.
+        """
+        return to_json(
+            {"seq": self.seq, "model": self.model, "op": self.op, "primary_key": self.primary_key, "entry": self.entry}
+        )
+
+
+class Subscription:
+    """
+    The events of a model that match the filters of a subscriber, in the order they were published.
+
+    The events are buffered in a bounded queue. If the subscriber falls more than `buffer_size` events behind,
+    it is dropped: the buffered events are still returned, then `get` returns None, and the subscriber can
+    resume after the last sequence number it received.
+
+    Use `ChangeBroker.subscribe` to create a subscription.
+    """
+
+    def __init__(
+        self,
+        broker: "ChangeBroker",
+        model: str,
+        filters: Iterable[Filter],
+        buffer_size: int,
+    ) -> None:
+        self.broker = broker
+        self.model = model
+        self.filters = list(filters)
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[ChangeEvent] = asyncio.Queue(buffer_size)
+        self.backlog: deque[ChangeEvent] = deque()
+        self.overflowed = False
+
+    def matches(self, event: ChangeEvent) -> bool:
+        """
+        Returns whether the event is of the model and its new or old values match all filters.
+        """
+        if event.model != self.model:
+            return False
+        return any(
+            row is not None and all(search_filter.matches(row.get(search_filter.field)) for search_filter in self.filters)
+            for row in (event.entry, event.previous)
+        )
+
+    def deliver(self, event: ChangeEvent) -> None:
+        """
+        Buffers the event, dropping the subscriber if its buffer is full. Called on the event loop of the subscriber.
+        """
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            self.broker.unsubscribe(self)
+
+    async def get(self) -> ChangeEvent | None:
+        """
+        Returns the next event, waiting for it to be published, or None if the subscriber was dropped.
+        """
+        if self.backlog:
+            return self.backlog.popleft()
+        if self.overflowed and self.queue.empty():
+            return None
+        return await self.queue.get()
+
+    def close(self) -> None:
+        """
+        Stops receiving events.
+        """
+        self.broker.unsubscribe(self)
+
+
+class ChangeBroker:
+    """
+    An in-process broker for the changes of DataModels, which the write routes publish after they committed.
+
+    Every event gets the next sequence number of the broker. The last `history_size` events are kept, so that
+    subscribers can resume after the sequence number of the last event they received. A broker can be shared by
+    the routers of several models; subscribers only receive the events of their model.
+
+    Events can be published from any thread and are delivered on the event loop of each subscriber.
+
+    Args:
+        buffer_size (int, optional): The number of events buffered per subscriber before it is dropped. Defaults to 100.
+        history_size (int, optional): The number of events kept for resuming subscribers. Defaults to 1000.
+    """
+
+    def __init__(self, buffer_size: int = 100, history_size: int = 1000) -> None:
+        self.buffer_size = buffer_size
+        self.history: deque[ChangeEvent] = deque(maxlen=history_size)
+        self.seq = 0
+        self.dropped = 0
+        self._subscriptions: set[Subscription] = set()
+        self._lock = Lock()
+
+    def publish(
+        self,
+        model: str,
+        op: ChangeOperation,
+        primary_key: Any,
+        entry: dict[str, Any],
+        previous: dict[str, Any] | None = None,
+    ) -> ChangeEvent:
+        """
+        Publishes a committed write to the matching subscribers.
+
+        Args:
+            model (str): The name of the DataModel.
+            op (ChangeOperation): "create", "save" or "delete".
+            primary_key (Any): The primary key of the entry.
+            entry (dict[str, Any]): The new values of the entry, or the old values of a deleted entry.
+            previous (dict[str, Any] | None, optional): The old values of a saved entry. Defaults to None.
+
+        Returns:
+            ChangeEvent: The published event.
+        """
+        with self._lock:
+            self.seq += 1
+            event = ChangeEvent(self.seq, model, op, primary_key, entry, previous)
+            self.history.append(event)
+            for subscription in list(self._subscriptions):
+                if subscription.matches(event):
+                    try:
+                        subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+                    except RuntimeError:
+                        self._subscriptions.discard(subscription)
+        return event
+
+    def subscribe(self, model: str, filters: Iterable[Filter] = (), after: int | None = None) -> Subscription:
+        """
+        Subscribes to the events of the model that match the filters. Must be called on an event loop.
+
+        Args:
+            model (str): The name of the DataModel.
+            filters (Iterable[Filter], optional): The filters the new or old values of an entry must match. Defaults to ().
+            after (int | None, optional): Start with the kept events after this sequence number instead of the
+                                          next published event. Defaults to None.
+
+        Raises:
+            HTTPException: If events after `after` are no longer kept or `after` was never published.
+
+        Returns:
+            Subscription: The subscription.
+        """
+        with self._lock:
+            backlog = []
+            if after is not None:
+                oldest = self.history[0].seq if self.history else self.seq + 1
+                if after > self.seq or (after < oldest - 1 and len(self.history) == self.history.maxlen):
+                    raise HTTPException(
+                        status_code=410, detail=f"The changes after sequence number {after} are not available"
+                    )
+                backlog = [event for event in self.history if event.seq > after]
+            subscription = Subscription(self, model, filters, self.buffer_size)
+            subscription.backlog.extend(event for event in backlog if subscription.matches(event))
+            self._subscriptions.add(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Removes the subscription, counting it as dropped if it fell behind.
+        """
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+                self.dropped += subscription.overflowed
+
+    def snapshot(self) -> dict[str, int]:
+        """
+        Returns the last sequence number and the number of subscribers and of dropped subscribers.
+        """
+        with self._lock:
+            return {"seq": self.seq, "subscribers": len(self._subscriptions), "dropped": self.dropped}
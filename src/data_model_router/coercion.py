@@ -0,0 +1,88 @@
+from functools import cache
+from typing import Any, Mapping
+
+from data_model_orm import DataModel
+from fastapi import HTTPException
+from pydantic import TypeAdapter, ValidationError
+from typing_extensions import TypedDict
+
+from .export import unwrap_optional
+
+
+class CoercionPlan:
+    """
+    Converts the raw query values of a DataModel to the types of its fields.
+
+    The plan is a single pydantic-core validator for a TypedDict of all fields, built once per DataModel, so all
+    values of a request are converted in one pass, e.g. "30" to 30 for an integer field, before they are bound to
+    a statement. The database then compares values of the column type and does not cast them, which may prevent
+    the use of an index on some backends. Invalid values are answered with 422, like FastAPI's own validation.
+
+    Use `get_coercion_plan` to get the plan of a DataModel.
+
+    Args:
+        data_model (type[DataModel]): The DataModel whose fields define the types.
+    """
+
+    def __init__(self, data_model: type[DataModel]) -> None:
+        values_type = TypedDict(
+            f"{data_model.__name__}Values",
+            {field_name: field.annotation for field_name, field in data_model.model_fields.items()},
+            total=False,
+        )
+        self.adapter = TypeAdapter(values_type)
+
+    def coerce(self, values: Mapping[str, Any], location: str = "query") -> dict[str, Any]:
+        """
+        Converts the values to the types of their fields.
+
+        Args:
+            values (Mapping[str, Any]): The values keyed by field name.
+            location (str, optional): Where the values come from, for the error locations. Defaults to "query".
+
+        Raises:
+            HTTPException: If a value can not be converted.
+
+        Returns:
+            dict[str, Any]: The converted values.
+        """
+        try:
+            return self.adapter.validate_python(dict(values))
+        except ValidationError as e:
+            raise validation_error(e, location)
+
+
+def validation_error(error: ValidationError, location: str) -> HTTPException:
+    """
+    Returns a 422 exception with the errors in the format of FastAPI's request validation errors.
+    """
+    return HTTPException(
+        status_code=422,
+        detail=[
+            {
+                "type": item["type"],
+                "loc": [location, *item["loc"]],
+                "msg": item["msg"],
+                "input": item["input"],
+            }
+            for item in error.errors(include_url=False)
+        ],
+    )
+
+
+@cache
+def get_coercion_plan(data_model: type[DataModel]) -> CoercionPlan:
+    """
+    Returns the coercion plan of the DataModel, building it on the first call.
+    """
+    return CoercionPlan(data_model)
+
+
+def primary_key_type(data_model: type[DataModel]) -> Any:
+    """
+    Returns the type of the primary key of the DataModel without `Optional`, for its path parameter.
+
+    Declaring the path parameter with this type lets FastAPI convert it before the entry is selected, instead of
+    binding the raw string, and documents the type in the OpenAPI schema.
+    """
+    return unwrap_optional(data_model.model_fields[data_model.get_primary_key()].annotation)
@@ -0,0 +1,115 @@
+import gzip
+from importlib.util import find_spec
+from typing import Callable
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+
+from .instrumentation import phase
+from .utils import parse_accept
+
+_route_classes: dict[tuple[type[APIRoute], int, int, int], type[APIRoute]] = {}
+
+
+def available_encodings() -> list[str]:
+    """
+    Returns the content encodings that can be written, in the order of preference. Brotli requires `brotli`.
+    """
+    if find_spec("brotli") is None:
+        return ["gzip"]
+    return ["br", "gzip"]
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """
+    Returns the content encoding with the highest quality in the Accept-Encoding header, or None for identity.
+    Between encodings of the same quality, brotli is preferred.
+
+    Args:
+        accept_encoding (str | None): The value of the Accept-Encoding header.
+
+    Returns:
+        str | None: "br", "gzip" or None.
+    """
+    qualities = parse_accept(accept_encoding)
+    wildcard = qualities.get("*", 0.0)
+    accepted = [
+        (qualities.get(encoding, wildcard), encoding)
+        for encoding in available_encodings()
+        if qualities.get(encoding, wildcard) > 0
+    ]
+    if not accepted:
+        return None
+    return max(accepted, key=lambda item: item[0])[1]
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    """
+    Compresses the body with the content encoding.
+
+    Args:
+        body (bytes): The body to compress.
+        encoding (str): "br" or "gzip".
+        gzip_level (int, optional): The gzip compression level. Defaults to 6.
+        brotli_quality (int, optional): The brotli quality, where 4 compresses better than gzip at a similar speed. Defaults to 4.
+
+    Returns:
+        bytes: The compressed body.
+    """
+    if encoding == "br":
+        import brotli
+
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+def compressed_route_class(
+    minimum_size: int, base: type[APIRoute] = APIRoute, gzip_level: int = 6, brotli_quality: int = 4
+) -> type[APIRoute]:
+    """
+    Returns a route class that compresses response bodies of at least `minimum_size` bytes.
+
+    The encoding is negotiated with the Accept-Encoding header, preferring brotli over gzip. Streamed responses
+    and responses that are already encoded are left as they are. The time spent is recorded as the `compress`
+    phase of instrumented routes. Route classes are cached, so routers with the same options share one.
+
+    Args:
+        minimum_size (int): The size in bytes from which a body is compressed.
+        base (type[APIRoute], optional): The route class to extend. Defaults to APIRoute.
+        gzip_level (int, optional): The gzip compression level. Defaults to 6.
+        brotli_quality (int, optional): The brotli quality. Defaults to 4.
+
+    Returns:
+        type[APIRoute]: The route class.
+    """
+    key = (base, minimum_size, gzip_level, brotli_quality)
+    if key not in _route_classes:
+
+        class CompressedRoute(base):
+            def get_route_handler(self) -> Callable:
+                handler = super().get_route_handler()
+
+                async def compressed_handler(request: Request) -> Response:
+                    response = await handler(request)
+                    if (
+                        isinstance(response, StreamingResponse)
+                        or len(response.body) < minimum_size
+                        or "content-encoding" in response.headers
+                    ):
+                        return response
+                    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+                    if encoding is None:
+                        return response
+                    with phase("compress"):
+                        response.body = compress(response.body, encoding, gzip_level, brotli_quality)
+                    response.headers["Content-Encoding"] = encoding
+                    response.headers["Content-Length"] = str(len(response.body))
+                    vary = response.headers.get("vary")
+                    response.headers["Vary"] = "Accept-Encoding" if vary is None else f"{vary}, Accept-Encoding"
+                    return response
+
+                return compressed_handler
+
+        _route_classes[key] = CompressedRoute
+    return _route_classes[key]
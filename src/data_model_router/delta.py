@@ -0,0 +1,86 @@
+from functools import lru_cache
+from threading import Lock
+from time import time_ns
+from typing import Any, Iterable
+from weakref import WeakSet
+
+from data_model_orm import DataModel
+from sqlalchemy import BigInteger, Column, Engine, Table, delete, insert
+from sqlmodel import Session
+
+_last_watermark = 0
+_watermark_lock = Lock()
+_tombstone_engines: WeakSet[Engine] = WeakSet()
+
+
+def next_watermark() -> int:
+    """
+    Returns the watermark of a write: the current time in microseconds, but always greater than the last one
+    returned, so that the writes of a process never share a watermark even if the clock goes back.
+    """
+    global _last_watermark
+    with _watermark_lock:
+        _last_watermark = max(_last_watermark + 1, time_ns() // 1000)
+        return _last_watermark
+
+
+def settled_watermark(lag: float) -> int:
+    """
+    Returns the watermark up to which writes are considered committed, `lag` seconds before the current time.
+
+    A write is stamped shortly before it commits, so a delta that only returns changes up to this watermark does
+    not skip a write that commits after the delta was read, as long as it commits within `lag` seconds.
+    """
+    return time_ns() // 1000 - int(lag * 1_000_000)
+
+
+@lru_cache(maxsize=None)
+def get_tombstone_table(data_model: type[DataModel]) -> Table:
+    """
+    Returns the table recording the primary keys of deleted entries with the watermark of their deletion.
+
+    The table `{table}_tombstone` is added to the metadata of the DataModel, so `metadata.create_all` creates it
+    with the table of the DataModel. Otherwise it is created on first use by `ensure_tombstone_table`.
+
+    Args:
+        data_model (type[DataModel]): The DataModel whose deletions are recorded.
+
+    Returns:
+        Table: The tombstone table with a `primary_key` and an indexed `watermark` column.
+    """
+    table = data_model.__table__
+    primary_key_column = table.c[data_model.get_primary_key()]
+    return Table(
+        f"{table.name}_tombstone",
+        table.metadata,
+        Column("primary_key", primary_key_column.type, primary_key=True),
+        Column("watermark", BigInteger, nullable=False, index=True),
+        extend_existing=True,
+    )
+
+
+def ensure_tombstone_table(session: Session, tombstones: Table) -> None:
+    """
+    Creates the tombstone table if it does not exist, checking once per engine.
+    """
+    engine = session.get_bind()
+    if engine not in _tombstone_engines:
+        tombstones.create(session.connection(), checkfirst=True)
+        _tombstone_engines.add(engine)
+
+
+def write_tombstones(session: Session, tombstones: Table, primary_keys: Iterable[Any]) -> None:
+    """
+    Records the deletion of the entries with a watermark each, in the transaction of the session.
+
+    Args:
+        session (Session): The session deleting the entries.
+        tombstones (Table): The tombstone table of the DataModel.
+        primary_keys (Iterable[Any]): The primary keys of the deleted entries.
+    """
+    rows = [{"primary_key": key, "watermark": next_watermark()} for key in primary_keys]
+    if not rows:
+        return
+    ensure_tombstone_table(session, tombstones)
+    session.execute(delete(tombstones).where(tombstones.c.primary_key.in_([row["primary_key"] for row in rows])))
+    session.execute(insert(tombstones), rows)
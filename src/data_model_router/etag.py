@@ -0,0 +1,143 @@
+from hashlib import blake2b
+from typing import Iterable
+
+from data_model_orm import DataModel
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import Row
+
+from .serialization import Serializer, json_response
+
+
+def compute_etag(*chunks: bytes) -> str:
+    """
+    Computes a strong ETag from the given chunks, e.g. the serialized response body.
+
+    Args:
+        *chunks (bytes): The chunks to hash.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    digest = blake2b(digest_size=16)
+    for chunk in chunks:
+        digest.update(chunk)
+    return f'"{digest.hexdigest()}"'
+
+
+def compute_version_etag(
+    entries: Iterable[DataModel], primary_key: str, version_field: str
+) -> str:
+    """
+    Computes a strong ETag from the primary keys and row versions of the entries without serializing them.
+
+    Args:
+        entries (Iterable[DataModel]): The entries of the response.
+        primary_key (str): The name of the primary key field.
+        version_field (str): The name of the row version field.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    return compute_etag(
+        *(
+            f"{getattr(entry, primary_key)}:{getattr(entry, version_field)};".encode()
+            for entry in entries
+        )
+    )
+
+
+def etag_matches(header: str | None, etag: str, weak: bool = False) -> bool:
+    """
+    Checks whether an If-Match or If-None-Match header matches the ETag.
+
+    Args:
+        header (str | None): The value of the header.
+        etag (str): The current ETag.
+        weak (bool, optional): Use the weak comparison of If-None-Match instead of the strong comparison of If-Match.
+
+    Returns:
+        bool: Whether the header matches the ETag.
+    """
+    if header is None:
+        return False
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if weak:
+            tag = tag.removeprefix("W/")
+        if tag == etag:
+            return True
+    return False
+
+
+def check_if_match(request: Request, etag: str | None) -> None:
+    """
+    Checks the If-Match header of a write request against the ETag of the current entry.
+
+    Args:
+        request (Request): The FastAPI request object.
+        etag (str | None): The ETag of the current entry or None if there is no entry.
+
+    Raises:
+        HTTPException: If the header is given and does not match.
+    """
+    header = request.headers.get("if-match")
+    if header is not None and (etag is None or not etag_matches(header, etag)):
+        raise HTTPException(status_code=412, detail="Precondition failed: ETag does not match")
+
+
+def entry_etag(entry: DataModel, serializer: Serializer, version_field: str | None = None) -> str:
+    """
+    Computes the ETag of a single entry, as returned by the read routes.
+
+    Args:
+        entry (DataModel): The entry.
+        serializer (Serializer): The serializer of the DataModel.
+        version_field (str | None, optional): The name of the row version field. If None, the serialized entry is hashed.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    if version_field is not None:
+        return compute_version_etag([entry], serializer.primary_key, version_field)
+    return compute_etag(serializer.dump_json(entry))
+
+
+def conditional_response(
+    request: Request,
+    content: DataModel | list[DataModel],
+    serializer: Serializer,
+    version_field: str | None = None,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """
+    Returns a 304 response if the If-None-Match header matches the ETag of the content and the serialized content otherwise.
+
+    If a version field is given, the ETag is computed from the row versions, so a 304 response does not serialize the content at all.
+
+    Args:
+        request (Request): The FastAPI request object.
+        content (DataModel | list[DataModel]): The entry or the entries of the response.
+        serializer (Serializer): The serializer of the DataModel.
+        version_field (str | None, optional): The name of the row version field. Defaults to None.
+        headers (dict[str, str] | None, optional): Additional response headers.
+
+    Returns:
+        Response: The response.
+    """
+    body = None
+    if version_field is not None:
+        entries = [content] if isinstance(content, (DataModel, Row)) else content
+        etag = compute_version_etag(entries, serializer.primary_key, version_field)
+    else:
+        body = serializer.serialize(content)
+        etag = compute_etag(body)
+    headers = {**(headers or {}), "ETag": etag}
+    if etag_matches(request.headers.get("if-none-match"), etag, weak=True):
+        return Response(status_code=304, headers=headers)
+    return json_response(
+        body if body is not None else serializer.serialize(content),
+        headers=headers,
+        media_type=serializer.media_type,
+    )
@@ -0,0 +1,280 @@
+import csv
+import io
+import json
+from datetime import date, datetime, time
+from enum import Enum
+from functools import cache
+from importlib.util import find_spec
+from types import NoneType, UnionType
+from typing import Any, Callable, Sequence, Union, get_args, get_origin
+
+from data_model_orm import DataModel
+from pydantic import TypeAdapter
+from sqlalchemy import Row
+
+from .utils import parse_accept
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+EXPORT_EXTENSIONS = {"csv": "csv", "arrow": "arrows", "parquet": "parquet"}
+
+
+def unwrap_optional(annotation: Any) -> Any:
+    """
+    Returns the type of an `Optional` annotation, or the annotation itself.
+    """
+    if get_origin(annotation) in (Union, UnionType):
+        arguments = [argument for argument in get_args(annotation) if argument is not NoneType]
+        if len(arguments) == 1:
+            return arguments[0]
+    return annotation
+
+
+def get_converter(annotation: Any) -> Callable[[Any], Any] | None:
+    """
+    Returns a function converting a column value to a CSV cell or an Arrow string, or None if it is written as is.
+
+    Args:
+        annotation (Any): The annotation of the field.
+
+    Returns:
+        Callable[[Any], Any] | None: The converter, which leaves None unchanged.
+    """
+    field_type = unwrap_optional(annotation)
+    if field_type in (int, float, str):
+        return None
+    if field_type is bool:
+        return lambda value: None if value is None else ("true" if value else "false")
+    if field_type in (datetime, date, time):
+        return lambda value: None if value is None else value.isoformat()
+    if isinstance(field_type, type) and issubclass(field_type, Enum):
+        return lambda value: None if value is None else getattr(value, "value", value)
+    adapter = TypeAdapter(annotation)
+
+    def convert(value: Any) -> str | None:
+        if value is None:
+            return None
+        value = adapter.dump_python(value, mode="json")
+        return value if isinstance(value, str) else json.dumps(value)
+
+    return convert
+
+
+@cache
+def get_export_columns(data_model: type[DataModel]) -> tuple[tuple[str, str, Any], ...]:
+    """
+    Returns the field name, the header and the annotation of every exported column, in the order of the model.
+    """
+    return tuple(
+        (field_name, field.serialization_alias or field.alias or field_name, field.annotation)
+        for field_name, field in data_model.model_fields.items()
+    )
+
+
+def available_formats() -> list[str]:
+    """
+    Returns the export formats that can be written, which are the Arrow formats only if pyarrow is installed.
+    """
+    if find_spec("pyarrow") is None:
+        return ["csv"]
+    return list(EXPORT_MEDIA_TYPES)
+
+
+def negotiate_format(accept: str | None) -> str | None:
+    """
+    Returns the export format with the highest quality in the Accept header, CSV by default.
+
+    Args:
+        accept (str | None): The value of the Accept header.
+
+    Returns:
+        str | None: The format or None if no available format is acceptable.
+    """
+    formats = available_formats()
+    if not accept:
+        return formats[0]
+    for media_type, quality in parse_accept(accept).items():
+        if quality == 0:
+            break
+        for export_format in formats:
+            full_type = EXPORT_MEDIA_TYPES[export_format]
+            if media_type in (full_type, "*/*", f"{full_type.split('/')[0]}/*"):
+                return export_format
+    return None
+
+
+class Encoder:
+    """
+    Encodes chunks of result rows of a DataModel to an export format, without building entries.
+
+    Use `get_encoder` to create the encoder of a format. An encoder keeps the state of a single export.
+
+    Args:
+        data_model (type[DataModel]): The DataModel whose columns are selected, in the order of the model fields.
+    """
+
+    def __init__(self, data_model: type[DataModel]) -> None:
+        self.columns = get_export_columns(data_model)
+
+    def encode(self, rows: Sequence[Row]) -> bytes:
+        """
+        Encodes a chunk of rows.
+        """
+        raise NotImplementedError
+
+    def finish(self) -> bytes:
+        """
+        Returns the end of the export after the last chunk.
+        """
+        return b""
+
+
+class CsvEncoder(Encoder):
+    """
+    Encodes result rows as CSV with a header row. None is written as an empty cell and booleans as `true`/`false`.
+    """
+
+    def __init__(self, data_model: type[DataModel]) -> None:
+        super().__init__(data_model)
+        self.converters = [
+            (index, converter)
+            for index, (_, _, annotation) in enumerate(self.columns)
+            if (converter := get_converter(annotation)) is not None
+        ]
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer, lineterminator="\n")
+        self.writer.writerow(header for _, header, _ in self.columns)
+
+    def encode(self, rows: Sequence[Row]) -> bytes:
+        if self.converters:
+            rows = [self.convert(row) for row in rows]
+        self.writer.writerows(rows)
+        chunk = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return chunk.encode()
+
+    def convert(self, row: Row) -> list:
+        values = list(row)
+        for index, converter in self.converters:
+            values[index] = converter(values[index])
+        return values
+
+    def finish(self) -> bytes:
+        return self.encode([])
+
+
+class _Sink(io.RawIOBase):
+    """
+    A writable file that collects the written bytes until they are taken, while keeping the position for pyarrow.
+    """
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+@cache
+def get_arrow_schema(data_model: type[DataModel]) -> Any:
+    """
+    Returns the Arrow schema of the DataModel, with the types derived from the annotations of the model fields.
+    Fields of other types are exported as strings.
+    """
+    import pyarrow
+
+    types = {
+        int: pyarrow.int64(),
+        float: pyarrow.float64(),
+        str: pyarrow.string(),
+        bool: pyarrow.bool_(),
+        bytes: pyarrow.binary(),
+        datetime: pyarrow.timestamp("us"),
+        date: pyarrow.date32(),
+        time: pyarrow.time64("us"),
+    }
+    return pyarrow.schema(
+        [
+            pyarrow.field(header, types.get(unwrap_optional(annotation), pyarrow.string()))
+            for _, header, annotation in get_export_columns(data_model)
+        ]
+    )
+
+
+class ArrowEncoder(Encoder):
+    """
+    Encodes result rows as a record batch per chunk of an Arrow IPC stream or a row group per chunk of a Parquet file.
+
+    Requires pyarrow.
+
+    Args:
+        data_model (type[DataModel]): The DataModel whose columns are selected.
+        parquet (bool, optional): Write Parquet instead of an Arrow IPC stream. Defaults to False.
+    """
+
+    def __init__(self, data_model: type[DataModel], parquet: bool = False) -> None:
+        import pyarrow
+        import pyarrow.parquet
+
+        super().__init__(data_model)
+        self.pyarrow = pyarrow
+        self.schema = get_arrow_schema(data_model)
+        self.converters = [
+            get_converter(annotation) if self.schema.field(index).type == pyarrow.string() else None
+            for index, (_, _, annotation) in enumerate(self.columns)
+        ]
+        self.sink = _Sink()
+        if parquet:
+            self.writer = pyarrow.parquet.ParquetWriter(self.sink, self.schema)
+        else:
+            self.writer = pyarrow.ipc.new_stream(self.sink, self.schema)
+
+    def encode(self, rows: Sequence[Row]) -> bytes:
+        if rows:
+            arrays = [
+                self.pyarrow.array(
+                    values if converter is None else [converter(value) for value in values],
+                    type=field.type,
+                )
+                for values, converter, field in zip(zip(*rows), self.converters, self.schema)
+            ]
+            self.writer.write_batch(self.pyarrow.RecordBatch.from_arrays(arrays, schema=self.schema))
+        return self.sink.take()
+
+    def finish(self) -> bytes:
+        self.writer.close()
+        return self.sink.take()
+
+
+def get_encoder(data_model: type[DataModel], export_format: str) -> Encoder:
+    """
+    Returns a new encoder of the DataModel for the export format.
+
+    Args:
+        data_model (type[DataModel]): The DataModel to export.
+        export_format (str): One of the keys of `EXPORT_MEDIA_TYPES`.
+
+    Returns:
+        Encoder: The encoder.
+    """
+    if export_format == "csv":
+        return CsvEncoder(data_model)
+    return ArrowEncoder(data_model, parquet=export_format == "parquet")
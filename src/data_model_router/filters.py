@@ -0,0 +1,273 @@
+from functools import cache
+from typing import Any, Iterable, NamedTuple
+
+from data_model_orm import DataModel
+from fastapi import HTTPException
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import ColumnElement, and_, bindparam
+
+OPERATORS = ("eq", "ne", "lt", "lte", "gt", "gte", "in", "prefix", "between")
+LIST_OPERATORS = ("in", "between")
+RANGE_OPERATORS = ("between", "prefix")
+AGGREGATES = ("count", "sum", "avg", "min", "max")
+
+
+@cache
+def get_field_adapters(data_model: type[DataModel]) -> dict[str, TypeAdapter]:
+    """
+    Returns a TypeAdapter for the annotation of every field of the data model, building them on the first call.
+
+    Args:
+        data_model (type[DataModel]): The data model class.
+
+    Returns:
+        dict[str, TypeAdapter]: The TypeAdapters, keyed by field name.
+    """
+    return {
+        field_name: TypeAdapter(field.annotation)
+        for field_name, field in data_model.model_fields.items()
+    }
+
+
+class Filter(NamedTuple):
+    """
+    A filter on a single field of a data model, parsed from a query parameter like `age__gte=30`.
+
+    The value of `in` is a tuple of values and the value of `between` and `prefix` a tuple of a lower and an upper bound.
+    """
+
+    field: str
+    operator: str
+    value: Any
+
+    def expression(
+        self, data_model: type[DataModel], parameter: str | None = None
+    ) -> ColumnElement[bool]:
+        """
+        Compiles the filter to an SQL expression that can use an index on the column.
+
+        Args:
+            data_model (type[DataModel]): The data model class.
+            parameter (str | None, optional): Use bound parameters with this name instead of the value, so that
+                                              the expression can be reused for other values. See `bind_values`.
+
+        Returns:
+            ColumnElement[bool]: The SQL expression.
+        """
+        column = getattr(data_model, self.field)
+        if parameter is None:
+            value = self.value
+        elif self.operator in RANGE_OPERATORS:
+            value = (bindparam(f"{parameter}_lower"), bindparam(f"{parameter}_upper"))
+        else:
+            value = bindparam(parameter, expanding=self.operator == "in")
+        match self.operator:
+            case "eq":
+                return column == value
+            case "ne":
+                return column != value
+            case "lt":
+                return column < value
+            case "lte":
+                return column <= value
+            case "gt":
+                return column > value
+            case "gte":
+                return column >= value
+            case "in":
+                return column.in_(value)
+            case "between":
+                return column.between(*value)
+            case "prefix":
+                return and_(column >= value[0], column < value[1])
+
+    def bind_values(self, parameter: str) -> dict[str, Any]:
+        """
+        Returns the values of the bound parameters of `expression` with the same parameter name.
+        """
+        if self.operator in RANGE_OPERATORS:
+            return {f"{parameter}_lower": self.value[0], f"{parameter}_upper": self.value[1]}
+        if self.operator == "in":
+            return {parameter: list(self.value)}
+        return {parameter: self.value}
+
+    def matches(self, value: Any) -> bool:
+        """
+        Evaluates the filter for a value of the field, erring on the side of a match if the value is not comparable.
+
+        Args:
+            value (Any): The value of the field.
+
+        Returns:
+            bool: Whether the value matches the filter.
+        """
+        try:
+            match self.operator:
+                case "eq":
+                    return value == self.value
+                case "ne":
+                    return value != self.value
+                case "lt":
+                    return value < self.value
+                case "lte":
+                    return value <= self.value
+                case "gt":
+                    return value > self.value
+                case "gte":
+                    return value >= self.value
+                case "in":
+                    return value in self.value
+                case "between":
+                    return self.value[0] <= value <= self.value[1]
+                case "prefix":
+                    return value.startswith(self.value[0])
+        except (TypeError, AttributeError):
+            return True
+
+
+def prefix_upper_bound(prefix: str) -> str | None:
+    """
+    Returns the smallest string that is greater than all strings starting with the prefix.
+
+    Args:
+        prefix (str): The prefix.
+
+    Returns:
+        str | None: The upper bound or None if there is none, e.g. for an empty prefix.
+    """
+    while prefix:
+        if ord(prefix[-1]) < 0x10FFFF:
+            return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        prefix = prefix[:-1]
+    return None
+
+
+def parse_filter(
+    query_param: str, value: str, data_model: type[DataModel]
+) -> Filter:
+    """
+    Parses a query parameter like `age__gte=30` to a filter and coerces the value to the type of the field.
+
+    Args:
+        query_param (str): The name of the query parameter, a field name with an optional `__<operator>` suffix.
+        value (str): The value of the query parameter. `in` takes a comma separated list and `between` two comma
+                     separated bounds. `prefix` is converted to the range of strings starting with the prefix.
+        data_model (type[DataModel]): The data model class to validate the query parameter against.
+
+    Raises:
+        HTTPException: If the field or the operator is not valid or the value can not be coerced.
+
+    Returns:
+        Filter: The filter.
+    """
+    field, _, operator = query_param.partition("__")
+    operator = operator or "eq"
+    if field not in data_model.model_fields or operator not in OPERATORS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid query parameter: {query_param}",
+        )
+    adapter = get_field_adapters(data_model)[field]
+    try:
+        if operator == "prefix":
+            upper_bound = prefix_upper_bound(value)
+            if upper_bound is None:
+                return Filter(field, "gte", value)
+            return Filter(field, operator, (value, upper_bound))
+        if operator in LIST_OPERATORS:
+            values = tuple(adapter.validate_python(item) for item in value.split(","))
+            if operator == "between" and len(values) != 2:
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Invalid value for {query_param}: expected two comma separated bounds",
+                )
+            return Filter(field, operator, values)
+        return Filter(field, operator, adapter.validate_python(value))
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Invalid value for {query_param}: {e.errors()[0]['msg']}",
+        )
+
+
+def extract_filters(
+    query_params: Iterable[tuple[str, str]],
+    data_model: type[DataModel],
+    ignore: Iterable[str] = (),
+) -> list[Filter]:
+    """
+    Extracts the filters from the query parameters of a request.
+
+    Args:
+        query_params (Iterable[tuple[str, str]]): The query parameters, e.g. `request.query_params.multi_items()`.
+        data_model (type[DataModel]): The data model class to validate the query parameters against.
+        ignore (Iterable[str], optional): Query parameters that are handled by the route itself. Defaults to ().
+
+    Raises:
+        HTTPException: If a query parameter is not valid.
+
+    Returns:
+        list[Filter]: The filters.
+    """
+    return [
+        parse_filter(query_param, value, data_model)
+        for query_param, value in query_params
+        if query_param not in ignore
+    ]
+
+
+def parse_order_by(
+    order_by: str | None, data_model: type[DataModel]
+) -> list[tuple[str, bool]]:
+    """
+    Parses a comma separated list of fields to order by, each with an optional `-` prefix for descending order.
+
+    Args:
+        order_by (str | None): The value of the `order_by` query parameter, e.g. `age,-name`.
+        data_model (type[DataModel]): The data model class to validate the fields against.
+
+    Raises:
+        HTTPException: If a field is not a field of the data model.
+
+    Returns:
+        list[tuple[str, bool]]: The field names and whether to order descending.
+    """
+    if not order_by:
+        return []
+    order = []
+    for name in order_by.split(","):
+        name = name.strip()
+        descending = name.startswith("-")
+        name = name.removeprefix("-")
+        if name not in data_model.model_fields:
+            raise HTTPException(status_code=400, detail=f"Invalid field: {name}")
+        order.append((name, descending))
+    return order
+
+
+def parse_aggregates(
+    agg: str | None, data_model: type[DataModel]
+) -> list[tuple[str, str]]:
+    """
+    Parses a comma separated list of aggregates like `sum:age,max:age`.
+
+    Args:
+        agg (str | None): The value of the `agg` query parameter. Each aggregate is a function of `AGGREGATES`
+                          and a field, separated by a colon.
+        data_model (type[DataModel]): The data model class to validate the fields against.
+
+    Raises:
+        HTTPException: If a function is not supported or a field is not a field of the data model.
+
+    Returns:
+        list[tuple[str, str]]: The functions and field names, without duplicates.
+    """
+    if not agg:
+        return []
+    aggregates = []
+    for aggregate in agg.split(","):
+        function, _, name = aggregate.strip().partition(":")
+        if function not in AGGREGATES or name not in data_model.model_fields:
+            raise HTTPException(status_code=400, detail=f"Invalid aggregate: {aggregate.strip()}")
+        aggregates.append((function, name))
+    return list(dict.fromkeys(aggregates))
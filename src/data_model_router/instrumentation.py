@@ -0,0 +1,208 @@
+from bisect import bisect_left
+from contextlib import nullcontext
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, ContextManager
+
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRoute
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+PHASES = ("parse", "connect", "query", "hydrate", "commit", "serialize", "compress", "framework", "total")
+
+_current_timings: ContextVar["Timings | None"] = ContextVar("timings", default=None)
+_disabled = nullcontext()
+
+
+class Timings:
+    """
+    The time spent in each phase of a single request.
+    """
+
+    __slots__ = ("phases",)
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        """
+        Adds the seconds to the phase.
+        """
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        """
+        Returns the phases as the value of a `Server-Timing` header, in milliseconds.
+        """
+        return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.phases.items())
+
+
+class _Phase:
+    __slots__ = ("timings", "name", "started")
+
+    def __init__(self, timings: Timings, name: str) -> None:
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.started = perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.timings.add(self.name, perf_counter() - self.started)
+
+
+def phase(name: str) -> ContextManager:
+    """
+    Times the enclosed block as a phase of the current request, if the route is instrumented.
+
+    Without instrumentation, a shared no-op context manager is returned, so the overhead is a single context variable lookup.
+
+    Args:
+        name (str): The name of the phase, see `PHASES`.
+
+    Returns:
+        ContextManager: The context manager timing the block.
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        return _disabled
+    return _Phase(timings, name)
+
+
+def record_phase(name: str, seconds: float) -> None:
+    """
+    Adds an already measured duration to a phase of the current request, if the route is instrumented.
+    """
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+class Instrumentation:
+    """
+    Records how long the routes of DataModelRouters spend in each phase of a request, per model and route.
+
+    The phases are `parse` (query parameters and body), `connect` (waiting for a pooled connection), `query`
+    (executing statements), `hydrate` (fetching rows and building entries), `commit`, `serialize` (fast
+    serialization and ETags), `compress` (response compression) and `framework`, the rest of the request, mostly FastAPI's parameter validation and
+    response model serialization. `total` is the whole request. The timings of a request are returned in a
+    `Server-Timing` header and aggregated into Prometheus histograms, which `router` serves as text.
+
+    Args:
+        server_timing (bool, optional): Add the `Server-Timing` header to the responses. Defaults to True.
+        path (str, optional): The path of the metrics endpoint of `router`. Defaults to "/metrics".
+    """
+
+    def __init__(self, server_timing: bool = True, path: str = "/metrics") -> None:
+        self.server_timing = server_timing
+        self._histograms: dict[tuple[str, str, str], list] = {}
+        self._gauges: dict[tuple[str, str], Callable[[], dict[str, Any]]] = {}
+        self._route_classes: dict[tuple[str, type[APIRoute]], type[APIRoute]] = {}
+        self._lock = Lock()
+        self.router = APIRouter()
+        self.router.add_api_route(
+            path,
+            self.metrics,
+            methods=["GET"],
+            response_class=PlainTextResponse,
+            include_in_schema=False,
+        )
+
+    def record(self, model: str, route: str, timings: Timings) -> None:
+        """
+        Adds the timings of a request to the histograms of the route.
+        """
+        with self._lock:
+            for name, seconds in timings.phases.items():
+                histogram = self._histograms.get((model, route, name))
+                if histogram is None:
+                    histogram = self._histograms[(model, route, name)] = [[0] * len(BUCKETS), 0.0, 0]
+                index = bisect_left(BUCKETS, seconds)
+                if index < len(BUCKETS):
+                    histogram[0][index] += 1
+                histogram[1] += seconds
+                histogram[2] += 1
+
+    def add_gauges(self, name: str, model: str, snapshot: Callable[[], dict[str, Any]]) -> None:
+        """
+        Exports the metrics returned by `snapshot` as gauges `data_model_router_{name}_{key}` of the model.
+        """
+        self._gauges[(name, model)] = snapshot
+
+    def add_pool(self, model: str, snapshot: Callable[[], dict[str, Any]]) -> None:
+        """
+        Exports the pool metrics returned by `snapshot` as gauges of the model.
+        """
+        self.add_gauges("pool", model, snapshot)
+
+    def route_class(self, model: str, base: type[APIRoute] = APIRoute) -> type[APIRoute]:
+        """
+        Returns the route class that instruments the routes of the model.
+
+        Args:
+            model (str): The name of the model, used as a label.
+            base (type[APIRoute], optional): The route class to instrument. Defaults to APIRoute.
+
+        Returns:
+            type[APIRoute]: The route class.
+        """
+        if (model, base) not in self._route_classes:
+            instrumentation = self
+
+            class InstrumentedRoute(base):
+                def get_route_handler(self) -> Callable:
+                    handler = super().get_route_handler()
+                    route = self.endpoint.__name__
+
+                    async def instrumented_handler(request: Request) -> Response:
+                        timings = Timings()
+                        token = _current_timings.set(timings)
+                        started = perf_counter()
+                        try:
+                            response = await handler(request)
+                        finally:
+                            _current_timings.reset(token)
+                        total = perf_counter() - started
+                        timings.add("framework", max(0.0, total - sum(timings.phases.values())))
+                        timings.add("total", total)
+                        instrumentation.record(model, route, timings)
+                        if instrumentation.server_timing:
+                            response.headers["Server-Timing"] = timings.server_timing()
+                        return response
+
+                    return instrumented_handler
+
+            self._route_classes[(model, base)] = InstrumentedRoute
+        return self._route_classes[(model, base)]
+
+    def render(self) -> str:
+        """
+        Returns the metrics in the Prometheus text format.
+        """
+        lines = [
+            "# HELP data_model_router_phase_seconds Time spent in each phase of a request.",
+            "# TYPE data_model_router_phase_seconds histogram",
+        ]
+        with self._lock:
+            for (model, route, name), (buckets, total, count) in sorted(self._histograms.items()):
+                labels = f'model="{model}",route="{route}",phase="{name}"'
+                cumulative = 0
+                for bound, bucket in zip(BUCKETS, buckets):
+                    cumulative += bucket
+                    lines.append(f'data_model_router_phase_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'data_model_router_phase_seconds_bucket{{{labels},le="+Inf"}} {count}')
+                lines.append(f"data_model_router_phase_seconds_sum{{{labels}}} {total}")
+                lines.append(f"data_model_router_phase_seconds_count{{{labels}}} {count}")
+        for (name, model), snapshot in sorted(self._gauges.items()):
+            for key, value in snapshot().items():
+                if value is not None:
+                    lines.append(f'data_model_router_{name}_{key}{{model="{model}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def metrics(self) -> PlainTextResponse:
+        """
+        Return the metrics in the Prometheus text format.
+        """
+        return PlainTextResponse(self.render(), media_type="text/plain; version=0.0.4")
@@ -1,16 +1,126 @@
+from typing import Any, Callable, Iterable, Literal, Sequence
+
 from fastapi import APIRouter
+from fastapi.routing import APIRoute
 from data_model_orm import DataModel
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
 
+from .admission import AdmissionControl
+from .cache import Cache, DataModelCache
+from .changes import ChangeBroker
+from .compression import compressed_route_class
+from .instrumentation import Instrumentation
+from .pool import PoolMetrics, configure_pool, get_pool_metrics
+from .replicas import ReplicaSet
 from .router import *
+from .router.search import SEARCH_PARAMETERS
+from .routing import LazyRoute
+from .singleflight import SingleFlight
 
 
 class DataModelRouter(APIRouter):
     """
     A router for a DataModel that provides CRUD operations for the DataModel.
+
+    Args:
+        data_model (type[DataModel]): The DataModel to provide the routes for.
+        prefix (str | None, optional): The prefix of the routes. Defaults to the lowercase name of the DataModel.
+        chunk_size (int, optional): The number of entries loaded per query when streaming search results, getting
+                                    entries in batches or exporting entries. Defaults to 1000.
+        batch_size (int, optional): The number of entries written per transaction by the bulk route and the maximum
+                                    number of operations of a transactional batch. Defaults to 1000.
+        async_engine (AsyncEngine | None, optional): If given, all routes are served by `async def` handlers
+                                                     that use this engine instead of `data_model.__engine__`.
+                                                     Defaults to None.
+        cache (Cache | None, optional): If given, entries and search results are cached in this backend
+                                        and invalidated by the write routes. Defaults to None.
+        etag (bool, optional): Emit ETags, answer conditional reads with 304 and honor If-Match on writes. Defaults to False.
+        version_field (str | None, optional): A row version field to compute the ETags from instead of hashing the
+                                              response body. Only used if `etag` is True. Defaults to None.
+        fast_serialization (bool, optional): Write the responses with a serializer that is built once per DataModel,
+                                             instead of validating the returned entries against the response model
+                                             again. Defaults to False.
+        pool_size (int | None, optional): The number of connections kept open by the pool of the engine serving the routes.
+        max_overflow (int | None, optional): The number of connections opened beyond `pool_size` under load.
+        pool_timeout (float | None, optional): The seconds a request waits for a connection before it is answered with 503.
+        pool_pre_ping (bool | None, optional): Test connections for liveness when they are checked out.
+        pool_recycle (int | None, optional): The seconds after which a connection is replaced.
+                                             If any pool option is given, the engine serving the routes (`async_engine`
+                                             or `data_model.__engine__`) is replaced by an engine for the same URL with
+                                             these options. Defaults to None, which keeps the engine as it is.
+        instrumentation (Instrumentation | None, optional): If given, the time spent in each phase of a request is
+                                                            recorded per route, exported by the instrumentation and
+                                                            returned in a `Server-Timing` header. Defaults to None.
+        negotiate_encoding (bool, optional): Return the entries of the read routes as MessagePack if the Accept header
+                                             prefers `application/msgpack` and as JSON encoded by orjson otherwise,
+                                             with encoders picked once per model from the field types. MessagePack
+                                             requires msgpack. Defaults to False.
+        compression_minimum_size (int | None, optional): Compress response bodies of at least this many bytes with
+                                                         brotli or gzip, as negotiated with the Accept-Encoding header.
+                                                         Brotli requires brotli. Defaults to None, which disables
+                                                         compression.
+        single_flight (bool, optional): Coalesce concurrent identical GET requests, so that they share a single query
+                                        and response instead of each querying the database. `single_flight.snapshot()`
+                                        returns how many requests were coalesced. Defaults to False.
+        changes (ChangeBroker | None, optional): If given, the write routes publish their changes to this broker and
+                                                 `GET /changes` and `/changes/ws` stream them to clients as
+                                                 Server-Sent Events or WebSocket messages. Defaults to None.
+        watermark_field (str | None, optional): An integer field that the write routes set to the watermark of every
+                                                write, and that should be indexed. If given, deletions are recorded
+                                                in a tombstone table and `GET /delta?since=` returns the changes since
+                                                a watermark. Defaults to None.
+        watermark_lag (float, optional): The seconds a change must be old to be returned by `GET /delta`, which must
+                                         exceed the time a write takes to commit. Defaults to 1.0.
+        read_engines (Sequence[Engine | AsyncEngine] | None, optional): Engines of read replicas. If given, GET and HEAD
+                                                                requests run on a replica, while writes run on
+                                                                `async_engine` or `data_model.__engine__`. The
+                                                                replicas must be AsyncEngines if `async_engine` is
+                                                                given and Engines otherwise. Defaults to None.
+        replica_strategy (str, optional): "round_robin" to use the replicas in turn or "least_connections" to use the
+                                          replica with the fewest reads in flight. Defaults to "round_robin".
+        read_your_writes_seconds (int, optional): The seconds the reads of a client are sent to the primary after it
+                                                  wrote, tracked with a cookie, so that it reads its own writes while
+                                                  the replicas catch up. 0 disables pinning. Defaults to 5.
+        admission (AdmissionControl | None, optional): If given, requests are answered with 429 when their client
+                                                       exceeds the rate limit and with 503 when a route exceeds its
+                                                       concurrency limit or too many searches without a limit run
+                                                       on a large table. Defaults to None.
+        lazy (bool, optional): Only build the FastAPI routes, i.e. their dependency graphs and response models, when
+                               they handle their first request or the OpenAPI schema is generated, instead of when the
+                               router is created. Speeds up the startup of apps with many models. Defaults to False.
     """
 
     def __init__(
-        self, data_model: type[DataModel], prefix: str | None = None, *args, **kwargs
+        self,
+        data_model: type[DataModel],
+        prefix: str | None = None,
+        *args,
+        chunk_size: int = 1000,
+        batch_size: int = 1000,
+        async_engine: AsyncEngine | None = None,
+        cache: Cache | None = None,
+        etag: bool = False,
+        version_field: str | None = None,
+        fast_serialization: bool = False,
+        pool_size: int | None = None,
+        max_overflow: int | None = None,
+        pool_timeout: float | None = None,
+        pool_pre_ping: bool | None = None,
+        pool_recycle: int | None = None,
+        instrumentation: Instrumentation | None = None,
+        negotiate_encoding: bool = False,
+        compression_minimum_size: int | None = None,
+        single_flight: bool = False,
+        changes: ChangeBroker | None = None,
+        watermark_field: str | None = None,
+        watermark_lag: float = 1.0,
+        read_engines: Sequence[Engine | AsyncEngine] | None = None,
+        replica_strategy: Literal["round_robin", "least_connections"] = "round_robin",
+        read_your_writes_seconds: int = 5,
+        admission: AdmissionControl | None = None,
+        lazy: bool = False,
+        **kwargs,
     ) -> None:
         super().__init__(
             prefix=prefix if prefix is not None else f"/{data_model.__name__.lower()}",
@@ -18,8 +128,198 @@ class DataModelRouter(APIRouter):
             **kwargs,
         )
 
-        self.include_router(CreateRouter(data_model))
-        self.include_router(DeleteRouter(data_model))
-        self.include_router(GetByIdRouter(data_model))
-        self.include_router(SaveRouter(data_model))
-        self.include_router(SearchRouter(data_model))
+        if watermark_field is not None and watermark_field not in data_model.model_fields:
+            raise ValueError(f"Invalid watermark field: {watermark_field}")
+        pool_options = dict(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_pre_ping=pool_pre_ping,
+            pool_recycle=pool_recycle,
+        )
+        if async_engine is not None:
+            async_engine = configure_pool(async_engine, **pool_options)
+        elif any(value is not None for value in pool_options.values()):
+            data_model.__engine__ = configure_pool(data_model.__engine__, **pool_options)
+        if read_engines:
+            if any(isinstance(engine, AsyncEngine) != (async_engine is not None) for engine in read_engines):
+                raise ValueError("read_engines must be AsyncEngines if and only if an async_engine is given")
+            read_engines = [configure_pool(engine, **pool_options) for engine in read_engines]
+        self.data_model = data_model
+        self.async_engine = async_engine
+        self.instrumentation = instrumentation
+        self.compression_minimum_size = compression_minimum_size
+        self.single_flight = SingleFlight() if single_flight else None
+        self.replicas = (
+            ReplicaSet(read_engines, replica_strategy, read_your_writes_seconds) if read_engines else None
+        )
+        self.admission = admission
+        self.lazy = lazy
+        if instrumentation is not None:
+            instrumentation.add_pool(
+                data_model.__name__, lambda: self.pool_metrics.snapshot()
+            )
+            if self.single_flight is not None:
+                instrumentation.add_gauges(
+                    "single_flight", data_model.__name__, self.single_flight.snapshot
+                )
+            if self.replicas is not None:
+                instrumentation.add_gauges("replicas", data_model.__name__, self.replicas.snapshot)
+            if admission is not None:
+                instrumentation.add_gauges(
+                    "admission", data_model.__name__, lambda: admission.snapshot(data_model.__name__)
+                )
+
+        if cache is not None:
+            cache = DataModelCache(cache, data_model, ignore=SEARCH_PARAMETERS)
+        options = dict(
+            async_engine=async_engine,
+            cache=cache,
+            etag=etag,
+            version_field=version_field,
+            route_class=LazyRoute,
+        )
+
+        self.include_router(
+            AggregateRouter(data_model, async_engine=async_engine, route_class=LazyRoute)
+        )
+        self.include_router(
+            BatchGetRouter(
+                data_model,
+                chunk_size=chunk_size,
+                async_engine=async_engine,
+                cache=cache,
+                fast_serialization=fast_serialization,
+                negotiate_encoding=negotiate_encoding,
+                route_class=LazyRoute,
+            )
+        )
+        self.include_router(
+            BatchWriteRouter(
+                data_model,
+                batch_size=batch_size,
+                async_engine=async_engine,
+                cache=cache,
+                changes=changes,
+                watermark_field=watermark_field,
+                route_class=LazyRoute,
+            )
+        )
+        self.include_router(
+            BulkRouter(
+                data_model,
+                batch_size=batch_size,
+                async_engine=async_engine,
+                cache=cache,
+                changes=changes,
+                watermark_field=watermark_field,
+                route_class=LazyRoute,
+            )
+        )
+        if changes is not None:
+            self.include_router(ChangeFeedRouter(data_model, changes, route_class=LazyRoute))
+        if watermark_field is not None:
+            self.include_router(
+                DeltaRouter(
+                    data_model,
+                    watermark_field,
+                    watermark_lag=watermark_lag,
+                    chunk_size=chunk_size,
+                    async_engine=async_engine,
+                    route_class=LazyRoute,
+                )
+            )
+        self.include_router(
+            CreateRouter(
+                data_model,
+                fast_serialization=fast_serialization,
+                changes=changes,
+                watermark_field=watermark_field,
+                **options,
+            )
+        )
+        self.include_router(
+            DeleteRouter(data_model, changes=changes, watermark_field=watermark_field, **options)
+        )
+        self.include_router(
+            ExportRouter(
+                data_model,
+                chunk_size=chunk_size,
+                async_engine=async_engine,
+                route_class=LazyRoute,
+            )
+        )
+        self.include_router(
+            GetByIdRouter(
+                data_model,
+                fast_serialization=fast_serialization,
+                negotiate_encoding=negotiate_encoding,
+                **options,
+            )
+        )
+        self.include_router(
+            SaveRouter(
+                data_model,
+                fast_serialization=fast_serialization,
+                changes=changes,
+                watermark_field=watermark_field,
+                **options,
+            )
+        )
+        self.include_router(
+            SearchRouter(
+                data_model,
+                chunk_size=chunk_size,
+                fast_serialization=fast_serialization,
+                negotiate_encoding=negotiate_encoding,
+                **options,
+            )
+        )
+
+    @classmethod
+    def for_models(cls, data_models: Iterable[type[DataModel]], lazy: bool = True, **kwargs) -> APIRouter:
+        """
+        Returns a single router with the routes of all data models, built lazily by default.
+
+        Args:
+            data_models (Iterable[type[DataModel]]): The DataModels to provide the routes for.
+            lazy (bool, optional): Build the FastAPI routes on first use. Defaults to True.
+            **kwargs: The options of every DataModelRouter, e.g. `cache` or `instrumentation`.
+
+        Returns:
+            APIRouter: The router with the routes of all data models.
+        """
+        router = APIRouter()
+        for data_model in data_models:
+            router.include_router(cls(data_model, lazy=lazy, **kwargs))
+        return router
+
+    def add_api_route(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        """
+        Adds a route with the route class of the router, instead of the lazy route class of the sub-routers.
+
+        The sub-routers only describe their routes, so every route is built once by this router, or on first use
+        if the router is lazy, plus once by each router that includes this one.
+        """
+        route_class = LazyRoute if self.lazy else APIRoute
+        if self.compression_minimum_size is not None:
+            route_class = compressed_route_class(self.compression_minimum_size, route_class)
+        if self.replicas is not None:
+            route_class = self.replicas.route_class(route_class)
+        if self.single_flight is not None:
+            route_class = self.single_flight.route_class(route_class)
+        if self.admission is not None:
+            route_class = self.admission.route_class(self.data_model, self.async_engine, route_class)
+        if self.instrumentation is not None:
+            route_class = self.instrumentation.route_class(self.data_model.__name__, route_class)
+        kwargs["route_class_override"] = route_class
+        super().add_api_route(path, endpoint, **kwargs)
+
+    @property
+    def pool_metrics(self) -> PoolMetrics:
+        """
+        The checkout metrics of the connection pool of the engine serving the routes.
+        """
+        return get_pool_metrics(
+            self.async_engine if self.async_engine is not None else self.data_model.__engine__
+        )
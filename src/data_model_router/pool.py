@@ -0,0 +1,106 @@
+from threading import Lock
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+POOL_OPTIONS = ("pool_size", "max_overflow", "pool_timeout", "pool_pre_ping", "pool_recycle")
+
+
+class PoolMetrics:
+    """
+    Collects the connection checkouts of the sessions DataModelRouter opens on an engine.
+
+    Every session checks out its connection up front, so the time a request waits for a connection of an
+    exhausted pool is measured separately from the time it spends in the database.
+
+    Use `get_pool_metrics` to get the metrics of an engine.
+
+    Args:
+        engine (Engine): The engine whose pool is observed.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._lock = Lock()
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        """
+        Records a checkout that waited the given time for a connection.
+        """
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+    def record_timeout(self) -> None:
+        """
+        Records a checkout that timed out because the pool was exhausted.
+        """
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns the current state of the pool and the collected metrics.
+
+        The size, checked out and overflow counts are None for pools that do not limit their connections.
+        """
+        pool = self.engine.pool
+        with self._lock:
+            return {
+                "size": pool.size() if hasattr(pool, "size") else None,
+                "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+                "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
+
+_pool_metrics: WeakKeyDictionary[Engine, PoolMetrics] = WeakKeyDictionary()
+_pool_metrics_lock = Lock()
+
+
+def get_pool_metrics(engine: Engine | AsyncEngine) -> PoolMetrics:
+    """
+    Returns the pool metrics of the engine, creating them on the first call.
+
+    Args:
+        engine (Engine | AsyncEngine): The engine.
+
+    Returns:
+        PoolMetrics: The metrics shared by all routers using the engine.
+    """
+    if isinstance(engine, AsyncEngine):
+        engine = engine.sync_engine
+    with _pool_metrics_lock:
+        metrics = _pool_metrics.get(engine)
+        if metrics is None:
+            metrics = _pool_metrics[engine] = PoolMetrics(engine)
+        return metrics
+
+
+def configure_pool(engine: Engine | AsyncEngine, **options: Any) -> Engine | AsyncEngine:
+    """
+    Returns an engine for the same database with the given pool options, or the engine itself if no option is given.
+
+    Args:
+        engine (Engine | AsyncEngine): The engine to configure.
+        **options (Any): The pool options of `create_engine`, see `POOL_OPTIONS`. Options that are None are ignored.
+
+    Returns:
+        Engine | AsyncEngine: The configured engine.
+    """
+    options = {key: value for key, value in options.items() if value is not None}
+    if not options:
+        return engine
+    if isinstance(engine, AsyncEngine):
+        return create_async_engine(engine.url, **options)
+    return create_engine(engine.url, **options)
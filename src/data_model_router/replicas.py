@@ -0,0 +1,159 @@
+from contextvars import ContextVar
+from itertools import count
+from threading import Lock
+from typing import AsyncIterator, Callable, Literal, Sequence
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+READ_METHODS = ("GET", "HEAD")
+STRATEGIES = ("round_robin", "least_connections")
+PIN_COOKIE = "data_model_router_primary"
+
+_read_engine: ContextVar[Engine | AsyncEngine | None] = ContextVar("read_engine", default=None)
+
+
+def read_engine(engine: Engine | AsyncEngine) -> Engine | AsyncEngine:
+    """
+    Returns the read replica chosen for the current request, or the given engine if the request is not routed
+    to a replica, e.g. because it writes or its client has just written.
+
+    Args:
+        engine (Engine | AsyncEngine): The engine of the primary.
+
+    Returns:
+        Engine | AsyncEngine: The engine to run the queries of the request on.
+    """
+    replica = _read_engine.get()
+    return engine if replica is None else replica
+
+
+class ReplicaSet:
+    """
+    Routes the read requests of a router to read replicas.
+
+    GET and HEAD requests are sent to one of the read engines, all other requests to the primary. The engine is
+    picked per request, so all queries of a read share one replica. After a successful write, the response
+    sets a cookie that pins the reads of the client to the primary for `pin_seconds`, so that it reads its own
+    writes even if the replicas lag behind.
+
+    Args:
+        read_engines (Sequence[Engine | AsyncEngine]): The engines of the replicas.
+        strategy (str, optional): "round_robin" to use the replicas in turn or "least_connections" to use the
+                                  replica with the fewest reads in flight. Defaults to "round_robin".
+        pin_seconds (int, optional): The seconds reads are pinned to the primary after a write. 0 disables
+                                     pinning. Defaults to 5.
+    """
+
+    def __init__(
+        self,
+        read_engines: Sequence[Engine | AsyncEngine],
+        strategy: Literal["round_robin", "least_connections"] = "round_robin",
+        pin_seconds: int = 5,
+    ) -> None:
+        if not read_engines:
+            raise ValueError("At least one read engine is required")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Invalid replica strategy: {strategy}")
+        self.read_engines = list(read_engines)
+        self.strategy = strategy
+        self.pin_seconds = pin_seconds
+        self.reads = [0] * len(self.read_engines)
+        self.in_flight = [0] * len(self.read_engines)
+        self.pinned_reads = 0
+        self._turns = count()
+        self._lock = Lock()
+        self._route_classes: dict[type[APIRoute], type[APIRoute]] = {}
+
+    def acquire(self) -> int:
+        """
+        Picks a replica for a read and returns its index. The read must be ended with `release`.
+        """
+        with self._lock:
+            size = len(self.read_engines)
+            turn = next(self._turns) % size
+            if self.strategy == "least_connections":
+                turn = min(((turn + i) % size for i in range(size)), key=self.in_flight.__getitem__)
+            self.reads[turn] += 1
+            self.in_flight[turn] += 1
+            return turn
+
+    def release(self, index: int) -> None:
+        """
+        Ends a read of the replica with the given index.
+        """
+        with self._lock:
+            self.in_flight[index] -= 1
+
+    def snapshot(self) -> dict[str, int]:
+        """
+        Returns the number of reads sent to the replicas and to the primary, and the reads in flight.
+        """
+        with self._lock:
+            return {
+                "replica_reads": sum(self.reads),
+                "pinned_reads": self.pinned_reads,
+                "in_flight": sum(self.in_flight),
+            }
+
+    def route_class(self, base: type[APIRoute] = APIRoute) -> type[APIRoute]:
+        """
+        Returns a route class that runs the reads of its routes on the replicas and pins clients after writes.
+
+        Args:
+            base (type[APIRoute], optional): The route class to extend. Defaults to APIRoute.
+
+        Returns:
+            type[APIRoute]: The route class.
+        """
+        if base not in self._route_classes:
+            replicas = self
+
+            async def iterate(index: int, iterator: AsyncIterator) -> AsyncIterator:
+                """
+                Iterates the body of a streamed response on the replica, which is released afterwards.
+                """
+                _read_engine.set(replicas.read_engines[index])
+                try:
+                    async for chunk in iterator:
+                        yield chunk
+                finally:
+                    replicas.release(index)
+
+            class ReplicaRoute(base):
+                def get_route_handler(self) -> Callable:
+                    handler = super().get_route_handler()
+
+                    async def replica_handler(request: Request) -> Response:
+                        if request.method not in READ_METHODS:
+                            response = await handler(request)
+                            if replicas.pin_seconds and response.status_code < 400:
+                                response.set_cookie(
+                                    PIN_COOKIE, "1", max_age=replicas.pin_seconds, httponly=True, samesite="lax"
+                                )
+                            return response
+                        if PIN_COOKIE in request.cookies:
+                            with replicas._lock:
+                                replicas.pinned_reads += 1
+                            return await handler(request)
+                        index = replicas.acquire()
+                        token = _read_engine.set(replicas.read_engines[index])
+                        streaming = False
+                        try:
+                            response = await handler(request)
+                            if isinstance(response, StreamingResponse):
+                                response.body_iterator = iterate(index, response.body_iterator)
+                                streaming = True
+                            return response
+                        finally:
+                            _read_engine.reset(token)
+                            if not streaming:
+                                replicas.release(index)
+
+                    return replica_handler
+
+            self._route_classes[base] = ReplicaRoute
+        return self._route_classes[base]
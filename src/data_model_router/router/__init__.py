@@ -1,12 +1,26 @@
+from .aggregate import AggregateRouter
+from .batch_get import BatchGetRouter
+from .batch_write import BatchWriteRouter
+from .bulk import BulkRouter
+from .changes import ChangeFeedRouter
 from .create import CreateRouter
 from .delete import DeleteRouter
+from .delta import DeltaRouter
+from .export import ExportRouter
 from .get_by_id import GetByIdRouter
 from .save import SaveRouter
 from .search import SearchRouter
 
 __all__ = [
+    "AggregateRouter",
+    "BatchGetRouter",
+    "BatchWriteRouter",
+    "BulkRouter",
+    "ChangeFeedRouter",
     "CreateRouter",
     "DeleteRouter",
+    "DeltaRouter",
+    "ExportRouter",
     "GetByIdRouter",
     "SaveRouter",
     "SearchRouter",
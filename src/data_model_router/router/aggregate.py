@@ -0,0 +1,175 @@
+from functools import lru_cache
+
+from data_model_orm import DataModel
+from fastapi import APIRouter, Query, Request
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session
+from typing import Any, Dict, List
+
+from ..filters import AGGREGATES, Filter, extract_filters, parse_aggregates
+from ..instrumentation import phase
+from ..session import bind_session
+from ..utils import extract_fields, generate_function
+
+AGGREGATE_PARAMETERS = ("group_by", "agg")
+
+
+class AggregateRouter(APIRouter):
+    """
+    A router for a DataModel that provides count and aggregate operations for the DataModel.
+
+    This router provides two GET endpoints that filter the entries like the search endpoint and compute
+    `COUNT`, `SUM`, `AVG`, `MIN` and `MAX`, optionally per group, in the database, so that only the
+    results are returned instead of the entries.
+    """
+
+    def __init__(
+        self,
+        data_model: type[DataModel],
+        async_engine: AsyncEngine | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        primary_key = data_model.get_primary_key()
+
+        @lru_cache(maxsize=256)
+        def build_statement(
+            where: tuple[tuple[str, str], ...],
+            group_by: tuple[str, ...],
+            aggregates: tuple[tuple[str, str], ...],
+        ) -> Select:
+            """
+            Build the statement of an aggregation once per shape, i.e. per combination of filtered fields,
+            operators, groups and aggregates. The filter values are bound parameters named `filter_{index}`.
+            """
+            columns = [getattr(data_model, name) for name in group_by]
+            statement = select(
+                *columns,
+                func.count().label("count"),
+                *(
+                    getattr(func, function)(getattr(data_model, name)).label(f"{function}_{name}")
+                    for function, name in aggregates
+                ),
+            ).select_from(data_model)
+            for index, (field, operator) in enumerate(where):
+                statement = statement.where(
+                    Filter(field, operator, None).expression(data_model, f"filter_{index}")
+                )
+            if group_by:
+                statement = statement.group_by(*columns).order_by(*columns)
+            return statement
+
+        def select_aggregates(
+            session: Session,
+            where: List[Filter],
+            group_by: tuple[str, ...] = (),
+            aggregates: List[tuple[str, str]] | None = None,
+        ) -> List[Dict[str, Any]]:
+            """
+            Select the number of matching entries and the aggregates, per group if `group_by` is given.
+
+            Args:
+                session (Session): The session to query the entries with.
+                where (List[Filter]): The filters.
+                group_by (tuple[str, ...], optional): The fields to group by. Defaults to a single group.
+                aggregates (List[tuple[str, str]] | None, optional): The functions and fields to aggregate.
+
+            Returns:
+                List[Dict[str, Any]]: A row per group with the fields of the group, `count` and a
+                                      `{function}_{field}` key per aggregate.
+            """
+            statement = build_statement(
+                tuple((search_filter.field, search_filter.operator) for search_filter in where),
+                group_by,
+                tuple(aggregates or ()),
+            )
+            params = {}
+            for index, search_filter in enumerate(where):
+                params.update(search_filter.bind_values(f"filter_{index}"))
+            with phase("query"):
+                result = session.execute(statement, params)
+            with phase("hydrate"):
+                return [dict(row) for row in result.mappings()]
+
+        def count(session: Session, request: Request, **kwargs) -> Dict[str, int]:
+            """
+            Count the entries of the DataModel that match the query parameters.
+
+            Args:
+                session (Session): The session to query the entries with.
+                request (Request): The request object.
+
+            Returns:
+                Dict[str, int]: The number of matching entries as `count`.
+            """
+            with phase("parse"):
+                where = extract_filters(request.query_params.multi_items(), data_model)
+            return select_aggregates(session, where)[0]
+
+        def aggregate(session: Session, request: Request, **kwargs) -> List[Dict[str, Any]]:
+            """
+            Aggregate the entries of the DataModel that match the query parameters, per group.
+
+            Args:
+                session (Session): The session to query the entries with.
+                request (Request): The request object.
+                **kwargs: The fields to group by and the aggregates.
+
+            Returns:
+                List[Dict[str, Any]]: A row per group, ordered by the fields of the groups.
+            """
+            with phase("parse"):
+                where = extract_filters(
+                    request.query_params.multi_items(), data_model, ignore=AGGREGATE_PARAMETERS
+                )
+                group_by = extract_fields(kwargs["group_by"], data_model) or ()
+                aggregates = parse_aggregates(kwargs["agg"], data_model)
+            return select_aggregates(session, where, group_by, aggregates)
+
+        filter_parameters = {
+            field_name: {
+                "type_": field.annotation,
+                "default": None,
+            }
+            for field_name, field in data_model.model_fields.items()
+        }
+
+        self.add_api_route(
+            "/count",
+            generate_function(
+                function_name="count",
+                parameters=filter_parameters,
+                action=bind_session(count, data_model, async_engine),
+            ),
+            methods=["GET"],
+            tags=[data_model.__name__],
+            response_model=Dict[str, int],
+            name=f"Count {data_model.__name__}",
+            description=f"Return the number of {data_model.__name__} entries that match the query parameters, which filter like the search endpoint.",
+            operation_id=f"count_{data_model.__name__.lower()}",
+        )
+        self.add_api_route(
+            "/aggregate",
+            generate_function(
+                function_name="aggregate",
+                parameters={
+                    **filter_parameters,
+                    "group_by": {
+                        "type_": str | None,
+                        "default": Query(None, description=f"A comma separated list of the fields to group by, e.g. `{primary_key}`. Defaults to a single group of all matching entries."),
+                    },
+                    "agg": {
+                        "type_": str | None,
+                        "default": Query(None, description=f"A comma separated list of aggregates like `sum:{primary_key}`. The functions are {', '.join(f'`{function}`' for function in AGGREGATES)}."),
+                    },
+                },
+                action=bind_session(aggregate, data_model, async_engine),
+            ),
+            methods=["GET"],
+            tags=[data_model.__name__],
+            response_model=List[Dict[str, Any]],
+            name=f"Aggregate {data_model.__name__}",
+            description=f"Return the number of matching {data_model.__name__} entries as `count` and each aggregate as `<function>_<field>`, per group of the `group_by` fields. The query parameters filter like the search endpoint.",
+            operation_id=f"aggregate_{data_model.__name__.lower()}",
+        )
@@ -0,0 +1,146 @@
+from data_model_orm import DataModel
+from fastapi import APIRouter, HTTPException, Query, Request
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session
+from typing import Any, List, Optional, Union
+
+from ..cache import DataModelCache
+from ..filters import get_field_adapters
+from ..instrumentation import phase
+from ..serialization import get_serializer, json_response, negotiate_serializer
+from ..session import bind_session
+from ..statements import PRIMARY_KEYS_PARAMETER, select_by_primary_keys
+from ..utils import extract_fields, generate_function, get_partial_model
+
+
+class BatchGetRouter(APIRouter):
+    """
+    A router for a DataModel that provides batch get operations for the DataModel.
+
+    This router provides a single GET endpoint that returns the entries of a list of primary keys with one
+    `IN` query per chunk of `chunk_size` keys, instead of one request and query per entry.
+    With `negotiate_encoding`, the entries are returned as MessagePack or as JSON encoded by orjson, depending on the Accept header.
+    """
+
+    def __init__(
+        self,
+        data_model: type[DataModel],
+        chunk_size: int = 1000,
+        async_engine: AsyncEngine | None = None,
+        cache: DataModelCache | None = None,
+        fast_serialization: bool = False,
+        negotiate_encoding: bool = False,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        primary_key = data_model.get_primary_key()
+
+        def parse_ids(ids: str) -> List[Any]:
+            """
+            Split the comma separated primary keys and coerce them to the type of the primary key.
+            """
+            primary_key_adapter = get_field_adapters(data_model)[primary_key]
+            try:
+                return [
+                    primary_key_adapter.validate_python(value.strip())
+                    for value in ids.split(",")
+                    if value.strip()
+                ]
+            except ValidationError as e:
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Invalid value for ids: {e.errors()[0]['msg']}",
+                )
+
+        def get_batch(session: Session, request: Request, **kwargs) -> List[DataModel | None]:
+            """
+            Get the entries of the DataModel with the provided primary keys.
+
+            The entries are returned in the order of the primary keys, with null for primary keys without an entry.
+            Cached entries are not queried again. Entries narrowed to a subset of the fields are not cached.
+
+            Args:
+                session (Session): The session to query the entries with.
+                request (Request): The request object.
+                **kwargs: The comma separated primary keys and the fields to return.
+
+            Returns:
+                List[DataModel | None]: The entries in the order of the primary keys.
+            """
+            with phase("parse"):
+                ids = parse_ids(kwargs["ids"])
+                fields = extract_fields(kwargs["fields"], data_model)
+            use_cache = cache is not None and fields is None
+            found = {}
+            if use_cache:
+                generation = cache.generation
+                for value in dict.fromkeys(ids):
+                    entry = cache.get(cache.entry_key(value))
+                    if entry is not None:
+                        found[value] = entry
+            missing = [value for value in dict.fromkeys(ids) if value not in found]
+            if fields is None:
+                statement = select_by_primary_keys(data_model)
+            else:
+                statement = select_by_primary_keys(
+                    data_model, tuple(dict.fromkeys([*fields, primary_key]))
+                )
+            for start in range(0, len(missing), chunk_size):
+                params = {PRIMARY_KEYS_PARAMETER: missing[start : start + chunk_size]}
+                with phase("query"):
+                    if fields is None:
+                        result = session.exec(statement, params=params)
+                    else:
+                        result = session.execute(statement, params)
+                with phase("hydrate"):
+                    entries = result.all()
+                for entry in entries:
+                    found[getattr(entry, primary_key)] = entry
+                    if use_cache:
+                        cache.set(cache.entry_key(getattr(entry, primary_key)), entry, generation)
+            entries = [found.get(value) for value in ids]
+            if negotiate_encoding:
+                entry_serializer = negotiate_serializer(request.headers.get("accept"), data_model, fields)
+                with phase("serialize"):
+                    return json_response(
+                        entry_serializer.dump_json_list(entries),
+                        headers={"Vary": "Accept"},
+                        media_type=entry_serializer.media_type,
+                    )
+            if fast_serialization or fields is not None:
+                entry_serializer = get_serializer(data_model, fields)
+                with phase("serialize"):
+                    return json_response(
+                        b"["
+                        + b",".join(
+                            b"null" if entry is None else entry_serializer.dump_json(entry)
+                            for entry in entries
+                        )
+                        + b"]"
+                    )
+            return entries
+
+        self.add_api_route(
+            "/batch",
+            generate_function(
+                function_name="get_batch",
+                parameters={
+                    "ids": {
+                        "type_": str,
+                        "default": Query(description=f"A comma separated list of the {primary_key}s of the entries to return."),
+                    },
+                    "fields": {
+                        "type_": str | None,
+                        "default": Query(None, description=f"A comma separated list of the fields to return, e.g. `{primary_key}`. Defaults to all fields."),
+                    },
+                },
+                action=bind_session(get_batch, data_model, async_engine),
+            ),
+            methods=["GET"],
+            tags=[data_model.__name__],
+            response_model=List[Optional[Union[data_model, get_partial_model(data_model)]]],
+            name=f"Get {data_model.__name__} batch",
+            description=f"Return the {data_model.__name__} entries with the provided {primary_key}s in the order of the {primary_key}s, with null for each {primary_key} without an entry.",
+            operation_id=f"get_{data_model.__name__.lower()}_batch",
+        )
@@ -0,0 +1,239 @@
+from typing import Any, Dict, List, Literal
+
+from data_model_orm import DataModel
+from fastapi import APIRouter, HTTPException, Response
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session
+
+from ..cache import DataModelCache
+from ..changes import ChangeBroker
+from ..delta import get_tombstone_table, next_watermark, write_tombstones
+from ..instrumentation import phase
+from ..session import bind_session
+from ..utils import generate_function
+
+FAILURE_STATUS_CODES = {"invalid": 422, "not_found": 404, "conflict": 409}
+
+
+class BatchOperation(BaseModel):
+    """
+    A single operation of a batch request. Deletes only need the primary key in `data`.
+    """
+
+    op: Literal["create", "save", "delete"]
+    data: Dict[str, Any] = {}
+
+
+class BatchOperationResult(BaseModel):
+    """
+    The result of a single operation of a batch request.
+    """
+
+    index: int
+    op: Literal["create", "save", "delete"]
+    status: Literal["created", "updated", "deleted", "invalid", "conflict", "not_found", "rolled_back"]
+    primary_key: Any = None
+    detail: Any = None
+
+
+class BatchWriteRouter(APIRouter):
+    """
+    A router for a DataModel that provides transactional batches of create, save and delete operations.
+
+    This router provides a single POST endpoint that executes a list of operations in a single transaction.
+    The operations are grouped into one insert, one update and one delete statement, so a batch costs a
+    single round-trip and a single commit instead of one of each per operation.
+    """
+
+    def __init__(
+        self,
+        data_model: type[DataModel],
+        batch_size: int = 1000,
+        async_engine: AsyncEngine | None = None,
+        cache: DataModelCache | None = None,
+        changes: ChangeBroker | None = None,
+        watermark_field: str | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        primary_key = data_model.get_primary_key()
+        table = data_model.__table__
+        primary_key_column = table.c[primary_key]
+        key_adapter = TypeAdapter(data_model.model_fields[primary_key].annotation)
+        tombstones = get_tombstone_table(data_model) if watermark_field is not None else None
+
+        def parse_key(value: Any) -> Any:
+            """
+            Returns the primary key converted to the type of the primary key field, or None if it is invalid.
+            """
+            try:
+                return key_adapter.validate_python(value)
+            except ValidationError:
+                return None
+
+        def batch(
+            session: Session, response: Response, operations: List[BatchOperation], **kwargs
+        ) -> List[BatchOperationResult]:
+            """
+            Execute the operations in a single transaction.
+
+            Creates fail if the entry exists, deletes fail if it does not, and saves update the given fields of an
+            existing entry or create it. Every entry may only be written by one operation of a batch. If any
+            operation fails, nothing is written and the response has the status code of the first failure.
+
+            Args:
+                session (Session): The session to execute the operations with.
+                response (Response): The response object used to set the status code of a failed batch.
+                operations (List[BatchOperation]): The operations to execute.
+
+            Raises:
+                HTTPException: If the batch contains more than `batch_size` operations.
+
+            Returns:
+                List[BatchOperationResult]: The result of every operation, in request order.
+            """
+            if len(operations) > batch_size:
+                raise HTTPException(
+                    status_code=413, detail=f"A batch may contain at most {batch_size} operations"
+                )
+            results: List[BatchOperationResult | None] = [None] * len(operations)
+
+            def fail(index: int, status: str, detail: Any, key: Any = None) -> None:
+                results[index] = BatchOperationResult(
+                    index=index, op=operations[index].op, status=status, primary_key=key, detail=detail
+                )
+
+            with phase("parse"):
+                keys, seen = [], set()
+                for index, operation in enumerate(operations):
+                    key = operation.data.get(primary_key)
+                    if key is None:
+                        if operation.op == "delete":
+                            fail(index, "invalid", f"Delete requires the {primary_key}")
+                        keys.append(None)
+                        continue
+                    key = parse_key(key)
+                    if key is None:
+                        fail(index, "invalid", f"Invalid {primary_key}")
+                    elif key in seen:
+                        fail(index, "conflict", f"{primary_key} {key} is written by another operation", key)
+                    else:
+                        seen.add(key)
+                    keys.append(key)
+
+            with phase("query"):
+                existing = (
+                    {
+                        row[primary_key]: dict(row)
+                        for row in session.execute(
+                            select(table).where(primary_key_column.in_(seen))
+                        ).mappings()
+                    }
+                    if seen
+                    else {}
+                )
+
+            with phase("parse"):
+                inserts, inserts_with_key, updates, deletes = [], [], [], []
+                for index, (operation, key) in enumerate(zip(operations, keys)):
+                    if results[index] is not None:
+                        continue
+                    if operation.op == "delete":
+                        if key in existing:
+                            deletes.append((index, key))
+                        else:
+                            fail(index, "not_found", f"No {data_model.__name__} entry with {primary_key} {key}", key)
+                        continue
+                    if operation.op == "create" and key in existing:
+                        fail(index, "conflict", f"Data already exists with {primary_key} {key}", key)
+                        continue
+                    values = operation.data
+                    if operation.op == "save" and key in existing:
+                        values = {**existing[key], **values}
+                    try:
+                        row = data_model.model_validate(data_model(**values)).model_dump()
+                    except (ValidationError, TypeError, ValueError) as e:
+                        fail(index, "invalid", e.errors() if isinstance(e, ValidationError) else str(e), key)
+                        continue
+                    if watermark_field is not None:
+                        row[watermark_field] = next_watermark()
+                    if key is None:
+                        inserts.append((index, row))
+                    elif key in existing:
+                        updates.append((index, row))
+                    else:
+                        inserts_with_key.append((index, row))
+
+            failures = [result for result in results if result is not None]
+            if failures:
+                for index, operation in enumerate(operations):
+                    if results[index] is None:
+                        results[index] = BatchOperationResult(
+                            index=index, op=operation.op, status="rolled_back", primary_key=keys[index]
+                        )
+                response.status_code = FAILURE_STATUS_CODES[failures[0].status]
+                return results
+
+            with phase("query"):
+                if inserts:
+                    created = session.execute(
+                        insert(table).returning(primary_key_column, sort_by_parameter_order=True),
+                        [{k: v for k, v in row.items() if k != primary_key} for _, row in inserts],
+                    ).scalars()
+                    for (index, row), key in zip(inserts, created):
+                        row[primary_key] = key
+                if inserts_with_key:
+                    session.execute(insert(table), [row for _, row in inserts_with_key])
+                if updates:
+                    session.execute(update(data_model), [row for _, row in updates])
+                if deletes:
+                    session.execute(delete(table).where(primary_key_column.in_([key for _, key in deletes])))
+                    if tombstones is not None:
+                        write_tombstones(session, tombstones, [key for _, key in deletes])
+            with phase("commit"):
+                session.commit()
+
+            for index, row in inserts + inserts_with_key:
+                results[index] = BatchOperationResult(
+                    index=index, op=operations[index].op, status="created", primary_key=row[primary_key]
+                )
+            for index, row in updates:
+                results[index] = BatchOperationResult(
+                    index=index, op="save", status="updated", primary_key=row[primary_key]
+                )
+            for index, key in deletes:
+                results[index] = BatchOperationResult(index=index, op="delete", status="deleted", primary_key=key)
+            if cache is not None:
+                cache.invalidate(
+                    *(row for _, row in inserts + inserts_with_key + updates),
+                    *(existing[row[primary_key]] for _, row in updates),
+                    *(existing[key] for _, key in deletes),
+                )
+            if changes is not None:
+                for _, row in inserts + inserts_with_key:
+                    changes.publish(data_model.__name__, "create", row[primary_key], row)
+                for _, row in updates:
+                    changes.publish(data_model.__name__, "save", row[primary_key], row, existing[row[primary_key]])
+                for _, key in deletes:
+                    changes.publish(data_model.__name__, "delete", key, existing[key])
+            return results
+
+        self.add_api_route(
+            "/batch",
+            generate_function(
+                function_name="batch",
+                parameters={
+                    "response": {"type_": Response},
+                    "operations": {"type_": List[BatchOperation]},
+                },
+                action=bind_session(batch, data_model, async_engine),
+            ),
+            methods=["POST"],
+            tags=[data_model.__name__],
+            response_model=List[BatchOperationResult],
+            name=f"Batch write {data_model.__name__}",
+            description=f"Create, save and delete up to {batch_size} {data_model.__name__} entries in a single transaction. Returns the result of every operation in request order. If any operation fails, nothing is written and the response has the status code of the first failure.",
+            operation_id=f"batch_write_{data_model.__name__.lower()}",
+        )
@@ -0,0 +1,277 @@
+import json
+from typing import Any, AsyncIterator, List, Literal
+
+from data_model_orm import DataModel
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session, select
+
+from ..cache import DataModelCache
+from ..changes import ChangeBroker
+from ..delta import next_watermark
+from ..instrumentation import phase
+from ..session import bind_session
+from ..utils import generate_function
+
+UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class BulkItemResult(BaseModel):
+    """
+    The result of a single item of a bulk request.
+    """
+
+    index: int
+    status: Literal["created", "updated", "conflict", "invalid"]
+    primary_key: Any = None
+    detail: Any = None
+
+
+async def read_items(request: Request) -> AsyncIterator[tuple[int, Any]]:
+    """
+    Reads the items of a bulk request body, either a JSON array or an NDJSON stream.
+
+    NDJSON bodies are parsed line by line while they are received, so they are never held in memory as a whole.
+    Lines that are not valid JSON are yielded as `None`.
+
+    Args:
+        request (Request): The FastAPI request object.
+
+    Raises:
+        HTTPException: If a JSON body is not a valid JSON array.
+
+    Yields:
+        tuple[int, Any]: The index and the decoded item.
+    """
+    if "ndjson" not in request.headers.get("content-type", ""):
+        try:
+            items = await request.json()
+        except ValueError:
+            items = None
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array")
+        for index, item in enumerate(items):
+            yield index, item
+        return
+
+    index, buffer = 0, b""
+    async for chunk in request.stream():
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield index, decode_line(line)
+                index += 1
+    if buffer.strip():
+        yield index, decode_line(buffer)
+
+
+def decode_line(line: bytes) -> Any:
+    """
+    Decodes a single NDJSON line.
+
+    Args:
+        line (bytes): The line to decode.
+
+    Returns:
+        Any: The decoded item or `None` if the line is not valid JSON.
+    """
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+class BulkRouter(APIRouter):
+    """
+    A router for a DataModel that provides bulk create and upsert operations for the DataModel.
+
+    This router provides a single POST endpoint that accepts a JSON array or an NDJSON stream of entries.
+    The entries are written in batches, each with a single query for the existing primary keys and
+    a single transaction for the writes.
+    """
+
+    def __init__(
+        self,
+        data_model: type[DataModel],
+        batch_size: int = 1000,
+        async_engine: AsyncEngine | None = None,
+        cache: DataModelCache | None = None,
+        changes: ChangeBroker | None = None,
+        watermark_field: str | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        primary_key = data_model.get_primary_key()
+        primary_key_column = getattr(data_model, primary_key)
+        table = data_model.__table__
+
+        def write_batch(
+            session: Session, items: List[tuple[int, Any]], upsert: bool
+        ) -> List[BulkItemResult]:
+            """
+            Validate and write a batch of entries in a single transaction.
+
+            Args:
+                session (Session): The session to write the entries with.
+                items (List[tuple[int, Any]]): The indices and raw items of the batch.
+                upsert (bool): Whether existing entries are updated instead of reported as conflicts.
+
+            Returns:
+                List[BulkItemResult]: The result of every item of the batch.
+            """
+            with phase("parse"):
+                results, rows = [], []
+                for index, item in items:
+                    if not isinstance(item, dict):
+                        results.append(
+                            BulkItemResult(index=index, status="invalid", detail="Entry must be a JSON object")
+                        )
+                        continue
+                    try:
+                        entry = data_model.model_validate(data_model(**item)).model_dump()
+                        if watermark_field is not None:
+                            entry[watermark_field] = next_watermark()
+                        rows.append((index, entry))
+                    except ValidationError as e:
+                        results.append(
+                            BulkItemResult(index=index, status="invalid", detail=e.errors())
+                        )
+
+            keys = [row[primary_key] for _, row in rows if row[primary_key] is not None]
+            with phase("query"):
+                existing = (
+                    set(session.exec(select(primary_key_column).where(primary_key_column.in_(keys))).all())
+                    if keys
+                    else set()
+                )
+
+            inserts, inserts_with_key, updates, seen = [], [], [], set()
+            for index, row in rows:
+                key = row[primary_key]
+                if key is None:
+                    inserts.append((index, row))
+                elif key in seen or (key in existing and not upsert):
+                    results.append(
+                        BulkItemResult(
+                            index=index,
+                            status="conflict",
+                            primary_key=key,
+                            detail=f"Data already exists with {primary_key} {key}",
+                        )
+                    )
+                else:
+                    seen.add(key)
+                    (updates if key in existing else inserts_with_key).append((index, row))
+
+            with phase("query"):
+                if inserts:
+                    statement = insert(table).returning(
+                        table.c[primary_key], sort_by_parameter_order=True
+                    )
+                    keys = session.execute(
+                        statement,
+                        [{k: v for k, v in row.items() if k != primary_key} for _, row in inserts],
+                    ).scalars()
+                    for (index, row), key in zip(inserts, keys):
+                        row[primary_key] = key
+                        results.append(BulkItemResult(index=index, status="created", primary_key=key))
+
+                dialect_insert = UPSERT_DIALECTS.get(session.get_bind().dialect.name)
+                if updates and dialect_insert is not None:
+                    statement = dialect_insert(table)
+                    statement = statement.on_conflict_do_update(
+                        index_elements=[table.c[primary_key]],
+                        set_={
+                            column.name: statement.excluded[column.name]
+                            for column in table.columns
+                            if column.name != primary_key
+                        },
+                    )
+                    session.execute(statement, [row for _, row in inserts_with_key + updates])
+                else:
+                    if inserts_with_key:
+                        session.execute(insert(table), [row for _, row in inserts_with_key])
+                    if updates:
+                        session.execute(update(data_model), [row for _, row in updates])
+            for index, row in inserts_with_key:
+                results.append(BulkItemResult(index=index, status="created", primary_key=row[primary_key]))
+            for index, row in updates:
+                results.append(BulkItemResult(index=index, status="updated", primary_key=row[primary_key]))
+
+            with phase("commit"):
+                session.commit()
+            if cache is not None:
+                cache.invalidate(
+                    *(row for _, row in inserts + inserts_with_key + updates),
+                    all_searches=bool(updates),
+                )
+            if changes is not None:
+                for _, row in inserts + inserts_with_key:
+                    changes.publish(data_model.__name__, "create", row[primary_key], row)
+                for _, row in updates:
+                    changes.publish(data_model.__name__, "save", row[primary_key], row)
+            return results
+
+        bound_write_batch = bind_session(write_batch, data_model, async_engine)
+
+        async def write(items: List[tuple[int, Any]], upsert: bool) -> List[BulkItemResult]:
+            """
+            Write a batch without blocking the event loop, using the threadpool if no async engine is given.
+            """
+            if async_engine is None:
+                return await run_in_threadpool(bound_write_batch, items, upsert)
+            return await bound_write_batch(items, upsert)
+
+        async def bulk(request: Request, *args, **kwargs) -> List[BulkItemResult]:
+            """
+            Create or upsert the entries of a JSON array or an NDJSON stream in batches.
+
+            Args:
+                request (Request): The request object.
+
+            Returns:
+                List[BulkItemResult]: The result of every item, in request order.
+            """
+            results, batch = [], []
+            async for item in read_items(request):
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    results += await write(batch, kwargs["upsert"])
+                    batch = []
+            if batch:
+                results += await write(batch, kwargs["upsert"])
+            return sorted(results, key=lambda result: result.index)
+
+        item_schema = data_model.model_json_schema()
+        self.add_api_route(
+            "/bulk",
+            generate_function(
+                function_name="bulk",
+                parameters={
+                    "upsert": {
+                        "type_": bool,
+                        "default": Query(False, description="Update existing entries instead of reporting a conflict."),
+                    }
+                },
+                action=bulk,
+            ),
+            methods=["POST"],
+            tags=[data_model.__name__],
+            response_model=List[BulkItemResult],
+            name=f"Bulk create {data_model.__name__}",
+            description=f"Create or upsert many {data_model.__name__} entries sent as a JSON array or as an NDJSON stream. The entries are written in batches of {batch_size}, each in a single transaction. Returns the status of every entry in request order.",
+            operation_id=f"bulk_{data_model.__name__.lower()}",
+            openapi_extra={
+                "requestBody": {
+                    "required": True,
+                    "content": {
+                        "application/json": {"schema": {"type": "array", "items": item_schema}},
+                        "application/x-ndjson": {"schema": item_schema},
+                    },
+                }
+            },
+        )
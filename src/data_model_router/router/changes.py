@@ -0,0 +1,136 @@
+import asyncio
+from typing import AsyncIterator
+
+from data_model_orm import DataModel
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from ..changes import ChangeBroker, Subscription
+from ..filters import extract_filters
+from ..utils import generate_function
+
+CHANGE_PARAMETERS = ("after",)
+
+
+class ChangeFeedRouter(APIRouter):
+    """
+    A router for a DataModel that streams the changes of the DataModel, so that clients do not have to poll
+    the search endpoint.
+
+    This router provides a GET endpoint streaming Server-Sent Events and a WebSocket endpoint, both sending
+    every create, save and delete of an entry that matches the query parameters, which filter like the search
+    endpoint. Clients resume after the last sequence number they received with `after` or, for Server-Sent
+    Events, the `Last-Event-ID` header that browsers send when they reconnect.
+    """
+
+    def __init__(
+        self,
+        data_model: type[DataModel],
+        changes: ChangeBroker,
+        heartbeat: float = 15.0,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        model = data_model.__name__
+
+        def subscribe(query_params: list[tuple[str, str]], after: int | None) -> Subscription:
+            """
+            Subscribe to the changes of the DataModel that match the query parameters.
+            """
+            where = extract_filters(query_params, data_model, ignore=CHANGE_PARAMETERS)
+            return changes.subscribe(model, where, after)
+
+        async def events(subscription: Subscription) -> AsyncIterator[bytes]:
+            """
+            Yield the events of the subscription as Server-Sent Events, with a comment every `heartbeat` seconds
+            without events, so that proxies keep the connection open and closed connections are noticed.
+            """
+            try:
+                while True:
+                    try:
+                        event = await asyncio.wait_for(subscription.get(), heartbeat)
+                    except asyncio.TimeoutError:
+                        yield b": heartbeat\n\n"
+                        continue
+                    if event is None:
+                        yield b"event: overflow\ndata: {}\n\n"
+                        return
+                    yield b"id: %d\nevent: %s\ndata: %s\n\n" % (event.seq, event.op.encode(), event.to_json())
+            finally:
+                subscription.close()
+
+        async def stream_changes(request: Request, **kwargs) -> StreamingResponse:
+            """
+            Stream the changes of the DataModel as Server-Sent Events.
+
+            Args:
+                request (Request): The request object.
+
+            Raises:
+                HTTPException: If the changes to resume after are no longer available.
+
+            Returns:
+                StreamingResponse: The event stream.
+            """
+            after = kwargs["after"]
+            if after is None and request.headers.get("last-event-id", "").isdigit():
+                after = int(request.headers["last-event-id"])
+            subscription = subscribe(request.query_params.multi_items(), after)
+            return StreamingResponse(
+                events(subscription),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
+        async def websocket_changes(websocket: WebSocket) -> None:
+            """
+            Send the changes of the DataModel as JSON messages over a WebSocket.
+
+            The socket is closed with code 1008 if the changes to resume after are no longer available and with
+            code 1013 if the client fell behind, after which it can reconnect with `after`.
+            """
+            await websocket.accept()
+            query_params = websocket.query_params.multi_items()
+            after = websocket.query_params.get("after")
+            try:
+                subscription = subscribe(query_params, int(after) if after is not None else None)
+            except (HTTPException, ValueError) as e:
+                await websocket.close(code=1008, reason=str(getattr(e, "detail", e)))
+                return
+            try:
+                while (event := await subscription.get()) is not None:
+                    await websocket.send_text(event.to_json().decode())
+                await websocket.close(code=1013, reason="Subscriber fell behind")
+            except WebSocketDisconnect:
+                pass
+            finally:
+                subscription.close()
+
+        self.add_api_route(
+            "/changes",
+            generate_function(
+                function_name="changes",
+                parameters={
+                    "after": {
+                        "type_": int | None,
+                        "default": Query(None, description="Resume after this sequence number."),
+                    },
+                    **{
+                        field_name: {
+                            "type_": field.annotation,
+                            "default": None,
+                        }
+                        for field_name, field in data_model.model_fields.items()
+                    },
+                },
+                action=stream_changes,
+            ),
+            methods=["GET"],
+            tags=[data_model.__name__],
+            response_class=StreamingResponse,
+            responses={200: {"content": {"text/event-stream": {}}, "description": "The changes."}},
+            name=f"Changes of {data_model.__name__}",
+            description=f"Stream the creates, saves and deletes of {data_model.__name__} entries where the new or old values match the query parameters, which filter like the search endpoint, as Server-Sent Events. Resume after a sequence number with `after` or the `Last-Event-ID` header.",
+            operation_id=f"changes_{data_model.__name__.lower()}",
+        )
+        self.add_api_websocket_route("/changes/ws", websocket_changes, name=f"Change WebSocket of {model}")
@@ -1,6 +1,18 @@
 from data_model_orm import DataModel
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session
+
+from ..cache import DataModelCache
+from ..changes import ChangeBroker
+from ..delta import next_watermark
+from ..etag import entry_etag
+from ..instrumentation import phase
+from ..serialization import get_serializer, json_response
+from ..session import bind_session
+from ..statements import PRIMARY_KEY_PARAMETER, select_by_primary_key
+from ..utils import generate_function
 
 
 class CreateRouter(APIRouter):
@@ -10,12 +22,81 @@ class CreateRouter(APIRouter):
     This router provides a single POST endpoint that allows for creating new entries in the DataModel.
     """
 
-    def __init__(self, data_model: type[DataModel]) -> None:
-        super().__init__()
+    def __init__(
+        self,
+        data_model: type[DataModel],
+        async_engine: AsyncEngine | None = None,
+        cache: DataModelCache | None = None,
+        changes: ChangeBroker | None = None,
+        watermark_field: str | None = None,
+        etag: bool = False,
+        version_field: str | None = None,
+        fast_serialization: bool = False,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
         primary_key = data_model.get_primary_key()
+        serializer = get_serializer(data_model)
+        select_entry = select_by_primary_key(data_model)
+
+        def create(
+            session: Session, data: DataModel, response: Response, **kwargs
+        ) -> DataModel:
+            """
+            Create a new DataModel entry.
 
-        @self.post(
+            Args:
+                session (Session): The session to create the entry with.
+                data (DataModel): The entry to create.
+                response (Response): The response object used to set the ETag header.
+
+            Returns:
+                DataModel: The created DataModel entry.
+            """
+            with phase("parse"):
+                try:
+                    data = data_model.model_validate(data)
+                except ValidationError as e:
+                    raise HTTPException(status_code=422, detail=e.errors())
+            with phase("query"):
+                exists = (
+                    getattr(data, primary_key) is not None
+                    and session.exec(
+                        select_entry, params={PRIMARY_KEY_PARAMETER: getattr(data, primary_key)}
+                    ).first()
+                    is not None
+                )
+            if exists:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"Data already exists with {primary_key} {getattr(data, primary_key)}",
+                )
+            if watermark_field is not None:
+                setattr(data, watermark_field, next_watermark())
+            with phase("commit"):
+                session.add(data)
+                session.commit()
+            with phase("query"):
+                session.refresh(data)
+            if cache is not None:
+                cache.invalidate(data.model_dump())
+            if changes is not None:
+                changes.publish(data_model.__name__, "create", getattr(data, primary_key), data.model_dump())
+            headers = {"ETag": entry_etag(data, serializer, version_field)} if etag else {}
+            if fast_serialization:
+                with phase("serialize"):
+                    return json_response(serializer.dump_json(data), status_code=201, headers=headers)
+            response.headers.update(headers)
+            return data
+
+        self.add_api_route(
             "/",
+            generate_function(
+                function_name="create",
+                parameters={"data": {"type_": data_model}, "response": {"type_": Response}},
+                action=bind_session(create, data_model, async_engine),
+            ),
+            methods=["POST"],
             response_model=data_model,
             tags=[data_model.__name__],
             description=f"Create a new {data_model.__name__} entry.",
@@ -23,18 +104,3 @@ class CreateRouter(APIRouter):
             name=f"Create new {data_model.__name__}",
             status_code=201,
         )
-        def create(data: data_model) -> DataModel: # type: ignore
-            try:
-                data = data_model.model_validate(data)
-            except ValidationError as e:
-                raise HTTPException(status_code=422, detail=e.errors())
-            if (
-                data_model.get_one(**{primary_key: getattr(data, primary_key)})
-                is not None
-            ):
-                raise HTTPException(
-                    status_code=409,
-                    detail=f"Data already exists with {primary_key} {getattr(data, primary_key)}",
-                )
-            data.save()
-            return data
@@ -1,6 +1,17 @@
 from data_model_orm import DataModel
 from fastapi import APIRouter, Request, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session
 
+from ..cache import DataModelCache
+from ..changes import ChangeBroker
+from ..coercion import primary_key_type
+from ..delta import get_tombstone_table, write_tombstones
+from ..etag import check_if_match, entry_etag
+from ..instrumentation import phase
+from ..serialization import get_serializer
+from ..session import bind_session
+from ..statements import PRIMARY_KEY_PARAMETER, select_by_primary_key
 from ..utils import generate_function
 
 
@@ -11,32 +22,61 @@ class DeleteRouter(APIRouter):
     This router provides a single DELETE endpoint that allows for deleting entries in the DataModel.
     """
 
-    def __init__(self, data_model: type[DataModel]) -> None:
-        super().__init__()
+    def __init__(
+        self,
+        data_model: type[DataModel],
+        async_engine: AsyncEngine | None = None,
+        cache: DataModelCache | None = None,
+        changes: ChangeBroker | None = None,
+        watermark_field: str | None = None,
+        etag: bool = False,
+        version_field: str | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
         primary_key = data_model.get_primary_key()
+        serializer = get_serializer(data_model)
+        select_entry = select_by_primary_key(data_model)
+        tombstones = get_tombstone_table(data_model) if watermark_field is not None else None
 
-        def delete(request: Request, *args, **kwargs) -> None:
+        def delete(session: Session, request: Request, *args, **kwargs) -> None:
             """
             Delete a DataModel entry with the provided query parameters.
 
+            If ETags are enabled and an If-Match header is provided, the entry is only deleted if the header matches.
+
             Args:
+                session (Session): The session to delete the entry with.
                 request (Request): The request object.
             """
-            data = data_model.get_one(**{primary_key: kwargs[primary_key]})
+            with phase("query"):
+                data = session.exec(
+                    select_entry, params={PRIMARY_KEY_PARAMETER: kwargs[primary_key]}
+                ).first()
             if data is None:
                 raise HTTPException(
                     status_code=404,
                     detail=f"No {data_model.__name__} entry with {primary_key} {kwargs[primary_key]}",
                 )
-            data.delete()
+            if etag:
+                check_if_match(request, entry_etag(data, serializer, version_field))
+            with phase("commit"):
+                session.delete(data)
+                if tombstones is not None:
+                    write_tombstones(session, tombstones, [getattr(data, primary_key)])
+                session.commit()
+            if cache is not None:
+                cache.invalidate(data.model_dump())
+            if changes is not None:
+                changes.publish(data_model.__name__, "delete", getattr(data, primary_key), data.model_dump())
             return Response(status_code=204)
 
         self.add_api_route(
             f"/{{{primary_key}}}/",
             generate_function(
                 function_name="delete",
-                parameters={primary_key: {"type_": str}},
-                action=delete,
+                parameters={primary_key: {"type_": primary_key_type(data_model)}},
+                action=bind_session(delete, data_model, async_engine),
             ),
             methods=["DELETE"],
             tags=[data_model.__name__],
@@ -0,0 +1,123 @@
+from heapq import merge
+from itertools import islice
+from typing import Any, List
+
+from data_model_orm import DataModel
+from fastapi import APIRouter, Query
+from pydantic import create_model
+from sqlalchemy import bindparam
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session, select
+
+from ..delta import ensure_tombstone_table, get_tombstone_table, settled_watermark
+from ..instrumentation import phase
+from ..session import bind_session
+from ..utils import generate_function
+
+
+class DeltaRouter(APIRouter):
+    """
+    A router for a DataModel that returns the changes of the DataModel since a watermark, so that clients can
+    sync incrementally instead of downloading all entries again.
+
+    This router provides a single GET endpoint that returns the entries created or saved since the watermark and
+    the primary keys of the entries deleted since then. The routers stamp every write with a watermark in
+    `watermark_field` and record deletions in a tombstone table, so both are range scans on an index and the
+    response grows with the number of changes instead of the size of the table.
+    """
+
+    def __init__(
+        self,
+        data_model: type[DataModel],
+        watermark_field: str,
+        watermark_lag: float = 1.0,
+        chunk_size: int = 1000,
+        async_engine: AsyncEngine | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        primary_key = data_model.get_primary_key()
+        watermark_column = getattr(data_model, watermark_field)
+        tombstones = get_tombstone_table(data_model)
+        watermark_range = (watermark_column > bindparam("since")) & (watermark_column <= bindparam("until"))
+        select_entries = (
+            select(data_model).where(watermark_range).order_by(watermark_column).limit(bindparam("limit"))
+        )
+        select_tombstones = (
+            select(tombstones.c.primary_key, tombstones.c.watermark)
+            .where(tombstones.c.watermark > bindparam("since"), tombstones.c.watermark <= bindparam("until"))
+            .order_by(tombstones.c.watermark)
+            .limit(bindparam("limit"))
+        )
+        response_model = create_model(
+            f"{data_model.__name__}Delta",
+            watermark=(int, ...),
+            entries=(List[data_model], ...),
+            deleted=(List[data_model.model_fields[primary_key].annotation], ...),
+            more=(bool, ...),
+        )
+
+        def delta(session: Session, *args, **kwargs) -> dict[str, Any]:
+            """
+            Return the changes with a watermark greater than `since`, up to `limit` changes.
+
+            Only changes that are at least `watermark_lag` seconds old are returned, so that a write that commits
+            after this request does not get a watermark the client already synced past. If `more` is true, the
+            client requests the next changes with the returned watermark right away. Deleted entries are applied
+            before the other entries, so an entry that was deleted and created again is kept.
+
+            Args:
+                session (Session): The session to query the changes with.
+
+            Returns:
+                dict[str, Any]: The new `watermark`, the changed `entries`, the primary keys of the `deleted`
+                                entries and whether there are `more` changes.
+            """
+            since, limit = kwargs["since"], kwargs["limit"]
+            params = {"since": since, "until": max(since, settled_watermark(watermark_lag)), "limit": limit + 1}
+            ensure_tombstone_table(session, tombstones)
+            with phase("query"):
+                entries = session.exec(select_entries, params=params).all()
+                deleted = session.execute(select_tombstones, params).all()
+            changes = list(
+                islice(
+                    merge(
+                        ((row.watermark, False, row.primary_key) for row in deleted),
+                        ((getattr(entry, watermark_field), True, entry) for entry in entries),
+                        key=lambda change: change[:2],
+                    ),
+                    limit + 1,
+                )
+            )
+            more = len(changes) > limit
+            changes = changes[:limit]
+            return {
+                "watermark": changes[-1][0] if more else params["until"],
+                "entries": [change for _, is_entry, change in changes if is_entry],
+                "deleted": [change for _, is_entry, change in changes if not is_entry],
+                "more": more,
+            }
+
+        self.add_api_route(
+            "/delta",
+            generate_function(
+                function_name="delta",
+                parameters={
+                    "since": {
+                        "type_": int,
+                        "default": Query(0, description="The watermark returned by the previous delta, or 0 for all entries."),
+                    },
+                    "limit": {
+                        "type_": int,
+                        "default": Query(chunk_size, ge=1, le=chunk_size, description="The maximum number of changes."),
+                    },
+                },
+                action=bind_session(delta, data_model, async_engine),
+            ),
+            methods=["GET"],
+            tags=[data_model.__name__],
+            response_model=response_model,
+            name=f"Delta of {data_model.__name__}",
+            description=f"Return the {data_model.__name__} entries created or saved and the primary keys of the entries deleted since the watermark `since`, ordered by their watermark. Continue with the returned `watermark`, immediately if `more` is true.",
+            operation_id=f"delta_{data_model.__name__.lower()}",
+        )
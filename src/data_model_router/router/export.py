@@ -0,0 +1,164 @@
+from functools import lru_cache
+
+from data_model_orm import DataModel
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import select
+from typing import AsyncIterator, Iterator, Sequence
+
+from ..export import (
+    EXPORT_EXTENSIONS,
+    EXPORT_MEDIA_TYPES,
+    Encoder,
+    available_formats,
+    get_encoder,
+    negotiate_format,
+)
+from ..filters import Filter, extract_filters
+from ..instrumentation import phase
+from ..replicas import read_engine
+from ..session import stream_in_async_session, stream_in_session
+from ..utils import generate_function
+
+
+class ExportRouter(APIRouter):
+    """
+    A router for a DataModel that exports the entries of the DataModel as CSV, Arrow IPC or Parquet.
+
+    This router provides a single GET endpoint that filters the entries like the search endpoint and streams
+    them from a server-side cursor in chunks of `chunk_size` rows. The rows are encoded column by column
+    without building entries, so the memory used by an export does not grow with the size of the table.
+    The format is chosen by the Accept header. Arrow IPC and Parquet require pyarrow.
+    """
+
+    def __init__(
+        self,
+        data_model: type[DataModel],
+        chunk_size: int = 1000,
+        async_engine: AsyncEngine | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        primary_key_column = getattr(data_model, data_model.get_primary_key())
+        columns = [data_model.__table__.c[field_name] for field_name in data_model.model_fields]
+        filename = data_model.__name__.lower()
+
+        @lru_cache(maxsize=256)
+        def build_statement(where: tuple[tuple[str, str], ...]) -> Select:
+            """
+            Build the statement of an export once per combination of filtered fields and operators.
+            The filter values are bound parameters named `filter_{index}`.
+            """
+            statement = select(*columns)
+            for index, (field, operator) in enumerate(where):
+                statement = statement.where(
+                    Filter(field, operator, None).expression(data_model, f"filter_{index}")
+                )
+            return statement.order_by(primary_key_column)
+
+        def prepare(request: Request) -> tuple[str, Select, dict]:
+            """
+            Negotiate the format and build the statement and its parameters from the query parameters.
+            """
+            with phase("parse"):
+                where = extract_filters(request.query_params.multi_items(), data_model)
+                export_format = negotiate_format(request.headers.get("accept"))
+            if export_format is None:
+                raise HTTPException(
+                    status_code=406,
+                    detail=f"Acceptable media types: {', '.join(EXPORT_MEDIA_TYPES[name] for name in available_formats())}",
+                )
+            statement = build_statement(
+                tuple((search_filter.field, search_filter.operator) for search_filter in where)
+            )
+            params = {}
+            for index, search_filter in enumerate(where):
+                params.update(search_filter.bind_values(f"filter_{index}"))
+            return export_format, statement, params
+
+        def response(export_format: str, content: Iterator[bytes] | AsyncIterator[bytes]) -> StreamingResponse:
+            """
+            Return the streamed export as an attachment.
+            """
+            return StreamingResponse(
+                content,
+                media_type=EXPORT_MEDIA_TYPES[export_format],
+                headers={
+                    "Content-Disposition": f'attachment; filename="{filename}.{EXPORT_EXTENSIONS[export_format]}"'
+                },
+            )
+
+        def encode(encoder: Encoder, chunks: Iterator[Sequence]) -> Iterator[bytes]:
+            """
+            Encode the chunks of rows, skipping empty output until the encoder flushes.
+            """
+            for chunk in chunks:
+                data = encoder.encode(chunk)
+                if data:
+                    yield data
+            yield encoder.finish()
+
+        async def encode_async(encoder: Encoder, chunks: AsyncIterator[Sequence]) -> AsyncIterator[bytes]:
+            """
+            Encode the chunks of rows of the async engine. See `encode`.
+            """
+            async for chunk in chunks:
+                data = encoder.encode(chunk)
+                if data:
+                    yield data
+            yield encoder.finish()
+
+        def export(request: Request, **kwargs) -> StreamingResponse:
+            """
+            Stream the entries of the DataModel that match the query parameters, ordered by primary key.
+
+            Args:
+                request (Request): The request object.
+
+            Returns:
+                StreamingResponse: The entries in the format of the Accept header.
+            """
+            export_format, statement, params = prepare(request)
+            encoder = get_encoder(data_model, export_format)
+            chunks = stream_in_session(read_engine(data_model.__engine__), statement, params, chunk_size)
+            return response(export_format, encode(encoder, chunks))
+
+        async def export_async(request: Request, **kwargs) -> StreamingResponse:
+            """
+            Stream the entries of the DataModel that match the query parameters with the async engine.
+
+            See `export`.
+            """
+            export_format, statement, params = prepare(request)
+            encoder = get_encoder(data_model, export_format)
+            chunks = await stream_in_async_session(read_engine(async_engine), statement, params, chunk_size)
+            return response(export_format, encode_async(encoder, chunks))
+
+        self.add_api_route(
+            "/export",
+            generate_function(
+                function_name="export",
+                parameters={
+                    field_name: {
+                        "type_": field.annotation,
+                        "default": None,
+                    }
+                    for field_name, field in data_model.model_fields.items()
+                },
+                action=export if async_engine is None else export_async,
+            ),
+            methods=["GET"],
+            tags=[data_model.__name__],
+            response_class=StreamingResponse,
+            responses={
+                200: {
+                    "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()},
+                    "description": "The matching entries.",
+                }
+            },
+            name=f"Export {data_model.__name__}",
+            description=f"Stream all {data_model.__name__} entries where the query parameters match the fields of the model, which filter like the search endpoint, as `text/csv`, `application/vnd.apache.arrow.stream` or `application/vnd.apache.parquet`, depending on the Accept header. Defaults to CSV.",
+            operation_id=f"export_{data_model.__name__.lower()}",
+        )
@@ -1,7 +1,18 @@
 from data_model_orm import DataModel
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session
+from typing import Any, Union
 
-from ..utils import generate_function
+from ..cache import DataModelCache
+from ..coercion import primary_key_type
+from ..etag import conditional_response
+from ..instrumentation import phase
+from ..serialization import get_serializer, json_response, negotiate_serializer
+from ..session import bind_session
+from ..statements import PRIMARY_KEY_PARAMETER, select_by_primary_key
+from ..utils import extract_fields, generate_function, get_partial_model
 
 
 class GetByIdRouter(APIRouter):
@@ -9,26 +20,105 @@ class GetByIdRouter(APIRouter):
     A router for a DataModel that provides get by id operations for the DataModel.
 
     This router provides a single GET endpoint that allows for getting a single entry in the DataModel by its primary key.
+    The entry can be narrowed to a subset of the fields (`fields`), which are the only columns selected from the database.
+    With `negotiate_encoding`, the entry is returned as MessagePack or as JSON encoded by orjson, depending on the Accept header.
     """
 
-    def __init__(self, data_model: type[DataModel]) -> None:
-        super().__init__()
+    def __init__(
+        self,
+        data_model: type[DataModel],
+        async_engine: AsyncEngine | None = None,
+        cache: DataModelCache | None = None,
+        etag: bool = False,
+        version_field: str | None = None,
+        fast_serialization: bool = False,
+        negotiate_encoding: bool = False,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
 
         primary_key = data_model.get_primary_key()
+        serializer = get_serializer(data_model)
+        select_entry = select_by_primary_key(data_model)
 
-        def get_entry_by_id(**kwargs) -> DataModel | None:
+        def get_entry_by_id(session: Session, request: Request, **kwargs) -> DataModel | None:
             """
             Get a single entry in the DataModel by its primary key.
 
+            If ETags are enabled, a 304 response is returned when the If-None-Match header matches the entry.
+            Entries narrowed to a subset of the fields are not cached.
+
             Args:
+                session (Session): The session to query the entry with.
+                request (Request): The request object.
                 **kwargs: The primary key value for the entry.
             """
-            data = data_model.get_one(**{primary_key: kwargs[primary_key]})
-            if data is None:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"No {data_model.__name__} entry with {primary_key} {kwargs[primary_key]}",
+            with phase("parse"):
+                fields = extract_fields(kwargs["fields"], data_model)
+            if fields is not None:
+                names = [*fields, primary_key]
+                if etag and version_field is not None:
+                    names.append(version_field)
+                with phase("query"):
+                    result = session.execute(
+                        select_by_primary_key(data_model, tuple(dict.fromkeys(names))),
+                        {PRIMARY_KEY_PARAMETER: kwargs[primary_key]},
+                    )
+                with phase("hydrate"):
+                    data = result.first()
+                if data is None:
+                    raise not_found(kwargs[primary_key])
+                return respond(request, data, fields)
+            if cache is not None:
+                key = cache.entry_key(kwargs[primary_key])
+                data = cache.get(key)
+                if data is not None:
+                    return respond(request, data)
+                generation = cache.generation
+            with phase("query"):
+                result = session.exec(
+                    select_entry, params={PRIMARY_KEY_PARAMETER: kwargs[primary_key]}
                 )
+            with phase("hydrate"):
+                data = result.first()
+            if data is None:
+                raise not_found(kwargs[primary_key])
+            if cache is not None:
+                cache.set(key, data, generation)
+            return respond(request, data)
+
+        def not_found(value: Any) -> HTTPException:
+            """
+            Return the exception for a missing entry.
+            """
+            return HTTPException(
+                status_code=404,
+                detail=f"No {data_model.__name__} entry with {primary_key} {value}",
+            )
+
+        def respond(
+            request: Request, data: DataModel | Row, fields: tuple[str, ...] | None = None
+        ) -> DataModel | Response:
+            """
+            Return the entry as it is, as a conditional response if ETags are enabled or serialized if fast
+            serialization or the negotiation of the encoding is enabled or only some of the fields are requested.
+            """
+            if negotiate_encoding:
+                entry_serializer = negotiate_serializer(request.headers.get("accept"), data_model, fields)
+            else:
+                entry_serializer = serializer if fields is None else get_serializer(data_model, fields)
+            headers = {"Vary": "Accept"} if negotiate_encoding else None
+            with phase("serialize"):
+                if etag:
+                    return conditional_response(
+                        request, data, entry_serializer, version_field, headers=headers
+                    )
+                if fast_serialization or negotiate_encoding or fields is not None:
+                    return json_response(
+                        entry_serializer.dump_json(data),
+                        headers=headers,
+                        media_type=entry_serializer.media_type,
+                    )
             return data
 
         self.add_api_route(
@@ -37,14 +127,18 @@ class GetByIdRouter(APIRouter):
                 function_name="get",
                 parameters={
                     primary_key: {
-                        "type_": str,
-                    }
+                        "type_": primary_key_type(data_model),
+                    },
+                    "fields": {
+                        "type_": str | None,
+                        "default": Query(None, description=f"A comma separated list of the fields to return, e.g. `{primary_key}`. Defaults to all fields."),
+                    },
                 },
-                action=get_entry_by_id,
+                action=bind_session(get_entry_by_id, data_model, async_engine),
             ),
             methods=["GET"],
             tags=[data_model.__name__],
-            response_model=data_model,
+            response_model=Union[data_model, get_partial_model(data_model)],
             name=f"Get {data_model.__name__} by ID",
             description=f"Return the {data_model.__name__} entry with the provided {primary_key}.",
             operation_id=f"get_{data_model.__name__.lower()}_by_{primary_key.lower()}",
@@ -1,6 +1,17 @@
 from data_model_orm import DataModel
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, Response
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session
 
+from ..cache import DataModelCache
+from ..changes import ChangeBroker
+from ..coercion import get_coercion_plan
+from ..delta import next_watermark
+from ..etag import check_if_match, entry_etag
+from ..instrumentation import phase
+from ..serialization import get_serializer, json_response
+from ..session import bind_session
+from ..statements import PRIMARY_KEY_PARAMETER, select_by_primary_key
 from ..utils import extract_and_validate_query_params, generate_function
 
 
@@ -11,32 +22,86 @@ class SaveRouter(APIRouter):
     This router provides a single POST endpoint that allows for saving entries in the DataModel.
     """
 
-    def __init__(self, data_model: type[DataModel]) -> None:
-        super().__init__()
+    def __init__(
+        self,
+        data_model: type[DataModel],
+        async_engine: AsyncEngine | None = None,
+        cache: DataModelCache | None = None,
+        changes: ChangeBroker | None = None,
+        watermark_field: str | None = None,
+        etag: bool = False,
+        version_field: str | None = None,
+        fast_serialization: bool = False,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
         primary_key = data_model.get_primary_key()
+        serializer = get_serializer(data_model)
+        select_entry = select_by_primary_key(data_model)
+        coercion = get_coercion_plan(data_model)
 
-        def save(request: Request, *args, **kwargs) -> DataModel:
+        def save(
+            session: Session, request: Request, response: Response, *args, **kwargs
+        ) -> DataModel:
             """
             Save a DataModel entry with the provided query parameters.
 
             If no query parameters are provided, a new DataModel entry will be saved with the default values of the model fields.
+            If ETags are enabled and an If-Match header is provided, the entry is only saved if the header matches the current entry.
 
             Args:
+                session (Session): The session to save the entry with.
                 request (Request): The request object.
+                response (Response): The response object used to set the ETag header.
 
             Returns:
                 DataModel: The saved DataModel entry.
             """
-            query_params = extract_and_validate_query_params(request, data_model)
+            with phase("parse"):
+                query_params = coercion.coerce(extract_and_validate_query_params(request, data_model))
+            written = []
+            data = None
+            if primary_key in query_params:
+                with phase("query"):
+                    data = session.exec(
+                        select_entry, params={PRIMARY_KEY_PARAMETER: query_params[primary_key]}
+                    ).first()
+            if etag:
+                check_if_match(
+                    request,
+                    entry_etag(data, serializer, version_field) if data is not None else None,
+                )
             if primary_key in query_params:
-                data = data_model.get_one(**{primary_key: query_params[primary_key]})
                 if data is None:
                     data = data_model(**query_params)
+                else:
+                    written.append(data.model_dump())
                 for key, value in query_params.items():
                     setattr(data, key, value)
             else:
                 data = data_model(**query_params)
-            data.save()
+            if watermark_field is not None:
+                setattr(data, watermark_field, next_watermark())
+            with phase("commit"):
+                session.add(data)
+                session.commit()
+            with phase("query"):
+                session.refresh(data)
+            if cache is not None:
+                cache.invalidate(*written, data.model_dump())
+            if changes is not None:
+                changes.publish(
+                    data_model.__name__,
+                    "save" if written else "create",
+                    getattr(data, primary_key),
+                    data.model_dump(),
+                    written[0] if written else None,
+                )
+            headers = {"ETag": entry_etag(data, serializer, version_field)} if etag else {}
+            if fast_serialization:
+                with phase("serialize"):
+                    return json_response(serializer.dump_json(data), headers=headers)
+            response.headers.update(headers)
             data = data.model_validate(data)
             return data
 
@@ -45,13 +110,16 @@ class SaveRouter(APIRouter):
             generate_function(
                 function_name="save",
                 parameters={
-                    field_name: {
-                        "type_": field.annotation,
-                        "default": None,
-                    }
-                    for field_name, field in data_model.model_fields.items()
+                    "response": {"type_": Response},
+                    **{
+                        field_name: {
+                            "type_": field.annotation,
+                            "default": None,
+                        }
+                        for field_name, field in data_model.model_fields.items()
+                    },
                 },
-                action=save,
+                action=bind_session(save, data_model, async_engine),
             ),
             methods=["POST"],
             tags=[data_model.__name__],
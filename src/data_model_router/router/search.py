@@ -1,8 +1,28 @@
+from functools import lru_cache
+
 from data_model_orm import DataModel
-from fastapi import APIRouter, Request
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row, Select, bindparam
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session, select
+from typing import Any, AsyncIterator, Iterator, List, Literal, Union
+
+from ..cache import DataModelCache
+from ..etag import conditional_response
+from ..filters import Filter, extract_filters, parse_order_by
+from ..instrumentation import phase
+from ..serialization import (
+    get_native_serializer,
+    get_serializer,
+    json_response,
+    negotiate_serializer,
+)
+from ..session import bind_session
+from ..utils import extract_fields, generate_function, get_partial_model
 
-from ..utils import extract_and_validate_query_params, generate_function
+SEARCH_PARAMETERS = ("limit", "after", "stream", "fields", "order_by")
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "json": "application/json"}
 
 
 class SearchRouter(APIRouter):
@@ -10,44 +30,343 @@ class SearchRouter(APIRouter):
     A router for a DataModel that provides search operations for the DataModel.
 
     This router provides a single GET endpoint that allows for searching for entries in the DataModel.
+    Query parameters filter on equality or, with an operator suffix like `age__gte`, on a range, a set of
+    values or a prefix, and `order_by` sorts the results. Results can be paginated with a keyset on the
+    primary key (`limit` / `after`), optionally streamed in chunks as NDJSON or as a JSON array (`stream`)
+    and narrowed to a subset of the fields (`fields`). With `negotiate_encoding`, the results are returned as
+    MessagePack if the Accept header prefers it and as JSON encoded by orjson otherwise.
     """
 
-    def __init__(self, data_model: type[DataModel]) -> None:
-        super().__init__()
+    def __init__(
+        self,
+        data_model: type[DataModel],
+        chunk_size: int = 1000,
+        async_engine: AsyncEngine | None = None,
+        cache: DataModelCache | None = None,
+        etag: bool = False,
+        version_field: str | None = None,
+        fast_serialization: bool = False,
+        negotiate_encoding: bool = False,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        primary_key = data_model.get_primary_key()
+        primary_key_column = getattr(data_model, primary_key)
+        table = data_model.__table__
+        serialize_rows = etag or fast_serialization or negotiate_encoding
+
+        def select_page(
+            session: Session,
+            where: List[Filter],
+            after: Any = None,
+            limit: int | None = None,
+            rows: bool = False,
+            fields: tuple[str, ...] | None = None,
+            order: List[tuple[str, bool]] | None = None,
+        ) -> List[DataModel | Row]:
+            """
+            Select the entries matching the filters, ordered by primary key if a keyset is used.
+
+            Args:
+                session (Session): The session to query the entries with.
+                where (List[Filter]): The filters.
+                after (Any, optional): Only return entries with a primary key greater than this value.
+                limit (int | None, optional): The maximum number of entries to return.
+                rows (bool, optional): Return plain result rows of the table columns instead of hydrated
+                                       entries, for results that are only serialized. Defaults to False.
+                fields (tuple[str, ...] | None, optional): Only select these columns if `rows` is True.
+                                                           The primary key is always selected.
+                order (List[tuple[str, bool]] | None, optional): The fields to order by and whether to order
+                                                                 descending. The primary key breaks ties.
+
+            Returns:
+                List[DataModel | Row]: The matching entries.
+            """
+            statement = build_statement(
+                tuple((search_filter.field, search_filter.operator) for search_filter in where),
+                after is not None,
+                limit is not None,
+                rows,
+                fields,
+                tuple(order or ()),
+            )
+            params = {}
+            for index, search_filter in enumerate(where):
+                params.update(search_filter.bind_values(f"filter_{index}"))
+            if after is not None:
+                params["after"] = after
+            if limit is not None:
+                params["limit"] = limit
+            with phase("query"):
+                result = session.execute(statement, params) if rows else session.exec(statement, params=params)
+            with phase("hydrate"):
+                return result.all()
+
+        @lru_cache(maxsize=256)
+        def build_statement(
+            where: tuple[tuple[str, str], ...],
+            after: bool,
+            limit: bool,
+            rows: bool,
+            fields: tuple[str, ...] | None,
+            order: tuple[tuple[str, bool], ...],
+        ) -> Select:
+            """
+            Build the statement of a search once per shape, i.e. per combination of filtered fields, operators and
+            parameters. The values are bound parameters, so the statement and its compiled form are reused for
+            every search of the same shape. See `select_page` for the arguments.
+            """
+            if not rows:
+                statement = select(data_model)
+            elif fields is None:
+                statement = select(*table.columns)
+            else:
+                statement = select(*select_columns(fields))
+            for index, (field, operator) in enumerate(where):
+                statement = statement.where(
+                    Filter(field, operator, None).expression(data_model, f"filter_{index}")
+                )
+            if after:
+                statement = statement.where(primary_key_column > bindparam("after"))
+            if order:
+                statement = statement.order_by(
+                    *(
+                        getattr(data_model, name).desc() if descending else getattr(data_model, name)
+                        for name, descending in order
+                    ),
+                    primary_key_column,
+                )
+            elif after or limit:
+                statement = statement.order_by(primary_key_column)
+            if limit:
+                statement = statement.limit(bindparam("limit"))
+            return statement
+
+        fetch_page = bind_session(select_page, data_model, async_engine)
 
-        def search(request: Request, *args, **kwargs) -> List[DataModel]:
+        def select_columns(fields: tuple[str, ...]) -> list:
+            """
+            Return the columns of the fields plus the columns needed for pagination and ETags.
+            """
+            names = [*fields, primary_key]
+            if etag and version_field is not None:
+                names.append(version_field)
+            return [table.c[name] for name in dict.fromkeys(names)]
+
+        def serialize_page(
+            page: List[Row], stream: str, first: bool, fields: tuple[str, ...] | None
+        ) -> bytes:
+            """
+            Serialize a page of entries as a chunk of the given stream format.
+
+            Args:
+                page (List[Row]): The entries to serialize.
+                stream (str): The output format, either "ndjson" or "json".
+                first (bool): Whether this is the first page of a JSON array.
+                fields (tuple[str, ...] | None): Only serialize these fields.
+
+            Returns:
+                bytes: The serialized chunk.
+            """
+            if negotiate_encoding:
+                page_serializer = get_native_serializer(data_model, fields)
+            else:
+                page_serializer = get_serializer(data_model, fields)
+            if stream == "json":
+                return (b"" if first else b",") + page_serializer.dump_json_list(page)[1:-1]
+            return page_serializer.dump_ndjson(page)
+
+        def stream_entries(
+            where: List[Filter],
+            after: Any,
+            limit: int | None,
+            stream: str,
+            fields: tuple[str, ...] | None,
+        ) -> Iterator[bytes]:
+            """
+            Yield the matching entries page by page, so that only one chunk is held in memory.
+
+            Args:
+                where (List[Filter]): The filters.
+                after (Any): The primary key to start after.
+                limit (int | None): The maximum number of entries to stream in total.
+                stream (str): The output format, either "ndjson" or "json".
+                fields (tuple[str, ...] | None): Only stream these fields.
+
+            Yields:
+                bytes: The serialized chunks.
+            """
+            if stream == "json":
+                yield b"["
+            first, remaining = True, limit
+            while remaining is None or remaining > 0:
+                page_size = chunk_size if remaining is None else min(chunk_size, remaining)
+                page = fetch_page(
+                    where, after=after, limit=page_size, rows=True, fields=fields
+                )
+                if not page:
+                    break
+                yield serialize_page(page, stream, first, fields)
+                first = False
+                if remaining is not None:
+                    remaining -= len(page)
+                if len(page) < page_size:
+                    break
+                after = getattr(page[-1], primary_key)
+            if stream == "json":
+                yield b"]"
+
+        async def stream_entries_async(
+            where: List[Filter],
+            after: Any,
+            limit: int | None,
+            stream: str,
+            fields: tuple[str, ...] | None,
+        ) -> AsyncIterator[bytes]:
+            """
+            Yield the matching entries page by page using the async engine.
+
+            See `stream_entries` for the arguments.
+            """
+            if stream == "json":
+                yield b"["
+            first, remaining = True, limit
+            while remaining is None or remaining > 0:
+                page_size = chunk_size if remaining is None else min(chunk_size, remaining)
+                page = await fetch_page(
+                    where, after=after, limit=page_size, rows=True, fields=fields
+                )
+                if not page:
+                    break
+                yield serialize_page(page, stream, first, fields)
+                first = False
+                if remaining is not None:
+                    remaining -= len(page)
+                if len(page) < page_size:
+                    break
+                after = getattr(page[-1], primary_key)
+            if stream == "json":
+                yield b"]"
+
+        def search(
+            session: Session, request: Request, response: Response, *args, **kwargs
+        ) -> List[DataModel]:
             """
             Search for entries in the DataModel based on the query parameters provided.
 
             If no query parameters are provided, all entries in the DataModel will be returned.
+            Filters are combined with AND and compiled to predicates on the columns, so they can use indexes.
+            `after` and `stream` page through the entries by primary key and can not be combined with `order_by`.
+            If `limit` is provided, a `Link` header pointing to the next page is set when more entries may follow.
+            If ETags are enabled, a 304 response is returned when the If-None-Match header matches the result.
 
             Args:
+                session (Session): The session to query the entries with.
                 request (Request): The request object.
+                response (Response): The response object used to set the pagination headers.
 
             Returns:
                 List[DataModel]: A list of DataModel objects that match the query parameters.
             """
-            return data_model.get_all(
-                **extract_and_validate_query_params(request, data_model)
-            )
+            with phase("parse"):
+                where = extract_filters(
+                    request.query_params.multi_items(), data_model, ignore=SEARCH_PARAMETERS
+                )
+                after, limit, stream = kwargs["after"], kwargs["limit"], kwargs["stream"]
+                fields = extract_fields(kwargs["fields"], data_model)
+                order = parse_order_by(kwargs["order_by"], data_model)
+            if order == [(primary_key, False)]:
+                order = []
+            if order and (after is not None or stream is not None):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"after and stream can only be used when ordering by {primary_key}",
+                )
+            if stream is not None:
+                return StreamingResponse(
+                    (stream_entries if async_engine is None else stream_entries_async)(
+                        where, after, limit, stream, fields
+                    ),
+                    media_type=STREAM_MEDIA_TYPES[stream],
+                )
+            rows = serialize_rows or fields is not None
+            if cache is None:
+                entries = select_page(
+                    session, where, after=after, limit=limit, rows=rows, fields=fields, order=order
+                )
+            else:
+                key = cache.search_key(request.query_params.multi_items())
+                entries = cache.get(key)
+                if entries is None:
+                    generation = cache.generation
+                    entries = select_page(
+                        session, where, after=after, limit=limit, rows=rows, fields=fields, order=order
+                    )
+                    cache.set(key, entries, generation)
+            headers = {"Vary": "Accept"} if negotiate_encoding else {}
+            if limit is not None and len(entries) == limit and not order:
+                next_url = request.url.include_query_params(
+                    after=getattr(entries[-1], primary_key)
+                )
+                headers["Link"] = f'<{next_url}>; rel="next"'
+            if negotiate_encoding:
+                entry_serializer = negotiate_serializer(request.headers.get("accept"), data_model, fields)
+            else:
+                entry_serializer = get_serializer(data_model, fields)
+            with phase("serialize"):
+                if etag:
+                    return conditional_response(
+                        request, entries, entry_serializer, version_field, headers=headers
+                    )
+                if rows:
+                    return json_response(
+                        entry_serializer.dump_json_list(entries),
+                        headers=headers,
+                        media_type=entry_serializer.media_type,
+                    )
+            response.headers.update(headers)
+            return entries
 
         self.add_api_route(
             "/",
             generate_function(
                 function_name="search",
                 parameters={
-                    field_name: {
-                        "type_": field.annotation,
-                        "default": None,
-                    }
-                    for field_name, field in data_model.model_fields.items()
+                    "response": {"type_": Response},
+                    **{
+                        field_name: {
+                            "type_": field.annotation,
+                            "default": None,
+                        }
+                        for field_name, field in data_model.model_fields.items()
+                    },
+                    "limit": {
+                        "type_": int | None,
+                        "default": Query(None, ge=1, description="The maximum number of entries to return."),
+                    },
+                    "after": {
+                        "type_": data_model.model_fields[primary_key].annotation,
+                        "default": Query(None, description=f"Only return entries whose {primary_key} is greater than this value."),
+                    },
+                    "stream": {
+                        "type_": Literal["ndjson", "json"] | None,
+                        "default": Query(None, description="Stream the entries in chunks as NDJSON or as a JSON array."),
+                    },
+                    "fields": {
+                        "type_": str | None,
+                        "default": Query(None, description=f"A comma separated list of the fields to return, e.g. `{primary_key}`. Defaults to all fields."),
+                    },
+                    "order_by": {
+                        "type_": str | None,
+                        "default": Query(None, description=f"A comma separated list of the fields to order by, prefixed with `-` for descending order. Defaults to `{primary_key}` when paginating."),
+                    },
                 },
-                action=search,
+                action=bind_session(search, data_model, async_engine),
             ),
             methods=["GET"],
             tags=[data_model.__name__],
-            response_model=List[data_model],
+            response_model=List[Union[data_model, get_partial_model(data_model)]],
             name=f"Search {data_model.__name__}",
-            description=f"Return all {data_model.__name__} entries where the query parameters match the fields of the model. If no query parameters are provided, all {data_model.__name__} entries will be returned.",
+            description=f"Return all {data_model.__name__} entries where the query parameters match the fields of the model. If no query parameters are provided, all {data_model.__name__} entries will be returned. Append `__ne`, `__lt`, `__lte`, `__gt`, `__gte`, `__in` (comma separated values), `__between` (two comma separated bounds) or `__prefix` to a field name to filter by another operator than equality. Use `order_by` to sort the entries, `limit` and `after` to page through the entries by {primary_key}, `stream` to receive them in chunks, or `fields` to only return some of the fields.",
             operation_id=f"search_{data_model.__name__.lower()}",
         )
@@ -0,0 +1,42 @@
+from typing import Any, Callable
+
+from fastapi.routing import APIRoute
+from starlette.routing import compile_path, get_name
+
+
+class LazyRoute(APIRoute):
+    """
+    A route that stores its arguments and only builds the FastAPI route on first use.
+
+    Building a FastAPI route creates the dependency graph of the endpoint and a pydantic field for every
+    parameter and the response model, which dominates the startup time of apps with many models. A lazy
+    route only compiles its path, which is all that is needed to include it in other routers and to match
+    requests. The FastAPI route is built when the route handles its first request or when another attribute
+    is accessed, e.g. by the generation of the OpenAPI schema.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        self._arguments = (path, endpoint, kwargs)
+        self._built = False
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+        self.path = path
+        self.endpoint = endpoint
+        self.name = get_name(endpoint) if kwargs.get("name") is None else kwargs["name"]
+        self.methods = {method.upper() for method in kwargs.get("methods") or ["GET"]}
+        self.path_regex, self.path_format, self.param_convertors = compile_path(path)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or self.__dict__.get("_built", True):
+            raise AttributeError(name)
+        self.build()
+        return getattr(self, name)
+
+    def build(self) -> None:
+        """
+        Builds the FastAPI route, if it was not built yet.
+        """
+        if not self._built:
+            self._built = True
+            path, endpoint, kwargs = self._arguments
+            APIRoute.__init__(self, path, endpoint, **kwargs)
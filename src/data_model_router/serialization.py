@@ -0,0 +1,290 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from functools import cached_property, lru_cache
+from importlib.util import find_spec
+from types import NoneType, UnionType
+from typing import Any, Callable, Iterable, Union, get_args, get_origin
+from uuid import UUID
+
+from data_model_orm import DataModel
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy import Row
+from typing_extensions import TypedDict
+
+from .utils import parse_accept
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+
+class Serializer:
+    """
+    Serializes entries of a DataModel to JSON without validating them again.
+
+    The serializer is built once per DataModel from a TypedDict with the annotations of the model fields,
+    so the field types are serialized like the response model would, and the fields are always written
+    in the order of the model, no matter in which order the ORM loaded them. Besides entries, plain result
+    rows of the table columns can be serialized, which avoids the cost of hydrating ORM instances.
+    The TypeAdapters are built on the first serialization, so creating a serializer at startup is cheap.
+
+    Use `get_serializer` to get the cached serializer of a DataModel.
+
+    Args:
+        data_model (type[DataModel]): The DataModel to serialize.
+        fields (tuple[str, ...] | None, optional): Only serialize these fields. Defaults to all fields.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self, data_model: type[DataModel], fields: tuple[str, ...] | None = None
+    ) -> None:
+        self.data_model = data_model
+        self.primary_key = data_model.get_primary_key()
+        self.fields = [
+            (field_name, field.serialization_alias or field.alias or field_name)
+            for field_name, field in data_model.model_fields.items()
+            if fields is None or field_name in fields
+        ]
+
+    @cached_property
+    def row_type(self) -> type:
+        """
+        The TypedDict with the annotations of the serialized fields.
+        """
+        return TypedDict(
+            f"{self.data_model.__name__}Row",
+            {
+                key: self.data_model.model_fields[field_name].annotation
+                for field_name, key in self.fields
+            },
+        )
+
+    @cached_property
+    def adapter(self) -> TypeAdapter:
+        """
+        The TypeAdapter serializing a single row.
+        """
+        return TypeAdapter(self.row_type)
+
+    @cached_property
+    def list_adapter(self) -> TypeAdapter:
+        """
+        The TypeAdapter serializing a list of rows.
+        """
+        return TypeAdapter(list[self.row_type])
+
+    def to_row(self, entry: DataModel | Row) -> dict[str, Any]:
+        """
+        Returns the fields of the entry as a dictionary in the order of the model.
+
+        Args:
+            entry (DataModel | Row): The entry or a result row of the table columns.
+
+        Returns:
+            dict[str, Any]: The fields of the entry, keyed by their serialization alias.
+        """
+        values = entry._mapping if isinstance(entry, Row) else entry.__dict__
+        try:
+            return {key: values[field_name] for field_name, key in self.fields}
+        except KeyError:
+            return {key: getattr(entry, field_name) for field_name, key in self.fields}
+
+    def dump_json(self, entry: DataModel | Row) -> bytes:
+        """
+        Serializes a single entry to JSON.
+        """
+        return self.adapter.dump_json(self.to_row(entry))
+
+    def dump_json_list(self, entries: Iterable[DataModel | Row]) -> bytes:
+        """
+        Serializes the entries to a JSON array.
+        """
+        return self.list_adapter.dump_json([self.to_row(entry) for entry in entries])
+
+    def dump_ndjson(self, entries: Iterable[DataModel | Row]) -> bytes:
+        """
+        Serializes the entries to newline delimited JSON.
+        """
+        return b"".join(self.dump_json(entry) + b"\n" for entry in entries)
+
+    def serialize(self, content: DataModel | Row | list[DataModel | Row]) -> bytes:
+        """
+        Serializes an entry or a list of entries to JSON.
+        """
+        if isinstance(content, (DataModel, Row)):
+            return self.dump_json(content)
+        return self.dump_json_list(content)
+
+
+class NativeSerializer(Serializer):
+    """
+    Serializes entries with a native encoder like orjson or msgpack instead of pydantic.
+
+    The encoder handles most field types itself. For the other fields, a converter is picked once from the
+    annotation of the field when the serializer is built, e.g. `str` for decimals, so no value falls back to
+    a generic encoding at serialization time. Subclasses define the types the encoder handles and `dumps`.
+    `dump_json` and `dump_json_list` return the encoding of the subclass, i.e. its `media_type`.
+    """
+
+    native_types: tuple[type, ...] = (str, int, float, bool)
+
+    def __init__(
+        self, data_model: type[DataModel], fields: tuple[str, ...] | None = None
+    ) -> None:
+        super().__init__(data_model, fields)
+        self.converters = [
+            (key, converter)
+            for field_name, key in self.fields
+            if (converter := self.get_converter(data_model.model_fields[field_name].annotation)) is not None
+        ]
+
+    def get_converter(self, annotation: Any) -> Callable[[Any], Any] | None:
+        """
+        Returns the function converting a value of the annotation to a value the encoder handles, or None if the
+        encoder handles the values itself.
+        """
+        field_type = annotation
+        if get_origin(annotation) in (Union, UnionType):
+            arguments = [argument for argument in get_args(annotation) if argument is not NoneType]
+            if len(arguments) == 1:
+                field_type = arguments[0]
+        if isinstance(field_type, type) and issubclass(field_type, self.native_types):
+            return None
+        if isinstance(field_type, type) and issubclass(field_type, (Decimal, UUID)):
+            return str
+        if isinstance(field_type, type) and issubclass(field_type, (datetime, date, time)):
+            return lambda value: value.isoformat()
+        if isinstance(field_type, type) and issubclass(field_type, Enum):
+            return lambda value: value.value
+        adapter = TypeAdapter(annotation)
+        return lambda value: adapter.dump_python(value, mode="json")
+
+    def to_native(self, entry: DataModel | Row | None) -> dict[str, Any] | None:
+        """
+        Returns the fields of the entry with the values converted for the encoder.
+        """
+        if entry is None:
+            return None
+        row = self.to_row(entry)
+        for key, converter in self.converters:
+            if row[key] is not None:
+                row[key] = converter(row[key])
+        return row
+
+    def dumps(self, content: Any) -> bytes:
+        """
+        Encodes converted rows.
+        """
+        raise NotImplementedError
+
+    def dump_json(self, entry: DataModel | Row) -> bytes:
+        return self.dumps(self.to_native(entry))
+
+    def dump_json_list(self, entries: Iterable[DataModel | Row | None]) -> bytes:
+        return self.dumps([self.to_native(entry) for entry in entries])
+
+
+class OrjsonSerializer(NativeSerializer):
+    """
+    Serializes entries to JSON with orjson, which also encodes dates, times, UUIDs and enums itself.
+    """
+
+    native_types = (str, int, float, bool, datetime, date, time, UUID, Enum)
+
+    def dumps(self, content: Any) -> bytes:
+        import orjson
+
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+class MsgpackSerializer(NativeSerializer):
+    """
+    Serializes entries to MessagePack. Dates and times are encoded as ISO 8601 strings, like in JSON.
+    """
+
+    media_type = "application/msgpack"
+    native_types = (str, int, float, bool, bytes)
+
+    def dumps(self, content: Any) -> bytes:
+        import msgpack
+
+        return msgpack.packb(content)
+
+
+@lru_cache(maxsize=1024)
+def get_native_serializer(
+    data_model: type[DataModel], fields: tuple[str, ...] | None = None, media_type: str = "application/json"
+) -> Serializer:
+    """
+    Returns the cached serializer of the DataModel for the media type, using orjson for JSON if it is installed.
+    """
+    if media_type == MsgpackSerializer.media_type:
+        return MsgpackSerializer(data_model, fields)
+    if find_spec("orjson") is not None:
+        return OrjsonSerializer(data_model, fields)
+    return get_serializer(data_model, fields)
+
+
+def negotiate_serializer(
+    accept: str | None, data_model: type[DataModel], fields: tuple[str, ...] | None = None
+) -> Serializer:
+    """
+    Returns the serializer for the media type preferred by the Accept header, MessagePack if msgpack is installed
+    and JSON otherwise.
+
+    Args:
+        accept (str | None): The value of the Accept header.
+        data_model (type[DataModel]): The DataModel to serialize.
+        fields (tuple[str, ...] | None, optional): Only serialize these fields. Defaults to all fields.
+
+    Returns:
+        Serializer: The cached serializer.
+    """
+    for media_type, quality in parse_accept(accept).items():
+        if quality == 0:
+            break
+        if media_type in MSGPACK_MEDIA_TYPES and find_spec("msgpack") is not None:
+            return get_native_serializer(data_model, fields, MsgpackSerializer.media_type)
+        if media_type in ("application/json", "application/*", "*/*"):
+            break
+    return get_native_serializer(data_model, fields)
+
+
+@lru_cache(maxsize=1024)
+def get_serializer(
+    data_model: type[DataModel], fields: tuple[str, ...] | None = None
+) -> Serializer:
+    """
+    Returns the serializer of the DataModel, building it on the first call.
+
+    Args:
+        data_model (type[DataModel]): The DataModel to serialize.
+        fields (tuple[str, ...] | None, optional): Only serialize these fields. Defaults to all fields.
+
+    Returns:
+        Serializer: The cached serializer.
+    """
+    return Serializer(data_model, fields)
+
+
+def json_response(
+    body: bytes,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+    media_type: str = "application/json",
+) -> Response:
+    """
+    Returns a response with an already serialized JSON body.
+
+    Args:
+        body (bytes): The JSON body.
+        status_code (int, optional): The status code. Defaults to 200.
+        headers (dict[str, str] | None, optional): Additional response headers.
+        media_type (str, optional): The media type of the body, e.g. of a serializer. Defaults to "application/json".
+
+    Returns:
+        Response: The response.
+    """
+    return Response(body, status_code=status_code, media_type=media_type, headers=headers)
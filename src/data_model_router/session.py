@@ -0,0 +1,200 @@
+from functools import wraps
+from time import perf_counter
+from typing import Any, AsyncIterator, Callable, Iterator, Sequence
+
+from data_model_orm import DataModel
+from fastapi import HTTPException
+from sqlalchemy import Engine, Executable, Row
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .instrumentation import phase, record_phase
+from .pool import PoolMetrics, get_pool_metrics
+from .replicas import read_engine
+
+
+def pool_exhausted(metrics: PoolMetrics) -> HTTPException:
+    """
+    Records the timeout of a checkout and returns the exception for an exhausted connection pool.
+    """
+    metrics.record_timeout()
+    return HTTPException(
+        status_code=503,
+        detail="Database connection pool exhausted",
+        headers={"Retry-After": "1"},
+    )
+
+
+def run_in_session(engine: Engine, action: Callable, *args, **kwargs) -> Any:
+    """
+    Runs the action in a new session on the given engine.
+
+    The session checks out its connection before the action runs, so that the wait for the connection is
+    recorded in the pool metrics of the engine and an exhausted pool is answered with a 503 response.
+
+    Args:
+        engine (Engine): The engine to open the session on.
+        action (Callable): The action to run. It receives the session as its first argument.
+        *args: Additional positional arguments passed to the action.
+        **kwargs: Additional keyword arguments passed to the action.
+
+    Returns:
+        Any: The return value of the action.
+    """
+    metrics = get_pool_metrics(engine)
+    with Session(engine, expire_on_commit=False) as session:
+        started = perf_counter()
+        try:
+            session.connection()
+        except TimeoutError:
+            raise pool_exhausted(metrics)
+        metrics.record_checkout(perf_counter() - started)
+        record_phase("connect", perf_counter() - started)
+        return action(session, *args, **kwargs)
+
+
+async def run_in_async_session(
+    engine: AsyncEngine, action: Callable, *args, **kwargs
+) -> Any:
+    """
+    Runs the action in a new async session on the given async engine.
+
+    The action is written against a synchronous session and executed with `AsyncSession.run_sync`,
+    so the database I/O is awaited on the event loop instead of blocking a worker thread.
+    The connection is checked out up front, as in `run_in_session`.
+
+    Args:
+        engine (AsyncEngine): The async engine to open the session on.
+        action (Callable): The action to run. It receives the session as its first argument.
+        *args: Additional positional arguments passed to the action.
+        **kwargs: Additional keyword arguments passed to the action.
+
+    Returns:
+        Any: The return value of the action.
+    """
+    metrics = get_pool_metrics(engine)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        started = perf_counter()
+        try:
+            await session.connection()
+        except TimeoutError:
+            raise pool_exhausted(metrics)
+        metrics.record_checkout(perf_counter() - started)
+        record_phase("connect", perf_counter() - started)
+        return await session.run_sync(action, *args, **kwargs)
+
+
+def stream_in_session(
+    engine: Engine, statement: Executable, params: dict[str, Any], chunk_size: int
+) -> Iterator[Sequence[Row]]:
+    """
+    Executes the statement with a server-side cursor and returns an iterator over its rows in chunks.
+
+    The connection is checked out and the statement executed before this function returns, so an
+    exhausted pool or an invalid statement is raised before a streamed response starts. Only one chunk
+    is fetched at a time. The session is closed when the iterator is exhausted or closed.
+
+    Args:
+        engine (Engine): The engine to open the session on.
+        statement (Executable): The statement to execute.
+        params (dict[str, Any]): The bound parameters of the statement.
+        chunk_size (int): The number of rows per chunk.
+
+    Returns:
+        Iterator[Sequence[Row]]: The chunks of rows.
+    """
+    metrics = get_pool_metrics(engine)
+    session = Session(engine)
+    try:
+        started = perf_counter()
+        try:
+            session.connection()
+        except TimeoutError:
+            raise pool_exhausted(metrics)
+        metrics.record_checkout(perf_counter() - started)
+        record_phase("connect", perf_counter() - started)
+        with phase("query"):
+            result = session.execute(
+                statement.execution_options(stream_results=True, yield_per=chunk_size), params
+            )
+    except BaseException:
+        session.close()
+        raise
+
+    def chunks() -> Iterator[Sequence[Row]]:
+        try:
+            yield from result.partitions()
+        finally:
+            session.close()
+
+    return chunks()
+
+
+async def stream_in_async_session(
+    engine: AsyncEngine, statement: Executable, params: dict[str, Any], chunk_size: int
+) -> AsyncIterator[Sequence[Row]]:
+    """
+    Executes the statement with a server-side cursor of the async engine and returns an async iterator over
+    its rows in chunks. See `stream_in_session`.
+    """
+    metrics = get_pool_metrics(engine)
+    session = AsyncSession(engine)
+    try:
+        started = perf_counter()
+        try:
+            await session.connection()
+        except TimeoutError:
+            raise pool_exhausted(metrics)
+        metrics.record_checkout(perf_counter() - started)
+        record_phase("connect", perf_counter() - started)
+        with phase("query"):
+            result = await session.stream(
+                statement.execution_options(yield_per=chunk_size), params
+            )
+    except BaseException:
+        await session.close()
+        raise
+
+    async def chunks() -> AsyncIterator[Sequence[Row]]:
+        try:
+            async for chunk in result.partitions():
+                yield chunk
+        finally:
+            await session.close()
+
+    return chunks()
+
+
+def bind_session(
+    action: Callable, data_model: type[DataModel], async_engine: AsyncEngine | None = None
+) -> Callable:
+    """
+    Binds an action to a new session per call.
+
+    Every request to a route is served by a single call of its action, so all queries and writes of a
+    request share one session, one connection and one transaction. Reads routed to a replica run on its engine.
+
+    Args:
+        action (Callable): The action to bind. It receives the session as its first argument.
+        data_model (type[DataModel]): The data model whose engine is used if no async engine is given.
+        async_engine (AsyncEngine | None, optional): The async engine to use. If given, a coroutine
+                                                     function is returned. Defaults to None.
+
+    Returns:
+        Callable: A function that runs the action in a new session and takes the remaining arguments of the action.
+    """
+    if async_engine is None:
+
+        @wraps(action)
+        def bound_action(*args, **kwargs) -> Any:
+            return run_in_session(read_engine(data_model.__engine__), action, *args, **kwargs)
+
+    else:
+
+        @wraps(action)
+        async def bound_action(*args, **kwargs) -> Any:
+            return await run_in_async_session(read_engine(async_engine), action, *args, **kwargs)
+
+    return bound_action
@@ -0,0 +1,146 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+
+COALESCED_METHODS = ("GET", "HEAD")
+KEY_HEADERS = ("accept", "accept-encoding", "if-none-match", "authorization", "cookie")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls, so that only the first one runs and the others share its result.
+
+    Calls are identified by a key. While a call with a key is in flight, further calls with the same key wait
+    for its result or exception instead of running themselves. Once it completed, the next call runs again,
+    so results are never reused beyond the calls that overlapped with it.
+
+    The calls run on the event loop, which is where FastAPI awaits both async handlers and the threadpool
+    running sync handlers, so waiting calls do not block a worker thread or hold a database connection.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self._route_classes: dict[type[APIRoute], type[APIRoute]] = {}
+        self.generation = 0
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Runs the function unless a call with the same key is in flight, and returns the result of the call.
+
+        If the running call is cancelled, e.g. because its client disconnected, the waiting calls run again.
+
+        Args:
+            key (Hashable): The key identifying identical calls.
+            function (Callable[[], Awaitable[Any]]): The function to run.
+
+        Returns:
+            Any: The result of the function.
+        """
+        key = (id(asyncio.get_running_loop()), key)
+        self.calls += 1
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+            self.coalesced -= 1
+            self.calls -= 1
+            return await self.do(key[1], function)
+
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        self.executions += 1
+        try:
+            result = await function()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    def snapshot(self) -> dict[str, int]:
+        """
+        Returns the number of calls, of calls that ran and of calls that shared the result of another call.
+        """
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
+
+    def route_class(self, base: type[APIRoute] = APIRoute) -> type[APIRoute]:
+        """
+        Returns a route class that coalesces concurrent identical GET requests of its routes.
+
+        Requests are identical if they have the same path, the same query parameters in any order and the same
+        headers that the response depends on, e.g. Accept. Each waiting request gets a copy of the response of
+        the request that ran. Streamed responses can not be shared, so their waiting requests run again.
+        Requests with other methods are never coalesced. When one of them completes, requests that start
+        afterwards no longer join reads that were in flight during the write.
+
+        Args:
+            base (type[APIRoute], optional): The route class to extend. Defaults to APIRoute.
+
+        Returns:
+            type[APIRoute]: The route class.
+        """
+        if base not in self._route_classes:
+            flight = self
+
+            class CoalescedRoute(base):
+                def get_route_handler(self) -> Callable:
+                    handler = super().get_route_handler()
+
+                    async def coalesced_handler(request: Request) -> Response:
+                        if request.method not in COALESCED_METHODS:
+                            try:
+                                return await handler(request)
+                            finally:
+                                flight.generation += 1
+                        key = (
+                            flight.generation,
+                            request.method,
+                            request.url.path,
+                            tuple(sorted(request.query_params.multi_items())),
+                            tuple(request.headers.get(name) for name in KEY_HEADERS),
+                        )
+                        ran = False
+
+                        async def run() -> tuple[Response, tuple | None]:
+                            nonlocal ran
+                            ran = True
+                            response = await handler(request)
+                            if isinstance(response, StreamingResponse):
+                                return response, None
+                            return response, (response.body, response.status_code, list(response.raw_headers))
+
+                        response, shared = await flight.do(key, run)
+                        if ran:
+                            return response
+                        if shared is None:
+                            return await handler(request)
+                        body, status_code, raw_headers = shared
+                        response = Response(body, status_code=status_code)
+                        response.raw_headers = list(raw_headers)
+                        return response
+
+                    return coalesced_handler
+
+            self._route_classes[base] = CoalescedRoute
+        return self._route_classes[base]
@@ -0,0 +1,62 @@
+from functools import lru_cache
+
+from data_model_orm import DataModel
+from sqlalchemy import Select, bindparam
+from sqlmodel import select
+
+PRIMARY_KEY_PARAMETER = "primary_key"
+PRIMARY_KEYS_PARAMETER = "primary_keys"
+
+
+def select_entries(data_model: type[DataModel], columns: tuple[str, ...] | None = None) -> Select:
+    """
+    Returns a statement selecting the entries of the DataModel or only some of their columns as plain result rows.
+    """
+    if columns is None:
+        return select(data_model)
+    return select(*(data_model.__table__.c[name] for name in columns))
+
+
+@lru_cache(maxsize=1024)
+def select_by_primary_key(
+    data_model: type[DataModel], columns: tuple[str, ...] | None = None
+) -> Select:
+    """
+    Returns the statement selecting an entry of the DataModel by its primary key, building it on the first call.
+
+    The primary key is a bound parameter named `PRIMARY_KEY_PARAMETER`, so the same statement is executed for
+    every request and SQLAlchemy finds its compiled form in the compiled cache without building it again:
+
+        session.exec(select_by_primary_key(data_model), params={PRIMARY_KEY_PARAMETER: value})
+
+    Args:
+        data_model (type[DataModel]): The DataModel to select.
+        columns (tuple[str, ...] | None, optional): Only select these columns as a plain result row. Defaults to
+                                                    selecting the entry.
+
+    Returns:
+        Select: The statement.
+    """
+    primary_key_column = getattr(data_model, data_model.get_primary_key())
+    return select_entries(data_model, columns).where(
+        primary_key_column == bindparam(PRIMARY_KEY_PARAMETER)
+    )
+
+
+@lru_cache(maxsize=1024)
+def select_by_primary_keys(
+    data_model: type[DataModel], columns: tuple[str, ...] | None = None
+) -> Select:
+    """
+    Returns the statement selecting the entries of the DataModel with one of several primary keys.
+
+    The primary keys are an expanding bound parameter named `PRIMARY_KEYS_PARAMETER`, which takes a list.
+    See `select_by_primary_key` for the arguments.
+
+    Returns:
+        Select: The statement.
+    """
+    primary_key_column = getattr(data_model, data_model.get_primary_key())
+    return select_entries(data_model, columns).where(
+        primary_key_column.in_(bindparam(PRIMARY_KEYS_PARAMETER, expanding=True))
+    )
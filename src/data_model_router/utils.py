@@ -1,7 +1,9 @@
-from typing import Any, Callable
-from inspect import Signature, Parameter, _empty
+from functools import cache
+from typing import Any, Callable, Iterable, Optional
+from inspect import Signature, Parameter, _empty, iscoroutinefunction
 
 from fastapi import HTTPException, Request
+from pydantic import BaseModel, create_model
 
 from data_model_orm import DataModel
 
@@ -15,6 +17,9 @@ def generate_function(
     """
     Dynamically generates a function with the given name, parameters, and action.
 
+    If the action is a coroutine function, the generated function is a coroutine function as well,
+    so that FastAPI runs it on the event loop instead of the threadpool.
+
     Args:
         function_name (str): The name of the generated function.
         parameters (dict): A dictionary where keys are parameter names and values are dictionaries
@@ -25,8 +30,15 @@ def generate_function(
     Returns:
         Callable: The dynamically generated function.
     """
-    def generated_function(request: Request, *args, **kwargs):
-        return action(request=request, *args, **kwargs)
+    if iscoroutinefunction(action):
+
+        async def generated_function(request: Request, *args, **kwargs):
+            return await action(request=request, *args, **kwargs)
+
+    else:
+
+        def generated_function(request: Request, *args, **kwargs):
+            return action(request=request, *args, **kwargs)
 
     generated_function.__doc__ = description
     generated_function.__name__ = function_name
@@ -50,7 +62,7 @@ def generate_function(
 
 
 def extract_and_validate_query_params(
-    request: Request, data_model: type[DataModel]
+    request: Request, data_model: type[DataModel], ignore: Iterable[str] = ()
 ) -> dict[str, Any]:
     """
     Extracts and validates query parameters from the request against the data model.
@@ -58,6 +70,8 @@ def extract_and_validate_query_params(
     Args:
         request (Request): The FastAPI request object containing query parameters.
         data_model (type[DataModel]): The data model class to validate query parameters against.
+        ignore (Iterable[str], optional): Query parameters that are handled by the route itself
+                                          and are neither validated nor returned. Defaults to ().
 
     Raises:
         HTTPException: If a query parameter is not valid according to the data model.
@@ -67,10 +81,89 @@ def extract_and_validate_query_params(
     """
     where = {}
     for query_param in request.query_params:
+        if query_param in ignore:
+            continue
         if query_param not in data_model.model_fields:
             raise HTTPException(
                 status_code=400,
                 detail=f"Invalid query parameter: {query_param}",
             )
         where[query_param] = request.query_params[query_param]
-    return where
\ No newline at end of file
+    return where
+
+
+def extract_fields(
+    fields: str | None, data_model: type[DataModel]
+) -> tuple[str, ...] | None:
+    """
+    Extracts and validates a comma separated list of fields against the data model.
+
+    Args:
+        fields (str | None): The comma separated field names, e.g. the value of the `fields` query parameter.
+        data_model (type[DataModel]): The data model class to validate the fields against.
+
+    Raises:
+        HTTPException: If a field is not a field of the data model.
+
+    Returns:
+        tuple[str, ...] | None: The field names in the order of the data model or None if no fields are given.
+    """
+    if not fields:
+        return None
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    for name in names:
+        if name not in data_model.model_fields:
+            raise HTTPException(status_code=400, detail=f"Invalid field: {name}")
+    return tuple(name for name in data_model.model_fields if name in names)
+
+
+def parse_accept(header: str | None) -> dict[str, float]:
+    """
+    Parses an Accept or Accept-Encoding header to the quality of each value.
+
+    Args:
+        header (str | None): The value of the header.
+
+    Returns:
+        dict[str, float]: The lowercase media ranges or encodings without parameters and their quality, ordered by
+                          quality and then by position. Values with a quality of 0 are included, as they exclude
+                          the value from a wildcard.
+    """
+    if not header:
+        return {}
+    candidates = []
+    for position, item in enumerate(header.split(",")):
+        value, *parameters = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for parameter in parameters:
+            name, _, number = parameter.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        if value:
+            candidates.append((-quality, position, value.lower()))
+    return {value: -quality for quality, _, value in sorted(candidates)}
+
+
+@cache
+def get_partial_model(data_model: type[DataModel]) -> type[BaseModel]:
+    """
+    Returns a model with the fields of the data model, all of them optional.
+
+    It documents the responses of routes that only return the requested fields of the data model.
+
+    Args:
+        data_model (type[DataModel]): The data model class.
+
+    Returns:
+        type[BaseModel]: The partial model.
+    """
+    return create_model(
+        f"{data_model.__name__}Partial",
+        **{
+            field_name: (Optional[field.annotation], None)
+            for field_name, field in data_model.model_fields.items()
+        },
+    )
@@ -4,6 +4,7 @@ from fastapi.testclient import TestClient
 from fastapi import FastAPI
 from sqlmodel import create_engine
 from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import create_async_engine
 from data_model_orm import DataModel, Field
 from data_model_router.main import DataModelRouter
 from typing import Optional
@@ -51,3 +52,13 @@ def client(test_data_model: TestDataModel, test_data_model2: TestDataModel2):
     app.include_router(DataModelRouter(TestDataModel2))
     client = TestClient(app)
     return client
+
+
+@pytest.fixture
+def async_client(test_data_model: TestDataModel, test_data_model2: TestDataModel2):
+    async_engine = create_async_engine("sqlite+aiosqlite:///database.db")
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, async_engine=async_engine))
+    app.include_router(DataModelRouter(TestDataModel2, async_engine=async_engine))
+    with TestClient(app) as client:
+        yield client
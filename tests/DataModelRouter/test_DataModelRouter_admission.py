@@ -0,0 +1,121 @@
+import asyncio
+
+import httpx
+
+from data_model_router import AdmissionControl, Instrumentation
+
+from conftest import *
+
+
+def create_client(admission: AdmissionControl, **kwargs) -> TestClient:
+    """
+    Create a client of an app whose router admits its requests with the admission control.
+    """
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, admission=admission, **kwargs))
+    return TestClient(app)
+
+
+def test_rate_limit(test_data_model: TestDataModel):
+    """
+    Test that a client exceeding the rate limit is answered with 429 and Retry-After, while other clients are not.
+    """
+    client = create_client(AdmissionControl(rate=0.5, burst=2))
+    assert [client.get("/testdatamodel/1/").status_code for _ in range(3)] == [200, 200, 429]
+    response = client.get("/testdatamodel/1/")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+    assert client.get("/testdatamodel/1/", headers={"X-Client": "other"}).status_code == 429
+
+    client = create_client(
+        AdmissionControl(rate=0.5, burst=1, client_key=lambda request: request.headers.get("x-client"))
+    )
+    assert client.get("/testdatamodel/1/", headers={"X-Client": "a"}).status_code == 200
+    assert client.get("/testdatamodel/1/", headers={"X-Client": "b"}).status_code == 200
+    assert client.get("/testdatamodel/1/", headers={"X-Client": "a"}).status_code == 429
+
+
+def test_expensive_search(test_data_model: TestDataModel):
+    """
+    Test that searches without a small enough limit on a large table are rejected with 503, but searches with
+    a limit and reads by id are not.
+    """
+    TestDataModel(id=2, name="Bob", age=40).save()
+    client = create_client(AdmissionControl(max_search_rows=1, expensive_concurrency=0))
+    response = client.get("/testdatamodel/")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert client.get("/testdatamodel/", params={"limit": 5}).status_code == 503
+    assert client.get("/testdatamodel/", params={"limit": 1}).status_code == 200
+    assert client.get("/testdatamodel/1/").status_code == 200
+
+    client = create_client(AdmissionControl(max_search_rows=2, expensive_concurrency=0))
+    assert client.get("/testdatamodel/").status_code == 200
+
+
+def test_expensive_search_queued(test_data_model: TestDataModel):
+    """
+    Test that concurrent expensive searches run one at a time and all complete within the queue timeout.
+    """
+    TestDataModel(id=2, name="Bob", age=40).save()
+    admission = AdmissionControl(max_search_rows=1, queue_timeout=5)
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, admission=admission))
+
+    async def main() -> list[httpx.Response]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.get("/testdatamodel/") for _ in range(5)))
+
+    assert [response.status_code for response in asyncio.run(main())] == [200] * 5
+    snapshot = admission.snapshot("TestDataModel")
+    assert snapshot["expensive"] == 5
+    assert snapshot["admitted"] == 5
+    assert snapshot["running"] == 0
+
+
+def test_concurrency_limit(test_data_model: TestDataModel):
+    """
+    Test that a route over its concurrency limit is answered with 503, while other routes are not limited.
+    """
+    instrumentation = Instrumentation()
+    admission = AdmissionControl(concurrency={"search": 0})
+    client = create_client(admission, instrumentation=instrumentation)
+    assert client.get("/testdatamodel/").status_code == 503
+    assert client.get("/testdatamodel/1/").status_code == 200
+    assert admission.snapshot("TestDataModel")["rejected"] == 1
+    assert 'data_model_router_admission_rejected{model="TestDataModel"} 1' in instrumentation.render()
+
+
+def test_streamed_search_holds_slot(test_data_model: TestDataModel):
+    """
+    Test that a streamed search holds its slot until its body is sent.
+    """
+    admission = AdmissionControl(concurrency={"search": 1})
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, admission=admission))
+    running = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.body":
+            running.append(admission.snapshot("TestDataModel")["running"])
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/testdatamodel/",
+        "raw_path": b"/testdatamodel/",
+        "query_string": b"stream=ndjson",
+        "headers": [(b"host", b"test")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("test", 80),
+    }
+    asyncio.run(app(scope, receive, send))
+    assert running[0] == 1
+    assert admission.snapshot("TestDataModel")["running"] == 0
@@ -0,0 +1,77 @@
+from conftest import *
+
+
+@pytest.fixture
+def people(client: TestClient) -> TestClient:
+    TestDataModel(id=2, name="Bob", age=40).save()
+    TestDataModel(id=3, name="Alice", age=20).save()
+    return client
+
+
+def test_count(people: TestClient):
+    """
+    Test that all entries are counted.
+    """
+    response = people.get("testdatamodel/count")
+    assert response.status_code == 200
+    assert response.json() == {"count": 3}
+
+
+def test_count_filters(people: TestClient):
+    """
+    Test that the entries are filtered like a search before counting.
+    """
+    assert people.get("testdatamodel/count", params={"name": "Alice"}).json() == {"count": 2}
+    assert people.get("testdatamodel/count", params={"age__gte": 30}).json() == {"count": 2}
+    assert people.get("testdatamodel/count", params={"age__gt": 40}).json() == {"count": 0}
+
+
+def test_count_invalid_filter(people: TestClient):
+    """
+    Test that invalid filters are rejected like in a search.
+    """
+    assert people.get("testdatamodel/count", params={"invalid": "1"}).status_code == 400
+    assert people.get("testdatamodel/count", params={"age": "old"}).status_code == 422
+
+
+def test_aggregate(people: TestClient):
+    """
+    Test that the aggregates of all matching entries are returned as a single group.
+    """
+    response = people.get("testdatamodel/aggregate", params={"agg": "sum:age,avg:age,min:age,max:name"})
+    assert response.status_code == 200
+    assert response.json() == [
+        {"count": 3, "sum_age": 90, "avg_age": 30.0, "min_age": 20, "max_name": "Bob"}
+    ]
+
+
+def test_aggregate_group_by(people: TestClient):
+    """
+    Test that the aggregates are computed per group, ordered by the group fields.
+    """
+    response = people.get(
+        "testdatamodel/aggregate", params={"group_by": "name", "agg": "sum:age", "age__lt": 40}
+    )
+    assert response.json() == [{"name": "Alice", "count": 2, "sum_age": 50}]
+    response = people.get("testdatamodel/aggregate", params={"group_by": "name"})
+    assert response.json() == [{"name": "Alice", "count": 2}, {"name": "Bob", "count": 1}]
+
+
+def test_aggregate_invalid(people: TestClient):
+    """
+    Test that unknown functions and fields are rejected.
+    """
+    response = people.get("testdatamodel/aggregate", params={"agg": "median:age"})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid aggregate: median:age"}
+    assert people.get("testdatamodel/aggregate", params={"agg": "sum:height"}).status_code == 400
+    assert people.get("testdatamodel/aggregate", params={"group_by": "height"}).status_code == 400
+
+
+def test_aggregate_async(async_client: TestClient):
+    """
+    Test that the aggregates are computed with the async engine.
+    """
+    response = async_client.get("testdatamodel/aggregate", params={"agg": "max:age"})
+    assert response.json() == [{"count": 1, "max_age": 30}]
+    assert async_client.get("testdatamodel/count").json() == {"count": 1}
@@ -0,0 +1,70 @@
+from inspect import iscoroutinefunction
+
+from conftest import *
+
+
+def test_async_handlers(async_client: TestClient):
+    """
+    Test that all routes are served by coroutine functions.
+    """
+    routes = [route for route in async_client.app.routes if hasattr(route, "endpoint")]
+    routes = [route for route in routes if route.path.startswith("/testdatamodel/")]
+    assert len(routes) == 11
+    assert all(iscoroutinefunction(route.endpoint) for route in routes)
+
+
+def test_async_create(async_client: TestClient):
+    """
+    Test that data is created with the async engine.
+    """
+    response = async_client.post("testdatamodel/", json={"name": "Bob", "age": 40})
+    assert response.status_code == 201
+    assert response.json() == {"id": 2, "name": "Bob", "age": 40}
+
+    response = async_client.post("testdatamodel/", json={"id": 1, "name": "Bob", "age": 40})
+    assert response.status_code == 409
+
+
+def test_async_get(async_client: TestClient):
+    """
+    Test that an entry is returned by its primary key with the async engine.
+    """
+    response = async_client.get("testdatamodel/1/")
+    assert response.status_code == 200
+    assert response.json() == {"id": 1, "name": "Alice", "age": 30}
+
+    response = async_client.get("testdatamodel/2/")
+    assert response.status_code == 404
+
+
+def test_async_save(async_client: TestClient):
+    """
+    Test that an existing entry is updated with the async engine.
+    """
+    response = async_client.post("testdatamodel/save", params={"id": 1, "age": 35})
+    assert response.status_code == 200
+    assert response.json() == {"id": 1, "name": "Alice", "age": 35}
+    assert TestDataModel.get_one(id=1) == TestDataModel(id=1, name="Alice", age=35)
+
+
+def test_async_delete(async_client: TestClient):
+    """
+    Test that an entry is deleted with the async engine.
+    """
+    response = async_client.delete("testdatamodel/1/")
+    assert response.status_code == 204
+    assert TestDataModel.get_all(id=1) == []
+
+
+def test_async_search(async_client: TestClient):
+    """
+    Test that entries are searched and streamed with the async engine.
+    """
+    TestDataModel(name="Bob", age=40).save()
+    response = async_client.get("testdatamodel/", params={"age": 40})
+    assert response.status_code == 200
+    assert response.json() == [{"id": 2, "name": "Bob", "age": 40}]
+
+    response = async_client.get("testdatamodel/", params={"stream": "json"})
+    assert response.status_code == 200
+    assert [entry["id"] for entry in response.json()] == [1, 2]
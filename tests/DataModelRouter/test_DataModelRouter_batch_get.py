@@ -0,0 +1,69 @@
+from data_model_router import LRUCache
+
+from conftest import *
+
+
+def test_batch_get_order(client: TestClient):
+    """
+    Test that the entries are returned in the order of the ids, with null for missing ids.
+    """
+    TestDataModel(name="Bob", age=40).save()
+    response = client.get("testdatamodel/batch", params={"ids": "2,3,1,2"})
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": 2, "name": "Bob", "age": 40},
+        None,
+        {"id": 1, "name": "Alice", "age": 30},
+        {"id": 2, "name": "Bob", "age": 40},
+    ]
+
+
+def test_batch_get_chunks(test_data_model: TestDataModel):
+    """
+    Test that large lists of ids are queried in chunks.
+    """
+    for age in range(4):
+        TestDataModel(name="Bob", age=age).save()
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, chunk_size=2))
+    response = TestClient(app).get("testdatamodel/batch", params={"ids": "5,4,3,2,1"})
+    assert response.status_code == 200
+    assert [entry["id"] for entry in response.json()] == [5, 4, 3, 2, 1]
+
+
+def test_batch_get_fields(client: TestClient):
+    """
+    Test that the entries can be narrowed to a subset of the fields.
+    """
+    response = client.get("testdatamodel/batch", params={"ids": "1,2", "fields": "name"})
+    assert response.status_code == 200
+    assert response.json() == [{"name": "Alice"}, None]
+
+
+def test_batch_get_invalid_id(client: TestClient):
+    """
+    Test that ids that can not be coerced to the type of the primary key are rejected.
+    """
+    response = client.get("testdatamodel/batch", params={"ids": "1,a"})
+    assert response.status_code == 422
+
+
+def test_batch_get_cache(test_data_model: TestDataModel):
+    """
+    Test that the entries are read through the cache and invalidated by writes.
+    """
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, cache=LRUCache()))
+    client = TestClient(app)
+    assert client.get("testdatamodel/batch", params={"ids": "1"}).json()[0]["age"] == 30
+    client.post("testdatamodel/save", params={"id": 1, "age": 31})
+    assert client.get("testdatamodel/batch", params={"ids": "1"}).json()[0]["age"] == 31
+
+
+def test_batch_get_async(async_client: TestClient):
+    """
+    Test that the batch route works with the async engine.
+    """
+    response = async_client.get("testdatamodel/batch", params={"ids": "1,2"})
+    assert response.status_code == 200
+    assert response.json() == [{"id": 1, "name": "Alice", "age": 30}, None]
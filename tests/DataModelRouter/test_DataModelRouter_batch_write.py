@@ -0,0 +1,102 @@
+from sqlalchemy import event
+
+from data_model_router import LRUCache
+
+from conftest import *
+
+
+def test_batch_write(client: TestClient, engine: Engine):
+    """
+    Test that mixed operations are executed in a single transaction with one statement per kind.
+    """
+    TestDataModel(id=2, name="Bob", age=40).save()
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda connection, cursor, statement, *args: statements.append(statement.split()[0]),
+    )
+    response = client.post(
+        "testdatamodel/batch",
+        json=[
+            {"op": "create", "data": {"name": "Carol", "age": 50}},
+            {"op": "save", "data": {"id": 1, "age": 31}},
+            {"op": "delete", "data": {"id": "2"}},
+            {"op": "save", "data": {"id": 7, "name": "Dave", "age": 60}},
+            {"op": "create", "data": {"id": 8, "name": "Eve", "age": 70}},
+        ],
+    )
+    assert statements == ["SELECT", "INSERT", "INSERT", "UPDATE", "DELETE"]
+    assert response.status_code == 200
+    assert [(result["status"], result["primary_key"]) for result in response.json()] == [
+        ("created", 3),
+        ("updated", 1),
+        ("deleted", 2),
+        ("created", 7),
+        ("created", 8),
+    ]
+    assert TestDataModel.get_one(id=1) == TestDataModel(id=1, name="Alice", age=31)
+    assert TestDataModel.get_one(id=2) is None
+    assert TestDataModel.get_one(id=3) == TestDataModel(id=3, name="Carol", age=50)
+
+
+def test_batch_write_rolled_back(client: TestClient):
+    """
+    Test that nothing is written if any operation fails.
+    """
+    response = client.post(
+        "testdatamodel/batch",
+        json=[
+            {"op": "save", "data": {"id": 1, "age": 31}},
+            {"op": "create", "data": {"id": 1, "name": "Alice", "age": 30}},
+            {"op": "delete", "data": {"id": 5}},
+            {"op": "create", "data": {"name": "Bob"}},
+        ],
+    )
+    assert response.status_code == 409
+    assert [result["status"] for result in response.json()] == [
+        "rolled_back",
+        "conflict",
+        "not_found",
+        "invalid",
+    ]
+    assert TestDataModel.get_one(id=1) == TestDataModel(id=1, name="Alice", age=30)
+    assert len(TestDataModel.get_all()) == 1
+
+
+def test_batch_write_status_codes(client: TestClient):
+    """
+    Test that the status code of a failed batch is that of its first failure.
+    """
+    response = client.post("testdatamodel/batch", json=[{"op": "create", "data": {"name": "Bob"}}])
+    assert response.status_code == 422
+    response = client.post("testdatamodel/batch", json=[{"op": "delete", "data": {"id": 5}}])
+    assert response.status_code == 404
+    response = client.post("testdatamodel/batch", json=[{"op": "delete", "data": {}}])
+    assert response.status_code == 422
+
+
+def test_batch_write_size(test_data_model: TestDataModel):
+    """
+    Test that batches with more than `batch_size` operations are rejected.
+    """
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, batch_size=2))
+    response = TestClient(app).post(
+        "testdatamodel/batch", json=[{"op": "create", "data": {"name": "Bob", "age": 40}}] * 3
+    )
+    assert response.status_code == 413
+
+
+def test_batch_write_cache(test_data_model: TestDataModel):
+    """
+    Test that the written entries and search results are invalidated.
+    """
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, cache=LRUCache()))
+    client = TestClient(app)
+    assert client.get("testdatamodel/1/").json()["age"] == 30
+    assert len(client.get("testdatamodel/", params={"age": 30}).json()) == 1
+    client.post("testdatamodel/batch", json=[{"op": "save", "data": {"id": 1, "age": 31}}])
+    assert client.get("testdatamodel/1/").json()["age"] == 31
+    assert client.get("testdatamodel/", params={"age": 30}).json() == []
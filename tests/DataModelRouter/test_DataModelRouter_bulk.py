@@ -0,0 +1,99 @@
+from conftest import *
+
+
+def test_bulk_create(client: TestClient):
+    """
+    Test that a JSON array of entries is created and the status of every entry is returned.
+    """
+    response = client.post(
+        "testdatamodel/bulk",
+        json=[{"name": "Bob", "age": 40}, {"id": 5, "name": "Carol", "age": 50}],
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"index": 0, "status": "created", "primary_key": 2, "detail": None},
+        {"index": 1, "status": "created", "primary_key": 5, "detail": None},
+    ]
+    assert TestDataModel.get_one(id=2) == TestDataModel(id=2, name="Bob", age=40)
+    assert TestDataModel.get_one(id=5) == TestDataModel(id=5, name="Carol", age=50)
+
+
+def test_bulk_conflict_and_invalid(client: TestClient):
+    """
+    Test that existing, duplicate and invalid entries are reported without writing them.
+    """
+    response = client.post(
+        "testdatamodel/bulk",
+        json=[
+            {"id": 1, "name": "Alice", "age": 35},
+            {"name": "Bob"},
+            {"id": 3, "name": "Carol", "age": 50},
+            {"id": 3, "name": "Dave", "age": 60},
+        ],
+    )
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()] == [
+        "conflict",
+        "invalid",
+        "created",
+        "conflict",
+    ]
+    assert TestDataModel.get_one(id=1) == TestDataModel(id=1, name="Alice", age=30)
+    assert TestDataModel.get_one(id=3) == TestDataModel(id=3, name="Carol", age=50)
+
+
+def test_bulk_upsert(client: TestClient):
+    """
+    Test that existing entries are updated when `upsert` is set.
+    """
+    response = client.post(
+        "testdatamodel/bulk",
+        params={"upsert": True},
+        json=[{"id": 1, "name": "Alice", "age": 35}, {"id": 2, "name": "Bob", "age": 40}],
+    )
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()] == ["updated", "created"]
+    assert TestDataModel.get_one(id=1) == TestDataModel(id=1, name="Alice", age=35)
+    assert TestDataModel.get_one(id=2) == TestDataModel(id=2, name="Bob", age=40)
+
+
+def test_bulk_ndjson_batches(test_data_model: TestDataModel):
+    """
+    Test that an NDJSON stream is written in multiple batches.
+    """
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, batch_size=2))
+    lines = [f'{{"name": "Bob", "age": {age}}}' for age in range(5)] + ["not json"]
+    response = TestClient(app).post(
+        "testdatamodel/bulk",
+        content="\n".join(lines),
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["primary_key"] for result in results[:5]] == [2, 3, 4, 5, 6]
+    assert results[5]["status"] == "invalid"
+    assert len(TestDataModel.get_all()) == 6
+
+
+def test_bulk_invalid_body(client: TestClient):
+    """
+    Test that an HTTPException is raised when the body is not a JSON array.
+    """
+    response = client.post("testdatamodel/bulk", json={"name": "Bob", "age": 40})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Body must be a JSON array"}
+
+
+def test_bulk_async(async_client: TestClient):
+    """
+    Test that entries are created and upserted with the async engine.
+    """
+    response = async_client.post(
+        "testdatamodel/bulk",
+        params={"upsert": True},
+        json=[{"id": 1, "name": "Alice", "age": 35}, {"name": "Bob", "age": 40}],
+    )
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()] == ["updated", "created"]
+    assert TestDataModel.get_one(id=1) == TestDataModel(id=1, name="Alice", age=35)
@@ -0,0 +1,87 @@
+from conftest import *
+from data_model_router import LRUCache
+
+
+@pytest.fixture
+def cached_client(test_data_model: TestDataModel):
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, cache=LRUCache()))
+    return TestClient(app)
+
+
+def update_behind_router(**values):
+    """
+    Update the entry with id 1 without going through the router, so the cache is not invalidated.
+    """
+    TestDataModel(id=1, **values).save()
+
+
+def test_cache_get(cached_client: TestClient):
+    """
+    Test that an entry is served from the cache after the first read.
+    """
+    assert cached_client.get("testdatamodel/1/").json()["age"] == 30
+    update_behind_router(name="Alice", age=31)
+    assert cached_client.get("testdatamodel/1/").json()["age"] == 30
+
+
+def test_cache_search(cached_client: TestClient):
+    """
+    Test that search results are cached independently of the order of the query parameters.
+    """
+    response = cached_client.get("testdatamodel/?age=30&name=Alice")
+    assert response.json() == [{"id": 1, "name": "Alice", "age": 30}]
+    update_behind_router(name="Alice", age=31)
+    response = cached_client.get("testdatamodel/?name=Alice&age=30")
+    assert response.json() == [{"id": 1, "name": "Alice", "age": 30}]
+
+
+def test_cache_invalidate_on_save(cached_client: TestClient):
+    """
+    Test that saving an entry invalidates the entry and the search results it appears in.
+    """
+    cached_client.get("testdatamodel/1/")
+    cached_client.get("testdatamodel/", params={"age": 30})
+    cached_client.post("testdatamodel/save", params={"id": 1, "age": 35})
+    assert cached_client.get("testdatamodel/1/").json()["age"] == 35
+    assert cached_client.get("testdatamodel/", params={"age": 30}).json() == []
+
+
+def test_cache_invalidate_only_matching_searches(cached_client: TestClient):
+    """
+    Test that search results whose filters do not match a written entry stay cached.
+    """
+    cached_client.get("testdatamodel/", params={"age": 50})
+    cached_client.get("testdatamodel/", params={"age": 40})
+    cached_client.post("testdatamodel/", json={"name": "Bob", "age": 40})
+    update_behind_router(name="Alice", age=50)
+    assert cached_client.get("testdatamodel/", params={"age": 50}).json() == []
+    assert cached_client.get("testdatamodel/", params={"age": 40}).json() == [
+        {"id": 2, "name": "Bob", "age": 40}
+    ]
+
+
+def test_cache_invalidate_on_delete(cached_client: TestClient):
+    """
+    Test that deleting an entry invalidates the entry and the search results it appears in.
+    """
+    cached_client.get("testdatamodel/1/")
+    cached_client.get("testdatamodel/")
+    cached_client.delete("testdatamodel/1/")
+    assert cached_client.get("testdatamodel/1/").status_code == 404
+    assert cached_client.get("testdatamodel/").json() == []
+
+
+def test_cache_invalidate_on_bulk(cached_client: TestClient):
+    """
+    Test that bulk upserts invalidate the written entries and the search results.
+    """
+    cached_client.get("testdatamodel/1/")
+    cached_client.get("testdatamodel/", params={"name": "Alice"})
+    cached_client.post(
+        "testdatamodel/bulk",
+        params={"upsert": True},
+        json=[{"id": 1, "name": "Bob", "age": 30}],
+    )
+    assert cached_client.get("testdatamodel/1/").json()["name"] == "Bob"
+    assert cached_client.get("testdatamodel/", params={"name": "Alice"}).json() == []
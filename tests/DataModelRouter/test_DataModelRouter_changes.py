@@ -0,0 +1,140 @@
+import asyncio
+import json
+from urllib.parse import urlencode
+
+from data_model_router import ChangeBroker
+
+from conftest import *
+
+
+@pytest.fixture
+def changes() -> ChangeBroker:
+    return ChangeBroker(buffer_size=3, history_size=5)
+
+
+@pytest.fixture
+def changes_client(test_data_model: TestDataModel, changes: ChangeBroker) -> TestClient:
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, changes=changes))
+    return TestClient(app)
+
+
+async def read_events(app: FastAPI, path: str, params: dict, count: int, headers: dict = {}) -> list[dict]:
+    """
+    Read the first `count` Server-Sent Events of the path, then disconnect.
+    """
+    body, disconnected = b"", asyncio.Event()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": urlencode(params).encode(),
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    requested = False
+
+    async def receive() -> dict:
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        nonlocal body
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200
+        if message["type"] == "http.response.body":
+            body += message.get("body", b"")
+            if body.count(b"\n\n") >= count:
+                disconnected.set()
+
+    await asyncio.wait_for(app(scope, receive, send), 5)
+    events = []
+    for block in body.decode().split("\n\n")[:count]:
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append({"id": fields.get("id"), "event": fields["event"], "data": json.loads(fields["data"])})
+    return events
+
+
+def test_changes_sse(changes_client: TestClient):
+    """
+    Test that creates, saves and deletes are streamed as Server-Sent Events with sequence numbers.
+    """
+    changes_client.post("testdatamodel/", json={"id": 2, "name": "Bob", "age": 40})
+    changes_client.post("testdatamodel/save", params={"id": 1, "age": 31})
+    changes_client.delete("testdatamodel/2/")
+    events = asyncio.run(read_events(changes_client.app, "/testdatamodel/changes", {"after": 0}, 3))
+    assert [(event["id"], event["event"]) for event in events] == [("1", "create"), ("2", "save"), ("3", "delete")]
+    assert events[1]["data"] == {
+        "seq": 2,
+        "model": "TestDataModel",
+        "op": "save",
+        "primary_key": 1,
+        "entry": {"id": 1, "name": "Alice", "age": 31},
+    }
+
+
+def test_changes_sse_filters_and_resume(changes_client: TestClient):
+    """
+    Test that the events are filtered like a search, matching old or new values, and resumed after Last-Event-ID.
+    """
+    changes_client.post("testdatamodel/", json={"id": 2, "name": "Bob", "age": 40})
+    changes_client.post("testdatamodel/save", params={"id": 1, "age": 31})
+    changes_client.post("testdatamodel/", json={"id": 3, "name": "Carol", "age": 30})
+    changes_client.post("testdatamodel/", json={"id": 4, "name": "Dave", "age": 50})
+    events = asyncio.run(
+        read_events(
+            changes_client.app, "/testdatamodel/changes", {"age__lte": 30}, 2, headers={"Last-Event-ID": "1"}
+        )
+    )
+    assert [event["data"]["primary_key"] for event in events] == [1, 3]
+
+
+def test_changes_sse_gone(changes_client: TestClient, changes: ChangeBroker):
+    """
+    Test that resuming after changes that are no longer kept returns 410.
+    """
+    for age in range(6):
+        changes_client.post("testdatamodel/save", params={"id": 1, "age": age})
+    assert changes_client.get("testdatamodel/changes", params={"after": 0}).status_code == 410
+    assert changes_client.get("testdatamodel/changes", params={"after": 7}).status_code == 410
+
+
+def test_changes_websocket(changes_client: TestClient, changes: ChangeBroker):
+    """
+    Test that the matching changes are sent over a WebSocket.
+    """
+    with changes_client.websocket_connect("testdatamodel/changes/ws?name=Bob") as websocket:
+        changes_client.post("testdatamodel/", json={"id": 2, "name": "Bob", "age": 40})
+        changes_client.post("testdatamodel/save", params={"id": 1, "age": 31})
+        changes_client.post("testdatamodel/save", params={"id": 2, "age": 41})
+        assert [websocket.receive_json()["op"] for _ in range(2)] == ["create", "save"]
+    with changes_client.websocket_connect("testdatamodel/changes/ws?after=9") as websocket:
+        assert websocket.receive()["code"] == 1008
+    assert changes.snapshot()["subscribers"] == 0
+
+
+def test_changes_batch_writes(changes_client: TestClient, changes: ChangeBroker):
+    """
+    Test that the bulk and batch routes publish their changes.
+    """
+    changes_client.post("testdatamodel/bulk", json=[{"id": 2, "name": "Bob", "age": 40}])
+    changes_client.post(
+        "testdatamodel/batch",
+        json=[{"op": "save", "data": {"id": 1, "age": 31}}, {"op": "delete", "data": {"id": 2}}],
+    )
+    assert [(event.op, event.primary_key) for event in changes.history] == [
+        ("create", 2),
+        ("save", 1),
+        ("delete", 2),
+    ]
+    assert changes.history[1].previous == {"id": 1, "name": "Alice", "age": 30}
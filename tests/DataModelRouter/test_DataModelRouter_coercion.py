@@ -0,0 +1,56 @@
+from sqlalchemy import event
+
+from conftest import *
+
+
+def capture_parameters(engine: Engine) -> list:
+    """
+    Returns a list that collects the parameters of every statement executed by the engine.
+    """
+    parameters = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda connection, cursor, statement, params, *args: parameters.append(params),
+    )
+    return parameters
+
+
+def test_get_binds_typed_primary_key(client: TestClient, engine: Engine):
+    """
+    Test that the primary key of the path is bound as an integer instead of a string.
+    """
+    parameters = capture_parameters(engine)
+    response = client.get("testdatamodel/1/")
+    assert response.status_code == 200
+    assert (1,) in parameters
+    assert ("1",) not in parameters
+
+
+def test_get_invalid_primary_key(client: TestClient):
+    """
+    Test that a primary key that is not an integer is rejected with 422 before querying.
+    """
+    response = client.get("testdatamodel/abc/")
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["path", "id"]
+
+
+def test_delete_invalid_primary_key(client: TestClient):
+    """
+    Test that deleting with a primary key that is not an integer is rejected with 422.
+    """
+    response = client.delete("testdatamodel/abc/")
+    assert response.status_code == 422
+    assert TestDataModel.get_one(id=1) is not None
+
+
+def test_save_binds_typed_values(client: TestClient, engine: Engine):
+    """
+    Test that the query parameters of a save are converted to the types of the fields.
+    """
+    parameters = capture_parameters(engine)
+    response = client.post("testdatamodel/save", params={"id": "1", "age": "35"})
+    assert response.status_code == 200
+    assert response.json() == {"id": 1, "name": "Alice", "age": 35}
+    assert all("1" not in params and "35" not in params for params in parameters)
@@ -0,0 +1,101 @@
+from sqlalchemy import event
+
+from conftest import *
+
+
+class SyncedModel(DataModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    updated: Optional[int] = Field(default=None, index=True)
+
+
+@pytest.fixture
+def delta_client(engine: Engine) -> TestClient:
+    SyncedModel.__engine__ = engine
+    app = FastAPI()
+    app.include_router(DataModelRouter(SyncedModel, watermark_field="updated", watermark_lag=0))
+    SyncedModel.metadata.create_all(bind=engine)
+    yield TestClient(app)
+    SyncedModel.metadata.drop_all(bind=engine)
+
+
+def test_delta(delta_client: TestClient):
+    """
+    Test that a delta returns the entries written and the primary keys deleted since the watermark.
+    """
+    delta_client.post("syncedmodel/", json={"name": "Alice"})
+    delta_client.post("syncedmodel/", json={"name": "Bob", "updated": 1})
+    delta = delta_client.get("syncedmodel/delta").json()
+    assert [entry["name"] for entry in delta["entries"]] == ["Alice", "Bob"]
+    assert delta["entries"][1]["updated"] > delta["entries"][0]["updated"] > 1
+    assert delta["deleted"] == []
+    assert delta["more"] is False
+
+    delta_client.post("syncedmodel/save", params={"id": 1, "name": "Alicia"})
+    delta_client.delete("syncedmodel/2/")
+    changes = delta_client.get("syncedmodel/delta", params={"since": delta["watermark"]}).json()
+    assert [entry["name"] for entry in changes["entries"]] == ["Alicia"]
+    assert changes["deleted"] == [2]
+    assert changes["watermark"] > delta["watermark"]
+    assert delta_client.get("syncedmodel/delta", params={"since": changes["watermark"]}).json()["entries"] == []
+
+
+def test_delta_pages(delta_client: TestClient):
+    """
+    Test that the changes are returned in pages of `limit` changes, ordered by their watermark.
+    """
+    delta_client.post("syncedmodel/bulk", json=[{"name": "Alice"}, {"name": "Bob"}, {"name": "Carol"}])
+    delta_client.post("syncedmodel/batch", json=[{"op": "delete", "data": {"id": 1}}])
+    names, deleted, since, more = [], [], 0, True
+    while more:
+        page = delta_client.get("syncedmodel/delta", params={"since": since, "limit": 1}).json()
+        names += [entry["name"] for entry in page["entries"]]
+        deleted += page["deleted"]
+        since, more = page["watermark"], page["more"]
+    assert names == ["Bob", "Carol"]
+    assert deleted == [1]
+
+
+def test_delta_lag(engine: Engine):
+    """
+    Test that changes younger than the watermark lag are not returned yet.
+    """
+    SyncedModel.__engine__ = engine
+    app = FastAPI()
+    app.include_router(DataModelRouter(SyncedModel, watermark_field="updated", watermark_lag=60))
+    SyncedModel.metadata.create_all(bind=engine)
+    client = TestClient(app)
+    client.post("syncedmodel/", json={"name": "Alice"})
+    delta = client.get("syncedmodel/delta").json()
+    updated = client.get("syncedmodel/1/").json()["updated"]
+    SyncedModel.metadata.drop_all(bind=engine)
+    assert delta["entries"] == []
+    assert delta["watermark"] < updated
+
+
+def test_delta_query_plan(delta_client: TestClient, engine: Engine):
+    """
+    Test that the entries and the tombstones are selected with a range scan on an index.
+    """
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda connection, cursor, statement, parameters, *args: statements.append((statement, parameters))
+        if statement.startswith("SELECT")
+        else None,
+    )
+    delta_client.get("syncedmodel/delta")
+    assert len(statements) == 2
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            plan = " ".join(row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+            assert "INDEX ix_syncedmodel" in plan and "TEMP B-TREE" not in plan
+
+
+def test_delta_invalid_field(test_data_model: TestDataModel):
+    """
+    Test that the watermark field must be a field of the model.
+    """
+    with pytest.raises(ValueError):
+        DataModelRouter(TestDataModel, watermark_field="updated")
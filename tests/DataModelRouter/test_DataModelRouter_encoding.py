@@ -0,0 +1,91 @@
+import gzip
+
+from conftest import *
+
+
+@pytest.fixture
+def negotiating_client(test_data_model: TestDataModel) -> TestClient:
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, negotiate_encoding=True))
+    return TestClient(app)
+
+
+@pytest.fixture
+def compressing_client(test_data_model: TestDataModel) -> TestClient:
+    for i in range(2, 50):
+        TestDataModel(id=i, name=f"Person {i}", age=i).save()
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, compression_minimum_size=500))
+    return TestClient(app)
+
+
+def test_negotiate_json(negotiating_client: TestClient):
+    """
+    Test that the read routes return JSON by default.
+    """
+    response = negotiating_client.get("testdatamodel/")
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["vary"] == "Accept"
+    assert response.json() == [{"id": 1, "name": "Alice", "age": 30}]
+    assert negotiating_client.get("testdatamodel/1/").json() == {"id": 1, "name": "Alice", "age": 30}
+    assert negotiating_client.get("testdatamodel/batch", params={"ids": "1,2"}).json() == [
+        {"id": 1, "name": "Alice", "age": 30},
+        None,
+    ]
+
+
+def test_negotiate_msgpack(negotiating_client: TestClient):
+    """
+    Test that the read routes return MessagePack if the Accept header prefers it.
+    """
+    msgpack = pytest.importorskip("msgpack")
+    headers = {"Accept": "application/msgpack, application/json;q=0.5"}
+    response = negotiating_client.get("testdatamodel/", headers=headers)
+    assert response.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(response.content) == [{"id": 1, "name": "Alice", "age": 30}]
+    response = negotiating_client.get("testdatamodel/1/", params={"fields": "name"}, headers=headers)
+    assert msgpack.unpackb(response.content) == {"name": "Alice"}
+    response = negotiating_client.get("testdatamodel/batch", params={"ids": "2,1"}, headers=headers)
+    assert msgpack.unpackb(response.content) == [None, {"id": 1, "name": "Alice", "age": 30}]
+
+
+def test_negotiate_json_preferred(negotiating_client: TestClient):
+    """
+    Test that JSON is returned if the Accept header prefers it over MessagePack.
+    """
+    headers = {"Accept": "application/json, application/msgpack;q=0.5"}
+    response = negotiating_client.get("testdatamodel/", headers=headers)
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_compression(compressing_client: TestClient):
+    """
+    Test that responses above the minimum size are compressed with gzip.
+    """
+    response = compressing_client.get("testdatamodel/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert len(response.json()) == 49
+
+
+def test_compression_brotli(compressing_client: TestClient):
+    """
+    Test that brotli is preferred over gzip if it is installed.
+    """
+    brotli = pytest.importorskip("brotli")
+    response = compressing_client.get(
+        "testdatamodel/", headers={"Accept-Encoding": "gzip, br"}, follow_redirects=False
+    )
+    assert response.headers["content-encoding"] == "br"
+
+
+def test_compression_minimum_size(compressing_client: TestClient):
+    """
+    Test that small responses and clients that do not accept a compression are served uncompressed.
+    """
+    response = compressing_client.get("testdatamodel/1/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    response = compressing_client.get("testdatamodel/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert len(response.json()) == 49
@@ -0,0 +1,131 @@
+from conftest import *
+
+
+class TestVersionedModel(DataModel, table=True):
+    id: Optional[int] = Field(primary_key=True)
+    name: str
+    version: int = 1
+
+
+@pytest.fixture
+def etag_client(test_data_model: TestDataModel):
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, etag=True))
+    return TestClient(app)
+
+
+@pytest.fixture
+def versioned_client(engine: Engine):
+    TestVersionedModel.__engine__ = engine
+    TestVersionedModel.metadata.create_all(bind=engine)
+    TestVersionedModel(id=1, name="Alice", version=1).save()
+    app = FastAPI()
+    app.include_router(
+        DataModelRouter(TestVersionedModel, etag=True, version_field="version")
+    )
+    yield TestClient(app)
+    TestVersionedModel.metadata.drop_all(bind=engine)
+
+
+def test_get_etag(etag_client: TestClient):
+    """
+    Test that an ETag is returned and a matching If-None-Match header results in a 304 response.
+    """
+    response = etag_client.get("testdatamodel/1/")
+    assert response.status_code == 200
+    assert response.json() == {"id": 1, "name": "Alice", "age": 30}
+    etag = response.headers["ETag"]
+
+    response = etag_client.get("testdatamodel/1/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    response = etag_client.get("testdatamodel/1/", headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+
+
+def test_search_etag(etag_client: TestClient):
+    """
+    Test that the ETag of a search changes when the result changes.
+    """
+    response = etag_client.get("testdatamodel/", params={"limit": 1})
+    assert response.headers["Link"]
+    etag = response.headers["ETag"]
+
+    response = etag_client.get(
+        "testdatamodel/", params={"limit": 1}, headers={"If-None-Match": f"W/{etag}"}
+    )
+    assert response.status_code == 304
+
+    TestDataModel(id=1, name="Alice", age=31).save()
+    response = etag_client.get(
+        "testdatamodel/", params={"limit": 1}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json() == [{"id": 1, "name": "Alice", "age": 31}]
+
+
+def test_save_if_match(etag_client: TestClient):
+    """
+    Test that an entry is only saved if the If-Match header matches the current entry.
+    """
+    etag = etag_client.get("testdatamodel/1/").headers["ETag"]
+
+    response = etag_client.post(
+        "testdatamodel/save", params={"id": 1, "age": 35}, headers={"If-Match": '"other"'}
+    )
+    assert response.status_code == 412
+    assert TestDataModel.get_one(id=1).age == 30
+
+    response = etag_client.post(
+        "testdatamodel/save", params={"id": 1, "age": 35}, headers={"If-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] == etag_client.get("testdatamodel/1/").headers["ETag"]
+
+    response = etag_client.post(
+        "testdatamodel/save", params={"id": 1, "age": 40}, headers={"If-Match": etag}
+    )
+    assert response.status_code == 412
+
+
+def test_delete_if_match(etag_client: TestClient):
+    """
+    Test that an entry is only deleted if the If-Match header matches the current entry.
+    """
+    response = etag_client.delete("testdatamodel/1/", headers={"If-Match": '"other"'})
+    assert response.status_code == 412
+    assert TestDataModel.get_one(id=1) is not None
+
+    response = etag_client.delete("testdatamodel/1/", headers={"If-Match": "*"})
+    assert response.status_code == 204
+    assert TestDataModel.get_one(id=1) is None
+
+
+def test_create_etag(etag_client: TestClient):
+    """
+    Test that the ETag of a created entry matches the ETag of a subsequent read.
+    """
+    response = etag_client.post("testdatamodel/", json={"name": "Bob", "age": 40})
+    assert response.status_code == 201
+    assert response.headers["ETag"] == etag_client.get("testdatamodel/2/").headers["ETag"]
+
+
+def test_version_etag(versioned_client: TestClient):
+    """
+    Test that the ETag is computed from the version field.
+    """
+    etag = versioned_client.get("testversionedmodel/1/").headers["ETag"]
+    TestVersionedModel(id=1, name="Bob", version=1).save()
+    response = versioned_client.get(
+        "testversionedmodel/1/", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    TestVersionedModel(id=1, name="Bob", version=2).save()
+    response = versioned_client.get(
+        "testversionedmodel/1/", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"id": 1, "name": "Bob", "version": 2}
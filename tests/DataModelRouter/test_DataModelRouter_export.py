@@ -0,0 +1,93 @@
+import io
+
+from conftest import *
+
+from data_model_router.router import ExportRouter
+
+
+@pytest.fixture
+def people(client: TestClient) -> TestClient:
+    TestDataModel(id=2, name="Bob, Jr.", age=40).save()
+    return client
+
+
+def test_export_csv(people: TestClient):
+    """
+    Test that the entries are exported as CSV by default, ordered by primary key.
+    """
+    response = people.get("testdatamodel/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="testdatamodel.csv"'
+    assert response.text == 'id,name,age\n1,Alice,30\n2,"Bob, Jr.",40\n'
+
+
+def test_export_filters(people: TestClient):
+    """
+    Test that the entries are filtered like a search.
+    """
+    response = people.get("testdatamodel/export", params={"age__gt": 30}, headers={"Accept": "text/csv"})
+    assert response.text == 'id,name,age\n2,"Bob, Jr.",40\n'
+    assert people.get("testdatamodel/export", params={"invalid": 1}).status_code == 400
+
+
+def test_export_chunks(test_data_model: TestDataModel):
+    """
+    Test that all entries are exported when they span several chunks.
+    """
+    for i in range(2, 8):
+        TestDataModel(id=i, name=f"Person {i}", age=i).save()
+    app = FastAPI()
+    app.include_router(ExportRouter(TestDataModel, chunk_size=3, prefix="/testdatamodel"))
+    lines = TestClient(app).get("testdatamodel/export").text.splitlines()
+    assert lines[0] == "id,name,age"
+    assert [line.split(",")[0] for line in lines[1:]] == [str(i) for i in range(1, 8)]
+
+
+def test_export_not_acceptable(people: TestClient):
+    """
+    Test that a 406 response is returned if no export format is acceptable.
+    """
+    response = people.get("testdatamodel/export", headers={"Accept": "application/xml"})
+    assert response.status_code == 406
+
+
+def test_export_async(async_client: TestClient):
+    """
+    Test that the entries are exported with the async engine.
+    """
+    response = async_client.get("testdatamodel/export", headers={"Accept": "text/*"})
+    assert response.text == "id,name,age\n1,Alice,30\n"
+
+
+def test_export_arrow(people: TestClient):
+    """
+    Test that the entries are exported as an Arrow IPC stream with the types of the model fields.
+    """
+    pyarrow = pytest.importorskip("pyarrow")
+    response = people.get(
+        "testdatamodel/export", headers={"Accept": "application/vnd.apache.arrow.stream"}
+    )
+    table = pyarrow.ipc.open_stream(response.content).read_all()
+    assert table.schema.types == [pyarrow.int64(), pyarrow.string(), pyarrow.int64()]
+    assert table.to_pylist() == [
+        {"id": 1, "name": "Alice", "age": 30},
+        {"id": 2, "name": "Bob, Jr.", "age": 40},
+    ]
+
+
+def test_export_parquet(test_data_model: TestDataModel):
+    """
+    Test that the entries are exported as a Parquet file with a row group per chunk.
+    """
+    parquet = pytest.importorskip("pyarrow.parquet")
+    for i in range(2, 8):
+        TestDataModel(id=i, name=f"Person {i}", age=i).save()
+    app = FastAPI()
+    app.include_router(ExportRouter(TestDataModel, chunk_size=3, prefix="/testdatamodel"))
+    response = TestClient(app).get(
+        "testdatamodel/export", headers={"Accept": "application/vnd.apache.parquet"}
+    )
+    parquet_file = parquet.ParquetFile(io.BytesIO(response.content))
+    assert parquet_file.metadata.num_row_groups == 3
+    assert parquet_file.read().column("id").to_pylist() == list(range(1, 8))
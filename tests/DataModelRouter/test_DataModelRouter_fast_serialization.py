@@ -0,0 +1,47 @@
+from conftest import *
+
+
+@pytest.fixture
+def fast_client(test_data_model: TestDataModel):
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, fast_serialization=True))
+    return TestClient(app)
+
+
+def test_fast_get(fast_client: TestClient):
+    """
+    Test that an entry is serialized in the order of the model.
+    """
+    response = fast_client.get("testdatamodel/1/")
+    assert response.status_code == 200
+    assert response.content == b'{"id":1,"name":"Alice","age":30}'
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_fast_search(fast_client: TestClient):
+    """
+    Test that search results and pagination headers are returned.
+    """
+    TestDataModel(name="Bob", age=40).save()
+    response = fast_client.get("testdatamodel/", params={"limit": 1})
+    assert response.status_code == 200
+    assert response.json() == [{"id": 1, "name": "Alice", "age": 30}]
+    assert "after=1" in response.headers["Link"]
+
+
+def test_fast_create(fast_client: TestClient):
+    """
+    Test that the created entry is returned with status 201.
+    """
+    response = fast_client.post("testdatamodel/", json={"name": "Bob", "age": 40})
+    assert response.status_code == 201
+    assert response.json() == {"id": 2, "name": "Bob", "age": 40}
+
+
+def test_fast_save(fast_client: TestClient):
+    """
+    Test that the saved entry is returned with the types of the model.
+    """
+    response = fast_client.post("testdatamodel/save", params={"id": 1, "age": 35})
+    assert response.status_code == 200
+    assert response.json() == {"id": 1, "name": "Alice", "age": 35}
@@ -0,0 +1,85 @@
+from sqlalchemy import event
+
+from conftest import *
+
+
+@pytest.fixture
+def statements(engine: Engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_get_fields(client: TestClient, statements: list):
+    """
+    Test that only the requested fields are selected and returned.
+    """
+    response = client.get("testdatamodel/1/", params={"fields": "name"})
+    assert response.status_code == 200
+    assert response.json() == {"name": "Alice"}
+    assert "age" not in statements[-1]
+
+
+def test_get_fields_not_found(client: TestClient):
+    """
+    Test that an HTTPException is raised when no entry matches the primary key.
+    """
+    response = client.get("testdatamodel/2/", params={"fields": "name"})
+    assert response.status_code == 404
+
+
+def test_search_fields(client: TestClient, statements: list):
+    """
+    Test that only the requested fields are selected and returned in the order of the model.
+    """
+    TestDataModel(name="Bob", age=40).save()
+    response = client.get("testdatamodel/", params={"fields": "age,id", "age": 40})
+    assert response.status_code == 200
+    assert response.content == b'[{"id":2,"age":40}]'
+    assert "name" not in statements[-1].split("WHERE")[0]
+
+
+def test_search_fields_pagination(client: TestClient):
+    """
+    Test that pagination works if the primary key is not requested.
+    """
+    TestDataModel(name="Bob", age=40).save()
+    response = client.get("testdatamodel/", params={"fields": "name", "limit": 1})
+    assert response.json() == [{"name": "Alice"}]
+    assert "after=1" in response.headers["Link"]
+
+
+def test_search_fields_stream(client: TestClient):
+    """
+    Test that only the requested fields are streamed.
+    """
+    response = client.get("testdatamodel/", params={"fields": "name", "stream": "ndjson"})
+    assert response.text == '{"name":"Alice"}\n'
+
+
+def test_invalid_fields(client: TestClient):
+    """
+    Test that an HTTPException is raised when a field is not part of the model.
+    """
+    response = client.get("testdatamodel/", params={"fields": "name,invalid"})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid field: invalid"}
+
+    response = client.get("testdatamodel/1/", params={"fields": "invalid"})
+    assert response.status_code == 400
+
+
+def test_fields_openapi(client: TestClient):
+    """
+    Test that the OpenAPI schema documents the fields parameter and the partial responses.
+    """
+    schema = client.get("openapi.json").json()
+    operation = schema["paths"]["/testdatamodel/{id}/"]["get"]
+    assert "fields" in [parameter["name"] for parameter in operation["parameters"]]
+    response_schema = operation["responses"]["200"]["content"]["application/json"]["schema"]
+    assert {"$ref": "#/components/schemas/TestDataModelPartial"} in response_schema["anyOf"]
@@ -0,0 +1,120 @@
+from data_model_router import LRUCache
+from sqlalchemy import event
+
+from conftest import *
+
+
+@pytest.fixture
+def people(client: TestClient):
+    TestDataModel(name="Bob", age=40).save()
+    TestDataModel(name="Carol", age=50).save()
+    TestDataModel(name="Carla", age=20).save()
+    return client
+
+
+def test_search_range(people: TestClient):
+    """
+    Test that range operators filter the entries.
+    """
+    response = people.get("testdatamodel/", params={"age__gte": 30, "age__lt": 50})
+    assert response.status_code == 200
+    assert [entry["name"] for entry in response.json()] == ["Alice", "Bob"]
+
+
+def test_search_in(people: TestClient):
+    """
+    Test that `__in` filters by a comma separated list of values.
+    """
+    response = people.get("testdatamodel/", params={"id__in": "1,3"})
+    assert response.status_code == 200
+    assert [entry["name"] for entry in response.json()] == ["Alice", "Carol"]
+
+
+def test_search_between(people: TestClient):
+    """
+    Test that `__between` includes both bounds.
+    """
+    response = people.get("testdatamodel/", params={"age__between": "20,40"})
+    assert response.status_code == 200
+    assert [entry["name"] for entry in response.json()] == ["Alice", "Bob", "Carla"]
+
+
+def test_search_prefix(people: TestClient):
+    """
+    Test that `__prefix` is compiled to a range on the column instead of a LIKE.
+    """
+    statements = []
+    event.listen(
+        TestDataModel.__engine__,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    response = people.get("testdatamodel/", params={"name__prefix": "Car"})
+    assert response.status_code == 200
+    assert [entry["name"] for entry in response.json()] == ["Carol", "Carla"]
+    assert "LIKE" not in statements[-1]
+
+
+def test_search_ne(people: TestClient):
+    """
+    Test that `__ne` excludes the value.
+    """
+    response = people.get("testdatamodel/", params={"name__ne": "Alice"})
+    assert response.status_code == 200
+    assert [entry["name"] for entry in response.json()] == ["Bob", "Carol", "Carla"]
+
+
+def test_search_invalid_operator(client: TestClient):
+    """
+    Test that an unknown operator is rejected like an unknown field.
+    """
+    response = client.get("testdatamodel/", params={"age__like": 30})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid query parameter: age__like"}
+
+
+def test_search_invalid_value(client: TestClient):
+    """
+    Test that a value that can not be coerced to the type of the field is rejected.
+    """
+    response = client.get("testdatamodel/", params={"age__gte": "old"})
+    assert response.status_code == 422
+
+
+def test_search_order_by(people: TestClient):
+    """
+    Test that `order_by` sorts the entries, descending with a `-` prefix.
+    """
+    response = people.get("testdatamodel/", params={"order_by": "-age", "limit": 3})
+    assert response.status_code == 200
+    assert [entry["age"] for entry in response.json()] == [50, 40, 30]
+    assert "Link" not in response.headers
+
+
+def test_search_order_by_invalid(client: TestClient):
+    """
+    Test that ordering by an unknown field is rejected.
+    """
+    response = client.get("testdatamodel/", params={"order_by": "height"})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid field: height"}
+
+
+def test_search_order_by_with_after(client: TestClient):
+    """
+    Test that the keyset parameters can not be combined with another order than by primary key.
+    """
+    response = client.get("testdatamodel/", params={"order_by": "age", "after": 1})
+    assert response.status_code == 400
+
+
+def test_search_cache_range(test_data_model: TestDataModel):
+    """
+    Test that a write invalidates cached searches whose range filter matches the written row.
+    """
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, cache=LRUCache()))
+    client = TestClient(app)
+    assert len(client.get("testdatamodel/", params={"age__gte": 30}).json()) == 1
+    client.post("testdatamodel/save", params={"name": "Bob", "age": 40})
+    assert len(client.get("testdatamodel/", params={"age__gte": 30}).json()) == 2
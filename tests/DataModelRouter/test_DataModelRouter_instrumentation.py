@@ -0,0 +1,77 @@
+from data_model_router import Instrumentation
+
+from conftest import *
+
+
+@pytest.fixture
+def instrumentation(test_data_model: TestDataModel) -> Instrumentation:
+    return Instrumentation()
+
+
+@pytest.fixture
+def instrumented_client(instrumentation: Instrumentation) -> TestClient:
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, instrumentation=instrumentation))
+    app.include_router(instrumentation.router)
+    return TestClient(app)
+
+
+def test_server_timing(instrumented_client: TestClient):
+    """
+    Test that the phases of a request are returned in the Server-Timing header.
+    """
+    response = instrumented_client.get("testdatamodel/", params={"age__gte": 30})
+    assert response.status_code == 200
+    phases = [entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")]
+    assert {"parse", "connect", "query", "hydrate", "framework", "total"} <= set(phases)
+
+
+def test_server_timing_async(instrumentation: Instrumentation):
+    """
+    Test that the phases are recorded by the async handlers as well.
+    """
+    app = FastAPI()
+    app.include_router(
+        DataModelRouter(
+            TestDataModel,
+            async_engine=create_async_engine("sqlite+aiosqlite:///database.db"),
+            instrumentation=instrumentation,
+        )
+    )
+    with TestClient(app) as client:
+        response = client.get("testdatamodel/1/")
+    assert "query;dur=" in response.headers["Server-Timing"]
+
+
+def test_server_timing_disabled(test_data_model: TestDataModel):
+    """
+    Test that the Server-Timing header can be disabled while the metrics are still recorded.
+    """
+    instrumentation = Instrumentation(server_timing=False)
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, instrumentation=instrumentation))
+    response = TestClient(app).get("testdatamodel/1/")
+    assert "Server-Timing" not in response.headers
+    assert 'route="get",phase="total"' in instrumentation.render()
+
+
+def test_metrics_endpoint(instrumented_client: TestClient):
+    """
+    Test that the phases are exported as Prometheus histograms per model, route and phase.
+    """
+    instrumented_client.get("testdatamodel/1/")
+    instrumented_client.post("testdatamodel/save", params={"id": 1, "age": 31})
+    response = instrumented_client.get("metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE data_model_router_phase_seconds histogram" in response.text
+    assert 'data_model_router_phase_seconds_count{model="TestDataModel",route="get",phase="total"} 1' in response.text
+    assert 'model="TestDataModel",route="save",phase="commit"' in response.text
+    assert 'data_model_router_pool_checked_out{model="TestDataModel"} 0' in response.text
+
+
+def test_not_instrumented(client: TestClient):
+    """
+    Test that routes without instrumentation do not return timings.
+    """
+    assert "Server-Timing" not in client.get("testdatamodel/1/").headers
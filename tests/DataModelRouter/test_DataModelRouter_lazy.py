@@ -0,0 +1,66 @@
+from data_model_router import Instrumentation
+from data_model_router.routing import LazyRoute
+
+from conftest import *
+
+
+@pytest.fixture
+def lazy_app(test_data_model: TestDataModel, test_data_model2: TestDataModel2) -> FastAPI:
+    app = FastAPI()
+    app.include_router(DataModelRouter.for_models([TestDataModel, TestDataModel2]))
+    return app
+
+
+def test_for_models(lazy_app: FastAPI):
+    """
+    Test that a router created for several models serves the routes of every model.
+    """
+    client = TestClient(lazy_app)
+    assert client.get("testdatamodel/1/").json() == {"id": 1, "name": "Alice", "age": 30}
+    assert client.get("testdatamodel2/1/").json() == {"id": 1, "country": "USA", "city": "New York"}
+    response = client.post("testdatamodel/", json={"name": "Bob", "age": 25})
+    assert response.status_code == 201
+    assert len(client.get("testdatamodel/").json()) == 2
+
+
+def test_routes_built_on_first_request(lazy_app: FastAPI):
+    """
+    Test that the lazy routes are only built when they handle their first request.
+    """
+    routes = [route for route in lazy_app.routes if isinstance(route, LazyRoute)]
+    assert len(routes) == 22
+    assert not any(route._built for route in routes)
+
+    TestClient(lazy_app).get("testdatamodel/1/")
+    built = [route for route in routes if route._built]
+    assert [(route.path, route.methods) for route in built] == [("/testdatamodel/{id}/", {"GET"})]
+
+
+def test_openapi(lazy_app: FastAPI):
+    """
+    Test that the OpenAPI schema of lazy routes matches the one of eagerly built routes.
+    """
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel))
+    app.include_router(DataModelRouter(TestDataModel2))
+    assert lazy_app.openapi() == app.openapi()
+
+
+def test_lazy_validation(lazy_app: FastAPI):
+    """
+    Test that lazy routes validate the requests like eagerly built routes.
+    """
+    response = TestClient(lazy_app).post("testdatamodel/", json={"name": "Bob"})
+    assert response.status_code == 422
+
+
+def test_lazy_instrumentation(test_data_model: TestDataModel):
+    """
+    Test that the routes of lazy routers are instrumented.
+    """
+    instrumentation = Instrumentation()
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, lazy=True, instrumentation=instrumentation))
+    response = TestClient(app).get("testdatamodel/1/")
+    assert "query;dur=" in response.headers["Server-Timing"]
+    assert isinstance(app.routes[-1], LazyRoute)
@@ -0,0 +1,52 @@
+from sqlalchemy.pool import QueuePool
+
+from conftest import *
+
+
+def test_pool_options(test_data_model: TestDataModel):
+    """
+    Test that the pool options configure the engine serving the routes.
+    """
+    router = DataModelRouter(
+        TestDataModel, pool_size=3, max_overflow=1, pool_pre_ping=True, pool_recycle=60
+    )
+    pool = TestDataModel.__engine__.pool
+    assert isinstance(pool, QueuePool)
+    assert pool.size() == 3
+    assert pool._max_overflow == 1
+    assert pool._pre_ping
+    assert pool._recycle == 60
+    app = FastAPI()
+    app.include_router(router)
+    assert TestClient(app).get("testdatamodel/1/").status_code == 200
+
+
+def test_pool_metrics(client: TestClient):
+    """
+    Test that every request checks out one connection and records its wait.
+    """
+    metrics = DataModelRouter(TestDataModel).pool_metrics
+    checkouts = metrics.checkouts
+    client.get("testdatamodel/1/")
+    client.post("testdatamodel/save", params={"id": 1, "age": 31})
+    snapshot = metrics.snapshot()
+    assert snapshot["checkouts"] == checkouts + 2
+    assert snapshot["checked_out"] == 0
+    assert snapshot["wait_seconds_max"] >= 0
+
+
+def test_pool_exhausted(test_data_model: TestDataModel):
+    """
+    Test that a request is answered with 503 when no connection is available in time.
+    """
+    router = DataModelRouter(TestDataModel, pool_size=1, max_overflow=0, pool_timeout=0.01)
+    app = FastAPI()
+    app.include_router(router)
+    connection = TestDataModel.__engine__.connect()
+    try:
+        response = TestClient(app).get("testdatamodel/1/")
+    finally:
+        connection.close()
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert router.pool_metrics.timeouts == 1
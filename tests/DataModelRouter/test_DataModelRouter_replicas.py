@@ -0,0 +1,122 @@
+import asyncio
+
+from data_model_router import Instrumentation
+
+from conftest import *
+
+
+def create_replica(path: str, age: int) -> Engine:
+    """
+    Create a SQLite file standing in for a replica, whose copy of Alice has the given age.
+    """
+    replica = create_engine(f"sqlite:///{path}")
+    TestDataModel.metadata.create_all(bind=replica)
+    with replica.begin() as connection:
+        connection.execute(TestDataModel.__table__.insert(), [{"id": 1, "name": "Alice", "age": age}])
+    return replica
+
+
+@pytest.fixture
+def replicas(tmp_path) -> list[Engine]:
+    return [create_replica(tmp_path / "replica1.db", 31), create_replica(tmp_path / "replica2.db", 32)]
+
+
+def test_replicas(test_data_model: TestDataModel, replicas: list[Engine]):
+    """
+    Test that reads are sent to the replicas in turn and writes to the primary.
+    """
+    router = DataModelRouter(TestDataModel, read_engines=replicas, read_your_writes_seconds=0)
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    assert [client.get("testdatamodel/1/").json()["age"] for _ in range(3)] == [31, 32, 31]
+    assert [entry["age"] for entry in client.get("testdatamodel/").json()] == [32]
+    assert client.get("testdatamodel/count").json() == {"count": 1}
+    response = client.post("testdatamodel/", json={"id": 2, "name": "Bob", "age": 40})
+    assert response.status_code == 201
+    assert "set-cookie" not in response.headers
+    assert TestDataModel.get_one(id=2) is not None
+    assert client.get("testdatamodel/2/").status_code == 404
+    assert router.replicas.snapshot() == {"replica_reads": 6, "pinned_reads": 0, "in_flight": 0}
+
+
+def test_replicas_read_your_writes(test_data_model: TestDataModel, replicas: list[Engine]):
+    """
+    Test that the reads of a client that wrote are pinned to the primary, while other clients read the replicas.
+    """
+    router = DataModelRouter(TestDataModel, read_engines=replicas)
+    app = FastAPI()
+    app.include_router(router)
+    writer, reader = TestClient(app), TestClient(app)
+    response = writer.post("testdatamodel/save", params={"id": 1, "age": 35})
+    assert "max-age=5" in response.headers["set-cookie"].lower()
+    assert writer.get("testdatamodel/1/").json()["age"] == 35
+    assert writer.get("testdatamodel/", params={"stream": "ndjson"}).text.count('"age":35') == 1
+    assert reader.get("testdatamodel/1/").json()["age"] == 31
+    assert router.replicas.pinned_reads == 2
+
+
+def test_replicas_streaming(test_data_model: TestDataModel, replicas: list[Engine]):
+    """
+    Test that streamed reads fetch all pages from the same replica.
+    """
+    for replica in replicas:
+        with replica.begin() as connection:
+            connection.execute(
+                TestDataModel.__table__.insert(),
+                [{"id": i, "name": f"Person {i}", "age": i} for i in range(2, 10)],
+            )
+    router = DataModelRouter(TestDataModel, read_engines=replicas, chunk_size=3)
+    app = FastAPI()
+    app.include_router(router)
+    response = TestClient(app).get("testdatamodel/", params={"stream": "ndjson"})
+    assert len(response.text.splitlines()) == 9
+    assert '"age":31' in response.text
+    assert router.replicas.snapshot()["in_flight"] == 0
+
+
+def test_replicas_async(test_data_model: TestDataModel, tmp_path):
+    """
+    Test that async routers read from async replicas with the least reads in flight.
+    """
+    create_replica(tmp_path / "replica1.db", 31)
+    async_engine = create_async_engine("sqlite+aiosqlite:///database.db")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica1.db'}")
+    router = DataModelRouter(
+        TestDataModel, async_engine=async_engine, read_engines=[replica], replica_strategy="least_connections"
+    )
+    app = FastAPI()
+    app.include_router(router)
+
+    async def get_and_dispose():
+        try:
+            with TestClient(app) as client:
+                return client.get("testdatamodel/1/").json()
+        finally:
+            await async_engine.dispose()
+            await replica.dispose()
+
+    assert asyncio.run(get_and_dispose()) == {"id": 1, "name": "Alice", "age": 31}
+
+
+def test_replicas_invalid_engines(test_data_model: TestDataModel, replicas: list[Engine]):
+    """
+    Test that sync replicas can not be combined with an async engine.
+    """
+    with pytest.raises(ValueError):
+        DataModelRouter(
+            TestDataModel,
+            async_engine=create_async_engine("sqlite+aiosqlite:///database.db"),
+            read_engines=replicas,
+        )
+
+
+def test_replicas_metrics(test_data_model: TestDataModel, replicas: list[Engine]):
+    """
+    Test that the replica metrics are exported by the instrumentation.
+    """
+    instrumentation = Instrumentation()
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, read_engines=replicas, instrumentation=instrumentation))
+    TestClient(app).get("testdatamodel/1/")
+    assert 'data_model_router_replicas_replica_reads{model="TestDataModel"} 1' in instrumentation.render()
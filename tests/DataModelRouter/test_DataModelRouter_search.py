@@ -1,3 +1,5 @@
+import json
+
 from conftest import *
 
 
@@ -39,3 +41,65 @@ def test_multiple_models(client: TestClient):
     response = client.get("testdatamodel2/", params={"city": "New York"})
     assert response.status_code == 200
     assert response.json() == [{"id": 1, "country": "USA", "city": "New York"}]
+
+
+def test_search_limit(client: TestClient):
+    """
+    Test that the number of returned entries is limited and a link to the next page is set.
+    """
+    TestDataModel(name="Bob", age=40).save()
+    TestDataModel(name="Carol", age=50).save()
+    response = client.get("testdatamodel/", params={"limit": 2})
+    assert response.status_code == 200
+    assert [entry["id"] for entry in response.json()] == [1, 2]
+    assert "after=2" in response.headers["Link"]
+
+
+def test_search_after(client: TestClient):
+    """
+    Test that only entries with a primary key greater than `after` are returned.
+    """
+    TestDataModel(name="Bob", age=40).save()
+    TestDataModel(name="Carol", age=30).save()
+    response = client.get("testdatamodel/", params={"age": 30, "after": 1, "limit": 2})
+    assert response.status_code == 200
+    assert response.json() == [{"id": 3, "name": "Carol", "age": 30}]
+    assert "Link" not in response.headers
+
+
+def test_search_stream_ndjson(client: TestClient):
+    """
+    Test that entries are streamed as NDJSON across multiple chunks.
+    """
+    for age in range(5):
+        TestDataModel(name="Bob", age=age).save()
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, chunk_size=2))
+    response = TestClient(app).get("testdatamodel/", params={"stream": "ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [1, 2, 3, 4, 5, 6]
+
+
+def test_search_stream_json(client: TestClient):
+    """
+    Test that entries are streamed as a JSON array, respecting `limit`.
+    """
+    TestDataModel(name="Bob", age=40).save()
+    TestDataModel(name="Carol", age=50).save()
+    response = client.get("testdatamodel/", params={"stream": "json", "limit": 2})
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": 1, "name": "Alice", "age": 30},
+        {"id": 2, "name": "Bob", "age": 40},
+    ]
+
+
+def test_search_stream_empty(client: TestClient):
+    """
+    Test that an empty JSON array is streamed when no entries match.
+    """
+    response = client.get("testdatamodel/", params={"stream": "json", "id": 2})
+    assert response.status_code == 200
+    assert response.json() == []
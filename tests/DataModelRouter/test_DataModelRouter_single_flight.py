@@ -0,0 +1,128 @@
+import asyncio
+
+import httpx
+from sqlalchemy import event
+
+from data_model_router import Instrumentation
+
+from conftest import *
+
+
+def count_queries(engine: Engine) -> list:
+    """
+    Collect the SELECT statements executed by the engine.
+    """
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda connection, cursor, statement, *args: statements.append(statement)
+        if statement.startswith("SELECT")
+        else None,
+    )
+    return statements
+
+
+async def get_all(app: FastAPI, requests: list[tuple[str, dict]]) -> list[httpx.Response]:
+    """
+    Send the requests concurrently.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(*(client.get(url, **kwargs) for url, kwargs in requests))
+
+
+def test_single_flight(test_data_model: TestDataModel, engine: Engine):
+    """
+    Test that concurrent identical reads share a single query and its response.
+    """
+    router = DataModelRouter(TestDataModel, single_flight=True)
+    app = FastAPI()
+    app.include_router(router)
+    statements = count_queries(engine)
+    responses = asyncio.run(get_all(app, [("/testdatamodel/1/", {})] * 10))
+    assert [response.json() for response in responses] == [{"id": 1, "name": "Alice", "age": 30}] * 10
+    assert len(statements) == 1
+    assert router.single_flight.snapshot() == {"calls": 10, "executions": 1, "coalesced": 9, "in_flight": 0}
+
+
+def test_single_flight_normalized_parameters(test_data_model: TestDataModel, engine: Engine):
+    """
+    Test that searches with the same query parameters in another order are coalesced, but other searches are not.
+    """
+    router = DataModelRouter(TestDataModel, single_flight=True)
+    app = FastAPI()
+    app.include_router(router)
+    statements = count_queries(engine)
+    responses = asyncio.run(
+        get_all(
+            app,
+            [
+                ("/testdatamodel/", {"params": {"name": "Alice", "age": 30}}),
+                ("/testdatamodel/", {"params": {"age": 30, "name": "Alice"}}),
+                ("/testdatamodel/", {"params": {"age": 31}}),
+            ],
+        )
+    )
+    assert [len(response.json()) for response in responses] == [1, 1, 0]
+    assert len(statements) == 2
+    assert router.single_flight.coalesced == 1
+
+
+def test_single_flight_errors(test_data_model: TestDataModel):
+    """
+    Test that the error of a coalesced read is returned to every request.
+    """
+    router = DataModelRouter(TestDataModel, single_flight=True)
+    app = FastAPI()
+    app.include_router(router)
+    responses = asyncio.run(get_all(app, [("/testdatamodel/2/", {})] * 3))
+    assert [response.status_code for response in responses] == [404] * 3
+    assert router.single_flight.executions == 1
+
+
+def test_single_flight_async(test_data_model: TestDataModel):
+    """
+    Test that reads of async handlers are coalesced.
+    """
+    async_engine = create_async_engine("sqlite+aiosqlite:///database.db")
+    router = DataModelRouter(TestDataModel, async_engine=async_engine, single_flight=True)
+    app = FastAPI()
+    app.include_router(router)
+
+    async def get_and_dispose() -> list[httpx.Response]:
+        try:
+            return await get_all(app, [("/testdatamodel/", {})] * 5)
+        finally:
+            await async_engine.dispose()
+
+    responses = asyncio.run(get_and_dispose())
+    assert all(response.json() == [{"id": 1, "name": "Alice", "age": 30}] for response in responses)
+    assert router.single_flight.executions == 1
+    assert router.single_flight.coalesced == 4
+
+
+def test_single_flight_after_write(test_data_model: TestDataModel):
+    """
+    Test that a read after a write is not served from a read that started before the write.
+    """
+    router = DataModelRouter(TestDataModel, single_flight=True)
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    assert client.get("testdatamodel/1/").json()["age"] == 30
+    generation = router.single_flight.generation
+    client.post("testdatamodel/save", params={"id": 1, "age": 31})
+    assert router.single_flight.generation == generation + 1
+    assert client.get("testdatamodel/1/").json()["age"] == 31
+
+
+def test_single_flight_metrics(test_data_model: TestDataModel):
+    """
+    Test that the single-flight metrics are exported by the instrumentation.
+    """
+    instrumentation = Instrumentation()
+    app = FastAPI()
+    app.include_router(DataModelRouter(TestDataModel, single_flight=True, instrumentation=instrumentation))
+    TestClient(app).get("testdatamodel/1/")
+    assert 'data_model_router_single_flight_executions{model="TestDataModel"} 1' in instrumentation.render()
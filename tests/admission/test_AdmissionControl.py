@@ -0,0 +1,56 @@
+import asyncio
+
+from data_model_router.admission import ConcurrencyLimit, MemoryRateLimitStore
+
+
+def test_token_bucket():
+    """
+    Test that a client can send `burst` requests at once and then waits for the bucket to refill.
+    """
+    store = MemoryRateLimitStore()
+
+    async def main() -> list[float]:
+        return [await store.acquire("client", rate=1, burst=2) for _ in range(3)]
+
+    waits = asyncio.run(main())
+    assert waits[:2] == [0, 0]
+    assert 0.9 < waits[2] <= 1
+
+
+def test_token_bucket_per_key():
+    """
+    Test that every key has a bucket of its own and that the least recently used bucket is dropped.
+    """
+    store = MemoryRateLimitStore(maxsize=2)
+
+    async def main() -> list[float]:
+        return [await store.acquire(key, rate=1, burst=1) for key in ("a", "b", "c", "a")]
+
+    assert asyncio.run(main()) == [0, 0, 0, 0]
+    assert len(store) == 2
+
+
+def test_concurrency_limit():
+    """
+    Test that requests over the limit wait in order of arrival and time out when no slot is released.
+    """
+    limit = ConcurrencyLimit(1)
+
+    async def main() -> list:
+        assert await limit.acquire(0.1)
+        waiting = asyncio.ensure_future(limit.acquire(1))
+        await asyncio.sleep(0)
+        timed_out = await limit.acquire(0.01)
+        limit.release()
+        admitted = await waiting
+        limit.release()
+        return [timed_out, admitted, limit.active, limit.waiting]
+
+    assert asyncio.run(main()) == [False, True, 0, 0]
+
+
+def test_concurrency_limit_zero():
+    """
+    Test that a limit of 0 rejects requests without waiting.
+    """
+    assert asyncio.run(ConcurrencyLimit(0).acquire(10)) is False
@@ -0,0 +1,54 @@
+from time import sleep
+
+from data_model_router.cache import LRUCache
+
+
+def test_get_set():
+    """
+    Test that stored values are returned and misses return None.
+    """
+    cache = LRUCache()
+    cache.set(("a",), 1)
+    assert cache.get(("a",)) == 1
+    assert cache.get(("b",)) is None
+
+
+def test_lru_eviction():
+    """
+    Test that the least recently used entry is evicted when the cache is full.
+    """
+    cache = LRUCache(maxsize=2)
+    cache.set(("a",), 1)
+    cache.set(("b",), 2)
+    cache.get(("a",))
+    cache.set(("c",), 3)
+    assert cache.get(("a",)) == 1
+    assert cache.get(("b",)) is None
+    assert cache.get(("c",)) == 3
+    assert len(cache) == 2
+
+
+def test_ttl_expiry():
+    """
+    Test that entries expire after their time to live.
+    """
+    cache = LRUCache(ttl=0.01)
+    cache.set(("a",), 1)
+    sleep(0.02)
+    assert cache.get(("a",)) is None
+    assert len(cache) == 0
+
+
+def test_delete_and_delete_matching():
+    """
+    Test that entries are removed by key and by predicate.
+    """
+    cache = LRUCache()
+    cache.set(("model", "entry", "1"), 1)
+    cache.set(("model", "search", ()), [1])
+    cache.set(("other", "search", ()), [2])
+    cache.delete(("model", "entry", "1"))
+    cache.delete_matching(lambda key: key[0] == "model")
+    assert cache.get(("model", "entry", "1")) is None
+    assert cache.get(("model", "search", ())) is None
+    assert cache.get(("other", "search", ())) == [2]
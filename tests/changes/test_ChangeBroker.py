@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from data_model_router.changes import ChangeBroker
+from data_model_router.filters import Filter
+
+
+def test_subscribe_filters():
+    """
+    Test that subscribers receive the events of their model whose new or old values match their filters.
+    """
+    broker = ChangeBroker()
+
+    async def main() -> list:
+        subscription = broker.subscribe("Person", [Filter("age", "eq", 30)])
+        broker.publish("Person", "create", 1, {"id": 1, "age": 30})
+        broker.publish("Person", "create", 2, {"id": 2, "age": 40})
+        broker.publish("Pet", "create", 1, {"id": 1, "age": 30})
+        broker.publish("Person", "save", 1, {"id": 1, "age": 31}, {"id": 1, "age": 30})
+        return [(await subscription.get()).seq for _ in range(2)]
+
+    assert asyncio.run(main()) == [1, 4]
+
+
+def test_overflow():
+    """
+    Test that a subscriber that falls more than `buffer_size` events behind is dropped after its buffered events.
+    """
+    broker = ChangeBroker(buffer_size=2)
+
+    async def main() -> list:
+        subscription = broker.subscribe("Person")
+        for key in range(4):
+            broker.publish("Person", "create", key, {"id": key})
+        await asyncio.sleep(0)
+        return [event and event.seq for event in [await subscription.get() for _ in range(3)]]
+
+    assert asyncio.run(main()) == [1, 2, None]
+    assert broker.snapshot() == {"seq": 4, "subscribers": 0, "dropped": 1}
+
+
+def test_resume():
+    """
+    Test that subscribers resume after a sequence number while it is kept.
+    """
+    broker = ChangeBroker(history_size=3)
+    for key in range(5):
+        broker.publish("Person", "create", key, {"id": key})
+
+    async def main(after: int) -> list:
+        subscription = broker.subscribe("Person", after=after)
+        return list(subscription.backlog)
+
+    assert [event.seq for event in asyncio.run(main(2))] == [3, 4, 5]
+    assert asyncio.run(main(5)) == []
+    with pytest.raises(HTTPException):
+        asyncio.run(main(1))
+    with pytest.raises(HTTPException):
+        asyncio.run(main(6))
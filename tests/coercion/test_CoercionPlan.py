@@ -0,0 +1,46 @@
+from typing import Optional
+
+import pytest
+from data_model_orm import DataModel, Field
+from fastapi import HTTPException
+
+from data_model_router.coercion import get_coercion_plan, primary_key_type
+
+
+class CoercionModel(DataModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    score: float | None = None
+
+
+def test_coerce():
+    """
+    Test that the values are converted to the types of their fields and missing fields are left out.
+    """
+    plan = get_coercion_plan(CoercionModel)
+    assert plan.coerce({"id": "1", "score": "2.5"}) == {"id": 1, "score": 2.5}
+    assert plan.coerce({"name": "1"}) == {"name": "1"}
+
+
+def test_coerce_invalid():
+    """
+    Test that all invalid values are reported at once in the format of FastAPI's validation errors.
+    """
+    with pytest.raises(HTTPException) as e:
+        get_coercion_plan(CoercionModel).coerce({"id": "a", "score": "b"})
+    assert e.value.status_code == 422
+    assert [error["loc"] for error in e.value.detail] == [["query", "id"], ["query", "score"]]
+
+
+def test_plan_is_cached():
+    """
+    Test that the plan of a DataModel is built once.
+    """
+    assert get_coercion_plan(CoercionModel) is get_coercion_plan(CoercionModel)
+
+
+def test_primary_key_type():
+    """
+    Test that the type of the primary key is returned without `Optional`.
+    """
+    assert primary_key_type(CoercionModel) is int
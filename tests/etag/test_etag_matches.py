@@ -0,0 +1,31 @@
+from data_model_router.etag import etag_matches
+
+
+def test_etag_matches_list():
+    """
+    Test that a header with multiple ETags matches any of them.
+    """
+    assert etag_matches('"a", "b"', '"b"')
+    assert not etag_matches('"a", "c"', '"b"')
+
+
+def test_etag_matches_wildcard():
+    """
+    Test that the wildcard matches any ETag.
+    """
+    assert etag_matches("*", '"a"')
+
+
+def test_etag_matches_weak():
+    """
+    Test that weak ETags only match with the weak comparison.
+    """
+    assert etag_matches('W/"a"', '"a"', weak=True)
+    assert not etag_matches('W/"a"', '"a"')
+
+
+def test_etag_matches_missing_header():
+    """
+    Test that a missing header never matches.
+    """
+    assert not etag_matches(None, '"a"')
@@ -0,0 +1,57 @@
+from datetime import date
+from typing import Optional
+
+import pytest
+from data_model_orm import DataModel, Field
+from sqlmodel import create_engine, select
+
+from data_model_router.export import CsvEncoder, negotiate_format
+
+
+class ExportedModel(DataModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: Optional[str] = None
+    birthday: date
+    active: bool
+
+
+@pytest.fixture
+def rows() -> list:
+    engine = create_engine("sqlite://")
+    ExportedModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            ExportedModel.__table__.insert(),
+            [
+                {"id": 1, "name": "Alice", "birthday": date(2000, 1, 2), "active": True},
+                {"id": 2, "name": None, "birthday": date(1990, 3, 4), "active": False},
+            ],
+        )
+        return connection.execute(select(*ExportedModel.__table__.columns)).all()
+
+
+def test_csv_encoder(rows: list):
+    """
+    Test that rows are encoded with a header, empty cells for None and ISO dates.
+    """
+    encoder = CsvEncoder(ExportedModel)
+    assert encoder.encode(rows[:1]) == b"id,name,birthday,active\n1,Alice,2000-01-02,true\n"
+    assert encoder.encode(rows[1:]) == b"2,,1990-03-04,false\n"
+    assert encoder.finish() == b""
+
+
+def test_negotiate_format_default():
+    """
+    Test that CSV is exported without an Accept header or for wildcards.
+    """
+    assert negotiate_format(None) == "csv"
+    assert negotiate_format("*/*") == "csv"
+    assert negotiate_format("text/*") == "csv"
+
+
+def test_negotiate_format_quality():
+    """
+    Test that the acceptable format with the highest quality is chosen.
+    """
+    assert negotiate_format("application/json, text/csv;q=0.5") == "csv"
+    assert negotiate_format("text/csv;q=0, application/xml") is None
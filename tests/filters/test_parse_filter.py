@@ -0,0 +1,109 @@
+import pytest
+
+from data_model_orm import DataModel, Field
+from fastapi import HTTPException
+from sqlmodel import select
+
+from data_model_router.filters import Filter, parse_aggregates, parse_filter, prefix_upper_bound
+
+
+class FilterModel(DataModel, table=True):
+    id: int = Field(primary_key=True)
+    name: str
+    age: int
+
+
+def test_parse_filter_equality():
+    """
+    Test that a field without an operator is parsed to an equality filter with a coerced value.
+    """
+    assert parse_filter("age", "30", FilterModel) == Filter("age", "eq", 30)
+
+
+def test_parse_filter_operator():
+    """
+    Test that the operator suffix is parsed.
+    """
+    assert parse_filter("age__gte", "30", FilterModel) == Filter("age", "gte", 30)
+
+
+def test_parse_filter_in():
+    """
+    Test that `__in` values are split and coerced.
+    """
+    assert parse_filter("id__in", "1,2", FilterModel) == Filter("id", "in", (1, 2))
+
+
+def test_parse_filter_between_bounds():
+    """
+    Test that `__between` requires exactly two bounds.
+    """
+    with pytest.raises(HTTPException) as e:
+        parse_filter("age__between", "1,2,3", FilterModel)
+    assert e.value.status_code == 422
+
+
+def test_parse_filter_invalid_field():
+    """
+    Test that an unknown field raises a 400.
+    """
+    with pytest.raises(HTTPException) as e:
+        parse_filter("height__gt", "1", FilterModel)
+    assert e.value.status_code == 400
+
+
+def test_prefix_expression():
+    """
+    Test that a prefix filter is compiled to a range on the column.
+    """
+    statement = select(FilterModel).where(
+        parse_filter("name__prefix", "Al", FilterModel).expression(FilterModel)
+    )
+    compiled = statement.compile()
+    assert "LIKE" not in str(compiled)
+    assert list(compiled.params.values()) == ["Al", "Am"]
+
+
+def test_prefix_upper_bound_empty():
+    """
+    Test that an empty prefix has no upper bound and is parsed to a lower bound only.
+    """
+    assert prefix_upper_bound("") is None
+    assert parse_filter("name__prefix", "", FilterModel) == Filter("name", "gte", "")
+
+
+def test_bound_expression():
+    """
+    Test that an expression with bound parameters selects the same entries for other values.
+    """
+    search_filter = parse_filter("id__in", "1,2", FilterModel)
+    statement = select(FilterModel).where(search_filter.expression(FilterModel, "f0"))
+    assert search_filter.bind_values("f0") == {"f0": [1, 2]}
+    assert "f0" in str(statement.compile())
+
+
+def test_filter_matches():
+    """
+    Test that filters are evaluated like their SQL expressions.
+    """
+    assert Filter("age", "between", (20, 40)).matches(30)
+    assert not Filter("name", "prefix", ("Al", "Am")).matches("Bob")
+    assert Filter("age", "gt", 1).matches(None)
+
+
+def test_parse_aggregates():
+    """
+    Test that aggregates are split into functions and fields without duplicates.
+    """
+    assert parse_aggregates("sum:age, max:name,sum:age", FilterModel) == [("sum", "age"), ("max", "name")]
+    assert parse_aggregates(None, FilterModel) == []
+
+
+def test_parse_aggregates_invalid():
+    """
+    Test that unknown functions, unknown fields and aggregates without a field are rejected.
+    """
+    for agg in ("median:age", "sum:height", "count"):
+        with pytest.raises(HTTPException) as e:
+            parse_aggregates(agg, FilterModel)
+        assert e.value.status_code == 400
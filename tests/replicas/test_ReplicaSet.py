@@ -0,0 +1,42 @@
+import pytest
+from sqlmodel import create_engine
+
+from data_model_router.replicas import ReplicaSet
+
+
+@pytest.fixture
+def engines() -> list:
+    return [create_engine("sqlite://"), create_engine("sqlite://"), create_engine("sqlite://")]
+
+
+def test_round_robin(engines: list):
+    """
+    Test that the replicas are used in turn.
+    """
+    replicas = ReplicaSet(engines)
+    assert [replicas.acquire() for _ in range(4)] == [0, 1, 2, 0]
+    assert replicas.snapshot() == {"replica_reads": 4, "pinned_reads": 0, "in_flight": 4}
+
+
+def test_least_connections(engines: list):
+    """
+    Test that the replica with the fewest reads in flight is used.
+    """
+    replicas = ReplicaSet(engines, strategy="least_connections")
+    assert [replicas.acquire() for _ in range(3)] == [0, 1, 2]
+    replicas.release(1)
+    assert replicas.acquire() == 1
+    replicas.release(0)
+    replicas.release(2)
+    assert replicas.acquire() == 2
+    assert replicas.acquire() == 0
+
+
+def test_invalid():
+    """
+    Test that a replica set needs engines and a valid strategy.
+    """
+    with pytest.raises(ValueError):
+        ReplicaSet([])
+    with pytest.raises(ValueError):
+        ReplicaSet([create_engine("sqlite://")], strategy="random")
@@ -0,0 +1,79 @@
+from datetime import date
+from typing import Optional
+
+from data_model_orm import DataModel, Field
+
+from data_model_router.serialization import MsgpackSerializer, OrjsonSerializer, Serializer, get_serializer
+
+
+class SerializedModel(DataModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    birthday: date
+
+
+def test_dump_json_field_order():
+    """
+    Test that fields are serialized in the order of the model, independent of the order they were set in.
+    """
+    entry = SerializedModel(birthday=date(2000, 1, 2), name="Alice", id=1)
+    assert Serializer(SerializedModel).dump_json(entry) == (
+        b'{"id":1,"name":"Alice","birthday":"2000-01-02"}'
+    )
+
+
+def test_dump_json_list():
+    """
+    Test that a list of entries is serialized to a JSON array.
+    """
+    entries = [
+        SerializedModel(id=1, name="Alice", birthday=date(2000, 1, 2)),
+        SerializedModel(id=2, name="Bob", birthday=date(2001, 3, 4)),
+    ]
+    assert Serializer(SerializedModel).dump_json_list(entries) == (
+        b'[{"id":1,"name":"Alice","birthday":"2000-01-02"},'
+        b'{"id":2,"name":"Bob","birthday":"2001-03-04"}]'
+    )
+    assert Serializer(SerializedModel).dump_json_list([]) == b"[]"
+
+
+def test_dump_ndjson():
+    """
+    Test that entries are serialized to newline delimited JSON.
+    """
+    entries = [SerializedModel(id=1, name="Alice", birthday=date(2000, 1, 2))]
+    assert Serializer(SerializedModel).dump_ndjson(entries) == (
+        b'{"id":1,"name":"Alice","birthday":"2000-01-02"}\n'
+    )
+
+
+def test_get_serializer_cached():
+    """
+    Test that the serializer of a DataModel is only built once.
+    """
+    assert get_serializer(SerializedModel) is get_serializer(SerializedModel)
+
+
+def test_orjson_serializer():
+    """
+    Test that the orjson serializer writes the same JSON as the pydantic serializer.
+    """
+    entries = [
+        SerializedModel(id=1, name="Alice", birthday=date(2000, 1, 2)),
+        SerializedModel(id=2, name="Bob", birthday=date(1990, 3, 4)),
+    ]
+    assert OrjsonSerializer(SerializedModel).serialize(entries) == Serializer(SerializedModel).serialize(entries)
+
+
+def test_native_serializer_converters():
+    """
+    Test that converters are only picked for the fields the encoder does not handle itself.
+    """
+    assert OrjsonSerializer(SerializedModel).converters == []
+    assert [key for key, _ in MsgpackSerializer(SerializedModel).converters] == ["birthday"]
+    entry = SerializedModel(id=1, name="Alice", birthday=date(2000, 1, 2))
+    assert MsgpackSerializer(SerializedModel).to_native(entry) == {
+        "id": 1,
+        "name": "Alice",
+        "birthday": "2000-01-02",
+    }
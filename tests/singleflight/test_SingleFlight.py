@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from data_model_router.singleflight import SingleFlight
+
+
+async def slow(result: int, calls: list) -> int:
+    calls.append(result)
+    await asyncio.sleep(0.01)
+    return result
+
+
+def test_do_coalesces():
+    """
+    Test that overlapping calls with the same key share the result of the first call.
+    """
+    flight, calls = SingleFlight(), []
+
+    async def main() -> list[int]:
+        return await asyncio.gather(
+            flight.do("a", lambda: slow(1, calls)),
+            flight.do("a", lambda: slow(2, calls)),
+            flight.do("b", lambda: slow(3, calls)),
+        )
+
+    assert asyncio.run(main()) == [1, 1, 3]
+    assert calls == [1, 3]
+    assert flight.snapshot() == {"calls": 3, "executions": 2, "coalesced": 1, "in_flight": 0}
+
+
+def test_do_sequential():
+    """
+    Test that calls that do not overlap all run.
+    """
+    flight, calls = SingleFlight(), []
+
+    async def main() -> None:
+        await flight.do("a", lambda: slow(1, calls))
+        await flight.do("a", lambda: slow(2, calls))
+
+    asyncio.run(main())
+    assert calls == [1, 2]
+
+
+def test_do_exception():
+    """
+    Test that the exception of the running call is raised by the waiting calls.
+    """
+    flight = SingleFlight()
+
+    async def fail() -> None:
+        await asyncio.sleep(0.01)
+        raise ValueError("failed")
+
+    async def main() -> list:
+        return await asyncio.gather(flight.do("a", fail), flight.do("a", fail), return_exceptions=True)
+
+    assert [type(result) for result in asyncio.run(main())] == [ValueError, ValueError]
+
+
+def test_do_cancelled():
+    """
+    Test that the waiting calls run themselves if the running call is cancelled.
+    """
+    flight, calls = SingleFlight(), []
+
+    async def main() -> int:
+        leader = asyncio.ensure_future(flight.do("a", lambda: slow(1, calls)))
+        follower = asyncio.ensure_future(flight.do("a", lambda: slow(2, calls)))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == 2
+    assert calls == [1, 2]
+    assert flight.coalesced == 0
@@ -0,0 +1,25 @@
+from data_model_orm import DataModel, Field
+
+from data_model_router.statements import PRIMARY_KEY_PARAMETER, select_by_primary_key
+
+
+class StatementModel(DataModel, table=True):
+    id: int = Field(primary_key=True)
+    name: str
+
+
+def test_select_by_primary_key_cached():
+    """
+    Test that the statement is built once per DataModel and columns.
+    """
+    assert select_by_primary_key(StatementModel) is select_by_primary_key(StatementModel)
+    assert select_by_primary_key(StatementModel, ("id",)) is not select_by_primary_key(StatementModel)
+
+
+def test_select_by_primary_key_bound():
+    """
+    Test that the primary key is a bound parameter instead of a literal value.
+    """
+    compiled = select_by_primary_key(StatementModel, ("name",)).compile()
+    assert list(compiled.params) == [PRIMARY_KEY_PARAMETER]
+    assert "statementmodel.name" in str(compiled)
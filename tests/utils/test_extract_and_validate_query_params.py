@@ -44,3 +44,13 @@ def test_extract_and_validate_query_params_empty():
     data_model = MockDataModel
     result = extract_and_validate_query_params(request, data_model)
     assert result == {}
+
+
+def test_extract_and_validate_query_params_ignore():
+    """
+    Test that ignored query parameters are neither validated nor returned.
+    """
+    request = MockRequest(query_params={"valid_param1": "value1", "limit": "10"})
+    data_model = MockDataModel
+    result = extract_and_validate_query_params(request, data_model, ignore=("limit",))
+    assert result == {"valid_param1": "value1"}
@@ -0,0 +1,32 @@
+import pytest
+from fastapi import HTTPException
+from data_model_router.utils import extract_fields
+
+
+class MockDataModel:
+    model_fields = {"id": None, "name": None, "age": None}
+
+
+def test_extract_fields_valid():
+    """
+    Test that the fields are returned in the order of the data model.
+    """
+    assert extract_fields("age, id", MockDataModel) == ("id", "age")
+
+
+def test_extract_fields_empty():
+    """
+    Test that None is returned when no fields are provided.
+    """
+    assert extract_fields(None, MockDataModel) is None
+    assert extract_fields("", MockDataModel) is None
+
+
+def test_extract_fields_invalid():
+    """
+    Test that an HTTPException is raised when a field is not part of the data model.
+    """
+    with pytest.raises(HTTPException) as exc_info:
+        extract_fields("name,invalid", MockDataModel)
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Invalid field: invalid"
@@ -0,0 +1,20 @@
+from data_model_router.utils import parse_accept
+
+
+def test_parse_accept_order():
+    """
+    Test that the values are ordered by quality and then by position.
+    """
+    assert list(parse_accept("text/csv;q=0.5, application/json, application/msgpack")) == [
+        "application/json",
+        "application/msgpack",
+        "text/csv",
+    ]
+
+
+def test_parse_accept_quality():
+    """
+    Test that the qualities are parsed, including a quality of 0 and invalid qualities.
+    """
+    assert parse_accept("GZIP;q=0.8, br;q=0, *;q=abc") == {"gzip": 0.8, "br": 0.0, "*": 0.0}
+    assert parse_accept(None) == {}